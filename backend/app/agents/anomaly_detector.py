@@ -0,0 +1,145 @@
+# backend/app/agents/anomaly_detector.py
+# ── Statistical anomaly scan behind the detect_anomalies tool ────────────────
+#
+# Pivots the aggregated rows into one date × (platform, metric) frame and
+# scores every column at once — no per-platform loop:
+#
+#   zscore      value vs the trailing ZSCORE_WINDOW days before it
+#   ewma        value vs an exponentially weighted mean/std of prior days
+#   changepoint strongest mean shift in the series (two-sample t on every
+#               split point, from prefix sums)
+#
+# Point anomalies are reported for the last `days` only; the earlier rows
+# are the baseline. Results are ranked by |score|, strongest first.
+#
+
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+METRICS = ["roas", "ctr", "cpc", "cpa", "conversions", "spend", "revenue"]
+METHODS = ["zscore", "ewma", "changepoint"]
+
+ZSCORE_WINDOW    = 7      # trailing days forming the z-score baseline
+EWMA_SPAN        = 7
+MIN_HISTORY      = 3      # prior days needed before a point is scored
+POINT_THRESHOLD  = 2.5    # |z| / |EWMA deviation| that counts as anomalous
+CHANGE_THRESHOLD = 3.0    # |t| of a mean shift that counts as a change point
+MIN_SEGMENT      = 3      # days required on each side of a change point
+
+# A rise in these is bad news; for every other metric a drop is
+LOWER_IS_BETTER = {"cpc", "cpa", "spend"}
+
+
+def detect(
+    campaign_data: List[dict],
+    metrics      : Optional[List[str]] = None,
+    methods      : Optional[List[str]] = None,
+    days         : int = 7,
+    limit        : int = 20,
+) -> dict:
+    """Ranked anomalies across every platform × metric in campaign_data."""
+    metrics = [m for m in (metrics or METRICS) if m in METRICS]
+    methods = [m for m in (methods or METHODS) if m in METHODS]
+    df      = pd.DataFrame(campaign_data)
+    metrics = [m for m in metrics if m in df.columns]
+    if df.empty or not metrics:
+        return {"success": False, "message": "No campaign data to scan", "anomalies": []}
+
+    wide    = (
+        df.pivot_table(index="date", columns="campaign", values=metrics, aggfunc="last")
+          .sort_index()
+          .astype(np.float64)
+    )
+    wide.columns = wide.columns.swaplevel()   # (campaign, metric)
+    recent  = wide.index[-days:] if days > 0 else wide.index
+
+    found = []
+    if "zscore" in methods:
+        prior = wide.shift().rolling(ZSCORE_WINDOW, min_periods=MIN_HISTORY)
+        found += _points(wide, prior.mean(), prior.std(), recent, "zscore")
+    if "ewma" in methods:
+        prior = wide.shift().ewm(span=EWMA_SPAN, min_periods=MIN_HISTORY)
+        found += _points(wide, prior.mean(), prior.std(), recent, "ewma")
+    if "changepoint" in methods:
+        found += _change_points(wide)
+
+    found.sort(key=lambda a: abs(a["score"]), reverse=True)
+    return {
+        "success"          : True,
+        "platforms_scanned": sorted(df["campaign"].unique().tolist()),
+        "metrics_scanned"  : metrics,
+        "methods"          : methods,
+        "window"           : {"from": str(wide.index[0]), "to": str(wide.index[-1]), "scored_days": len(recent)},
+        "anomalies_found"  : len(found),
+        "anomalies"        : found[:limit],
+    }
+
+
+def _points(wide: pd.DataFrame, mean: pd.DataFrame, std: pd.DataFrame, recent: pd.Index, method: str) -> List[dict]:
+    """Points whose deviation from the baseline reaches POINT_THRESHOLD."""
+    score = ((wide - mean) / std.where(std > 0)).loc[recent]
+    hits  = score.stack(level=[0, 1], future_stack=True)
+    hits  = hits[hits.abs() >= POINT_THRESHOLD]
+    return [
+        _anomaly(camp, metric, method, date, score=z,
+                 value=wide.at[date, (camp, metric)], expected=mean.at[date, (camp, metric)])
+        for (date, camp, metric), z in hits.items()
+    ]
+
+
+def _change_points(wide: pd.DataFrame) -> List[dict]:
+    """Best mean-shift split per column, kept if |t| reaches CHANGE_THRESHOLD."""
+    x     = wide.to_numpy()
+    valid = ~np.isnan(x)
+    v     = np.where(valid, x, 0.0)
+
+    # Prefix counts/sums/squares: row k holds the totals for rows [0, k]
+    n1 = np.cumsum(valid, axis=0)[:-1]
+    s1 = np.cumsum(v, axis=0)[:-1]
+    q1 = np.cumsum(v * v, axis=0)[:-1]
+    n2 = valid.sum(axis=0) - n1
+    s2 = v.sum(axis=0) - s1
+    q2 = (v * v).sum(axis=0) - q1
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        m1, m2 = s1 / n1, s2 / n2
+        pooled = ((q1 - n1 * m1 ** 2) + (q2 - n2 * m2 ** 2)) / (n1 + n2 - 2)
+        t      = (m2 - m1) / np.sqrt(pooled * (1 / n1 + 1 / n2))
+    t[(n1 < MIN_SEGMENT) | (n2 < MIN_SEGMENT) | ~np.isfinite(t)] = 0.0
+    # A split is only meaningful where the next row holds a value
+    t[~valid[1:]] = 0.0
+
+    if not len(t):
+        return []
+    best   = np.abs(t).argmax(axis=0)
+    cols   = np.arange(x.shape[1])
+    scores = t[best, cols]
+
+    found = []
+    for col in np.flatnonzero(np.abs(scores) >= CHANGE_THRESHOLD):
+        camp, metric = wide.columns[col]
+        k            = best[col]
+        found.append(_anomaly(
+            camp, metric, "changepoint", wide.index[k + 1], score=scores[col],
+            value=m2[k, col], expected=m1[k, col],
+        ))
+    return found
+
+
+def _anomaly(camp: str, metric: str, method: str, date, score: float, value: float, expected: float) -> dict:
+    """value/expected are the point and its baseline, or the means after/before a change point."""
+    up = value > expected
+    return {
+        "campaign"  : camp,
+        "metric"    : metric,
+        "method"    : method,
+        "date"      : str(date),
+        "value"     : round(float(value), 4),
+        "expected"  : round(float(expected), 4),
+        "change_pct": round(float((value - expected) / abs(expected) * 100), 1) if expected else None,
+        "direction" : "spike" if up else "drop",
+        "adverse"   : bool(up == (metric in LOWER_IS_BETTER)),
+        "score"     : round(float(score), 2),
+    }
@@ -0,0 +1,162 @@
+# backend/app/agents/benchmark.py
+# ── Offline throughput benchmark for the agent pipeline ──────────────────────
+#
+# Drives run_agent (or the full FastAPI app through POST /api/analyze) with
+# the fake LLM provider, so the numbers measure data loading, prompt
+# encoding, the tool loop and the HTTP layer — not model latency. Needs no
+# network or API keys, so it also runs in CI.
+#
+# Run with:  python -m app.agents.benchmark --runs 50 --concurrency 8
+#            python -m app.agents.benchmark --mode api --latency-ms 0
+#
+# Multi-worker check: start the server with the fake provider, e.g.
+#   LLM_PROVIDER=fake LLM_FAKE_LATENCY_MS=50 WEB_CONCURRENCY=4 gunicorn -c gunicorn.conf.py app.main:app
+# then drive it over HTTP; the run also checks that every alert the responses
+# reported landed in the shared store, whichever worker wrote it:
+#   python -m app.agents.benchmark --mode api --url http://localhost:8000 --runs 200 --concurrency 32
+#
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+
+def _isolate(tmp_dir: str) -> None:
+    """Keeps benchmark side effects (alerts, report, caches) out of data/."""
+    from app.agents import mcp_tools
+    from app.services import airtable_service
+    from app.services.alert_store import AlertStore
+
+    mcp_tools._ROOT        = tmp_dir
+    mcp_tools._REPORT_PATH = os.path.join(tmp_dir, "latest_report.md")
+    mcp_tools.alert_store  = AlertStore(os.path.join(tmp_dir, "alerts.sqlite3"), legacy_path=None)
+    airtable_service.AIRTABLE_API_KEY = None
+
+
+async def _run_once(mode: str, http, options: dict) -> tuple:
+    """Returns (seconds, alerts created by the run)."""
+    from app.agents.marketing_agent import run_agent
+    from app.data.data_loader import load_campaigns_for_agent
+
+    started = time.perf_counter()
+    if mode == "api":
+        response = await http.post("/api/analyze", json=options)
+        response.raise_for_status()
+        result = response.json()
+    else:
+        result = await run_agent(load_campaigns_for_agent(), **options)
+    return time.perf_counter() - started, result.get("alerts_count", 0)
+
+
+async def _alerts_since(http, since: str) -> int:
+    """Alerts stored at or after `since`, counted by paging GET /api/alerts."""
+    total, params = 0, {"since": since, "limit": 1000}
+    while True:
+        response = await http.get("/api/alerts", params=params)
+        response.raise_for_status()
+        body   = response.json()
+        total += body["count"]
+        if not body["has_more"]:
+            return total
+        params["cursor"] = body["next_cursor"]
+
+
+async def benchmark(
+    runs       : int,
+    concurrency: int,
+    mode       : str,
+    latency_ms : float,
+    use_cache  : bool,
+    prescreen  : bool,
+    url        : str = None,
+) -> dict:
+    import httpx
+
+    from app.agents import marketing_agent
+    from app.agents.llm_providers import FakeProvider
+    from app.agents.rate_limiter import AsyncRateLimiter
+
+    fake = FakeProvider(latency_ms=latency_ms)
+    marketing_agent.set_provider(fake)
+    # No provider quota to respect — measure the pipeline, not the limiter
+    marketing_agent.llm_limiter = AsyncRateLimiter(rate=0, max_concurrency=max(concurrency, 1) * 4)
+
+    options = {"use_cache": use_cache, "prescreen": prescreen}
+    limit   = asyncio.Semaphore(concurrency)
+    http    = None
+    if url:
+        # A running server (possibly many workers) — it must use LLM_PROVIDER=fake
+        mode = "api"
+        http = httpx.AsyncClient(base_url=url, timeout=None, limits=httpx.Limits(max_connections=concurrency))
+    elif mode == "api":
+        from app.main import app
+        http = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=None)
+
+    async def one() -> tuple:
+        async with limit:
+            return await _run_once(mode, http, options)
+
+    await _run_once(mode, http, options)   # warm-up: dataset load, imports
+    fake.calls = 0
+    since      = datetime.now().isoformat()
+
+    started   = time.perf_counter()
+    outcomes  = await asyncio.gather(*(one() for _ in range(runs)))
+    wall      = time.perf_counter() - started
+    latencies = sorted(seconds for seconds, _ in outcomes)
+
+    consistency = {}
+    if url:
+        # Every alert a run reported must be in the shared store, whichever worker wrote it
+        stored      = await _alerts_since(http, since)
+        reported    = sum(alerts for _, alerts in outcomes)
+        consistency = {"alerts_reported": reported, "alerts_stored": stored, "consistent": stored == reported}
+    if http is not None:
+        await http.aclose()
+
+    return {
+        "mode"       : mode,
+        "runs"       : runs,
+        "concurrency": concurrency,
+        "latency_ms" : latency_ms,
+        "wall_s"     : round(wall, 3),
+        "runs_per_s" : round(runs / wall, 2),
+        "p50_ms"     : round(statistics.median(latencies) * 1000, 1),
+        "p95_ms"     : round(latencies[max(int(len(latencies) * 0.95) - 1, 0)] * 1000, 1),
+        "max_ms"     : round(latencies[-1] * 1000, 1),
+        "llm_calls"  : fake.calls if not url else None,
+        **consistency,
+    }
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Offline agent pipeline benchmark (fake LLM).")
+    parser.add_argument("--runs",        type=int,   default=20)
+    parser.add_argument("--concurrency", type=int,   default=4)
+    parser.add_argument("--mode",        choices=["agent", "api"], default="agent")
+    parser.add_argument("--latency-ms",  type=float, default=50.0, help="simulated per-call LLM latency")
+    parser.add_argument("--cache",       action="store_true", help="allow LLM cache hits (off by default)")
+    parser.add_argument("--prescreen",   action="store_true", help="allow the healthy-run LLM skip (off by default)")
+    parser.add_argument("--url",         help="benchmark a running server (implies --mode api)")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        os.environ.setdefault("LLM_CACHE_PATH", os.path.join(tmp_dir, "llm_cache.sqlite3"))
+        _isolate(tmp_dir)
+        stats = asyncio.run(benchmark(
+            args.runs, args.concurrency, args.mode, args.latency_ms, args.cache, args.prescreen, args.url,
+        ))
+
+    print(f"✅  {stats['runs']} {stats['mode']} runs in {stats['wall_s']}s  →  {stats['runs_per_s']} runs/s")
+    for key, value in stats.items():
+        print(f"    {key:<12} {value}")
+
+
+if __name__ == "__main__":
+    os.environ.setdefault("LLM_PROVIDER", "fake")
+    sys.exit(main())
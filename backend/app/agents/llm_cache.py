@@ -0,0 +1,120 @@
+# backend/app/agents/llm_cache.py
+# ── Persistent content-addressed cache for chat-completion responses ─────────
+#
+# Key = SHA-256 of the canonical JSON of (model, messages, tools, temperature,
+# tool_choice). Identical agent turns — same data, same filters, same history —
+# are answered from SQLite instead of another LLM round-trip.
+#
+# Tunables (.env):
+#   LLM_CACHE_PATH         default: data/llm_cache.sqlite3
+#   LLM_CACHE_TTL          seconds an entry stays valid (default 86400)
+#   LLM_CACHE_MAX_ENTRIES  LRU bound (default 500)
+#
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional
+
+_ROOT        = os.path.normpath(os.path.join(os.path.dirname(__file__), "..", "..", "..", "data"))
+_CACHE_PATH  = os.getenv("LLM_CACHE_PATH", os.path.join(_ROOT, "llm_cache.sqlite3"))
+_TTL_SECONDS = float(os.getenv("LLM_CACHE_TTL", "86400"))
+_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "500"))
+
+
+def _jsonable(obj: Any) -> Any:
+    # SDK message objects (pydantic models) appear in the running history
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump(exclude_none=True)
+    raise TypeError(f"Cannot hash {type(obj).__name__} into a cache key")
+
+
+def cache_key(**request: Any) -> str:
+    """Stable hash of a chat-completion request's keyword arguments."""
+    canonical = json.dumps(request, sort_keys=True, separators=(",", ":"), default=_jsonable)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """SQLite-backed response cache with TTL expiry and LRU eviction."""
+
+    def __init__(self, path: str = _CACHE_PATH, ttl: float = _TTL_SECONDS, max_entries: int = _MAX_ENTRIES):
+        self._path        = path
+        self._ttl         = ttl
+        self._max_entries = max_entries
+        self._lock        = threading.Lock()
+        self._ready       = False
+        self.hits         = 0
+        self.misses       = 0
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Lock-guarded connection that commits on success and always closes."""
+        with self._lock:
+            if not self._ready:
+                os.makedirs(os.path.dirname(self._path), exist_ok=True)
+            conn = sqlite3.connect(self._path, timeout=5.0)
+            try:
+                if not self._ready:
+                    self._init_schema(conn)
+                with conn:
+                    yield conn
+            finally:
+                conn.close()
+
+    def _init_schema(self, conn: sqlite3.Connection) -> None:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " accessed_at REAL NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at)")
+        self._ready = True
+
+    def get(self, key: str) -> Optional[dict]:
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT value FROM responses WHERE key = ? AND created_at >= ?",
+                (key, now - self._ttl),
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self.hits += 1
+            return json.loads(row[0])
+
+    def put(self, key: str, value: dict) -> None:
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), now, now),
+            )
+            # Expire stale entries, then trim least-recently-used beyond the bound
+            conn.execute("DELETE FROM responses WHERE created_at < ?", (now - self._ttl,))
+            conn.execute(
+                "DELETE FROM responses WHERE key IN ("
+                " SELECT key FROM responses ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self._max_entries,),
+            )
+
+    def clear(self) -> None:
+        with self._connect() as conn:
+            conn.execute("DELETE FROM responses")
+
+    def stats(self) -> dict:
+        with self._connect() as conn:
+            entries = conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        return {"hits": self.hits, "misses": self.misses, "entries": entries, "ttl_seconds": self._ttl}
+
+
+llm_cache = LLMCache()
@@ -0,0 +1,198 @@
+# backend/app/agents/llm_providers.py
+# ── LLM backends for the agent loop ──────────────────────────────────────────
+#
+# A provider exposes `model` and `create(**request)`, with the same contract
+# as AsyncOpenAI().chat.completions.create: a ChatCompletion, or an async
+# iterator of ChatCompletionChunk when stream=True.
+#
+#   LLM_PROVIDER=groq    (default) Groq's OpenAI-compatible endpoint
+#   LLM_PROVIDER=openai  any OpenAI-compatible server (LLM_BASE_URL, LLM_API_KEY)
+#   LLM_PROVIDER=fake    local scripted agent — no network, for load tests/CI
+#
+# LLM_MODEL overrides the model name. The fake's per-call latency is
+# LLM_FAKE_LATENCY_MS (default 50) ± LLM_FAKE_JITTER_MS (default 0).
+#
+
+import asyncio
+import json
+import os
+import random
+import re
+import time
+from typing import AsyncIterator, Callable, List, Optional
+
+from openai import AsyncOpenAI
+from openai.types.chat import ChatCompletion, ChatCompletionChunk
+
+GROQ_BASE_URL = "https://api.groq.com/openai/v1"
+GROQ_MODEL    = "llama-3.3-70b-versatile"
+# GROQ_MODEL  = "llama-3.1-8b-instant"
+
+
+class OpenAICompatibleProvider:
+    """Groq, OpenAI or any server speaking the chat-completions API."""
+
+    def __init__(self, model: str, api_key: Optional[str], base_url: Optional[str] = None):
+        self.name      = "openai"
+        self.model     = model
+        self._api_key  = api_key
+        self._base_url = base_url
+        self._client   = None
+
+    @property
+    def client(self) -> AsyncOpenAI:
+        # Created on first use, so importing the agent needs no API key
+        if self._client is None:
+            self._client = AsyncOpenAI(api_key=self._api_key, base_url=self._base_url)
+        return self._client
+
+    async def create(self, **request):
+        return await self.client.chat.completions.create(**request)
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# FAKE PROVIDER
+# ══════════════════════════════════════════════════════════════════════════════
+
+# A script turn maps the conversation so far to the assistant message to send
+Turn = Callable[[List[dict]], dict]
+
+_PLATFORMS_RE = re.compile(r"Platforms being analysed: \[(.*?)\]")
+_REVIEW_RE    = re.compile(r"- (.+?): NEEDS REVIEW")
+
+
+def _text(message) -> str:
+    content = message.get("content") if isinstance(message, dict) else getattr(message, "content", None)
+    return content or ""
+
+
+def _user_prompt(messages: List[dict]) -> str:
+    return next((_text(m) for m in messages if isinstance(m, dict) and m.get("role") == "user"), "")
+
+
+def _tool_call(call_id: str, name: str, args: dict) -> dict:
+    return {"id": call_id, "type": "function", "function": {"name": name, "arguments": json.dumps(args)}}
+
+
+def _scan_turn(messages: List[dict]) -> dict:
+    return {"role": "assistant", "content": None, "tool_calls": [
+        _tool_call("scan_0", "detect_anomalies", {"days": 7}),
+    ]}
+
+
+def _alert_turn(messages: List[dict]) -> dict:
+    flagged = _REVIEW_RE.findall(_user_prompt(messages))
+    if not flagged:
+        return _report_turn(messages)
+    return {"role": "assistant", "content": None, "tool_calls": [
+        _tool_call(f"alert_{i}", "create_alert", {
+            "campaign"      : p,
+            "issue"         : f"{p} flagged by the rule-based pre-screen over the last 7 days",
+            "severity"      : "low",
+            "recommendation": f"Review bids and creatives on {p}; shift budget to the best-ROAS platform.",
+        })
+        for i, p in enumerate(flagged)
+    ]}
+
+
+def _report_turn(messages: List[dict]) -> dict:
+    alerts = sum(1 for m in messages if isinstance(m, dict) and m.get("role") == "tool" and '"alert"' in _text(m))
+    found  = _PLATFORMS_RE.search(_user_prompt(messages))
+    return {"role": "assistant", "content": None, "tool_calls": [
+        _tool_call("report_0", "generate_report", {
+            "summary_text"      : "## Summary\n\nScripted report from the fake LLM provider.\n",
+            "campaigns_analysed": re.findall(r"'([^']+)'", found.group(1)) if found else [],
+            "total_alerts_fired": alerts,
+            "overall_health"    : "warning" if alerts else "healthy",
+        }),
+    ]}
+
+
+def _final_turn(messages: List[dict]) -> dict:
+    return {"role": "assistant", "content": "Analysis complete. Alerts and report have been generated."}
+
+
+DEFAULT_SCRIPT: List[Turn] = [_scan_turn, _alert_turn, _report_turn, _final_turn]
+
+
+class FakeProvider:
+    """
+    Deterministic stand-in that plays a scripted agent: one anomaly scan
+    across every platform → alerts for pre-screen-flagged platforms → report →
+    final answer. The turn is picked by how many assistant messages the
+    conversation already holds, so the same history always gets the same
+    reply. Pass `script` to replay other sequences.
+    """
+
+    def __init__(self, latency_ms: float = 50.0, jitter_ms: float = 0.0, script: Optional[List[Turn]] = None, seed: int = 0):
+        self.name        = "fake"
+        self.model       = "fake-agent"
+        self._latency_ms = latency_ms
+        self._jitter_ms  = jitter_ms
+        self._script     = script or DEFAULT_SCRIPT
+        self._random     = random.Random(seed)
+        self.calls       = 0
+
+    def _reply(self, messages: List[dict]) -> dict:
+        turn = sum(1 for m in messages if not isinstance(m, dict) or m.get("role") == "assistant")
+        return self._script[min(turn, len(self._script) - 1)](messages)
+
+    async def _sleep(self) -> None:
+        delay = self._latency_ms + self._random.uniform(-self._jitter_ms, self._jitter_ms)
+        await asyncio.sleep(max(delay, 0.0) / 1000)
+
+    async def create(self, **request):
+        self.calls += 1
+        await self._sleep()
+        message = self._reply(request["messages"])
+        finish  = "tool_calls" if message.get("tool_calls") else "stop"
+        if request.get("stream"):
+            return self._chunks(request["model"], message, finish)
+        return ChatCompletion.model_validate({
+            "id"     : f"fake-{self.calls}",
+            "object" : "chat.completion",
+            "created": int(time.time()),
+            "model"  : request["model"],
+            "choices": [{"index": 0, "finish_reason": finish, "message": message}],
+        })
+
+    async def _chunks(self, model: str, message: dict, finish: str) -> AsyncIterator[ChatCompletionChunk]:
+        base = {"id": f"fake-{self.calls}", "object": "chat.completion.chunk", "created": int(time.time()), "model": model}
+
+        def chunk(delta: dict, finish_reason=None) -> ChatCompletionChunk:
+            return ChatCompletionChunk.model_validate(
+                {**base, "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}]}
+            )
+
+        for word in re.findall(r"\S+\s*", message.get("content") or ""):
+            yield chunk({"content": word})
+        for i, call in enumerate(message.get("tool_calls") or []):
+            args = call["function"]["arguments"]
+            yield chunk({"tool_calls": [{"index": i, "id": call["id"], "type": "function",
+                                         "function": {"name": call["function"]["name"], "arguments": args[:8]}}]})
+            yield chunk({"tool_calls": [{"index": i, "function": {"arguments": args[8:]}}]})
+        yield chunk({}, finish)
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# SELECTION
+# ══════════════════════════════════════════════════════════════════════════════
+
+def get_provider(name: Optional[str] = None):
+    """Provider named by `name` or LLM_PROVIDER (groq | openai | fake)."""
+    name  = (name or os.getenv("LLM_PROVIDER", "groq")).lower()
+    model = os.getenv("LLM_MODEL")
+    if name == "fake":
+        return FakeProvider(
+            latency_ms = float(os.getenv("LLM_FAKE_LATENCY_MS", "50")),
+            jitter_ms  = float(os.getenv("LLM_FAKE_JITTER_MS", "0")),
+        )
+    if name == "groq":
+        return OpenAICompatibleProvider(model or GROQ_MODEL, os.getenv("GROQ_API_KEY"), GROQ_BASE_URL)
+    if name == "openai":
+        return OpenAICompatibleProvider(
+            model or "gpt-4o-mini",
+            os.getenv("LLM_API_KEY") or os.getenv("OPENAI_API_KEY"),
+            os.getenv("LLM_BASE_URL"),
+        )
+    raise ValueError(f"Unknown LLM_PROVIDER: {name!r} (expected groq, openai or fake)")
@@ -1,23 +1,48 @@
 # backend/app/agents/marketing_agent.py
 # ── AI Agent Brain — updated for Kaggle dataset ───────────────────────────────
 
+import asyncio
 import json
 import os
+import time
+from typing import AsyncIterator, Optional
 
 from dotenv import load_dotenv
-from openai import AsyncOpenAI
+from openai.types.chat import ChatCompletion
 
+from app.agents.llm_cache import cache_key, llm_cache
+from app.agents.llm_providers import get_provider
 from app.agents.mcp_tools import TOOLS, execute_tool
+from app.agents.rate_limiter import llm_limiter
+from app.agents.rule_engine import all_healthy, screen, templated_report
+from app.agents.trend_index import TrendIndex
+from app.agents.payload_encoder import DEFAULT_FORMAT, encode_rows, encode_tool_result, estimate_tokens
+from app.services.executor import run_sync
 
 load_dotenv(os.path.join(os.path.dirname(__file__), "..", "..", ".env"))
 
-client = AsyncOpenAI(
-    api_key  = os.getenv("GROQ_API_KEY"),
-    base_url = "https://api.groq.com/openai/v1",
-)
+# Groq by default; LLM_PROVIDER=fake swaps in the offline scripted agent
+provider = get_provider()
+MODEL    = provider.model
 
-MODEL = "llama-3.3-70b-versatile"
-# MODEL = "llama-3.1-8b-instant"
+# Upper bound on tool calls from one model turn that run at the same time
+TOOL_CONCURRENCY = int(os.getenv("AGENT_TOOL_CONCURRENCY", "4"))
+
+# Skip the LLM entirely when the rule engine finds every platform healthy
+PRESCREEN = os.getenv("AGENT_PRESCREEN", "1") != "0"
+
+# Per-run budget: LLM tokens (prompt + completion, cache hits are free) and
+# wall-clock seconds; 0 disables a limit. Once a call would take the run past
+# COMPACT_AT of the token budget, older tool results are replaced by short
+# summaries; if the next call still does not fit, the run stops with a
+# partial result. The first call always goes out, so a budget smaller than
+# the opening prompt still gets one turn. A call still running when the
+# time budget expires is cancelled.
+TOKEN_BUDGET       = int(os.getenv("AGENT_TOKEN_BUDGET", "60000"))
+TIME_BUDGET_S      = float(os.getenv("AGENT_TIME_BUDGET_S", "120"))
+COMPACT_AT         = float(os.getenv("AGENT_COMPACT_AT", "0.6"))
+MAX_ITERATIONS     = int(os.getenv("AGENT_MAX_ITERATIONS", "10"))
+COMPLETION_RESERVE = 1024   # tokens kept free for the reply to the next call
 
 
 # ══════════════════════════════════════════════════════════════════════════════
@@ -48,9 +73,12 @@ SEVERITY RULES (based on ROAS):
   low    = ROAS 1.2 to 1.5  → below target, monitor closely
 
 YOUR STEPS:
-  1. SCAN all 3 platforms for ROAS below 1.5
-  2. VERIFY trends using get_campaign_trend before alerting
-     (confirm it's a multi-day trend, not a single bad day)
+  1. SCAN all 3 platforms for ROAS below 1.5, and call detect_anomalies
+     once to get ranked statistical anomalies across every platform/metric
+  2. VERIFY trends before alerting (confirm it's a multi-day trend, not a
+     single bad day) — a changepoint or repeated adverse anomalies from
+     detect_anomalies is enough; use get_campaign_trend only for
+     platforms it leaves unclear
   3. FIRE alerts using create_alert for confirmed underperformers
      - Be specific: name the platform, exact ROAS value, date range
      - Give actionable recommendations (budget reallocation, bid strategy,
@@ -74,10 +102,304 @@ RULES:
 # AGENT RUNNER
 # ══════════════════════════════════════════════════════════════════════════════
 
-async def run_agent(campaign_data: list) -> dict:
-    recent_data = _get_recent_data(campaign_data, days=7)
+# Tool results carry per-run fields (alert timestamps and store ids, the
+# report header) that would make every replayed history unique — they are
+# left out of the key.
+_VOLATILE_KEYS = {"timestamp", "report", "id"}
+
+
+def _stable(value):
+    if isinstance(value, dict):
+        return {k: _stable(v) for k, v in value.items() if k not in _VOLATILE_KEYS}
+    if isinstance(value, list):
+        return [_stable(v) for v in value]
+    return value
+
+
+def _cache_view(messages: list) -> list:
+    """The message history as hashed for the cache key."""
+    view = []
+    for m in messages:
+        if isinstance(m, dict) and m.get("role") == "tool":
+            try:
+                m = {**m, "content": json.dumps(_stable(json.loads(m["content"])), sort_keys=True)}
+            except (TypeError, ValueError):
+                pass
+        view.append(m)
+    return view
+
+
+async def _stream_completion(request: dict) -> AsyncIterator:
+    """
+    Streams one completion: yields content deltas (str) as they arrive, then
+    the ChatCompletion assembled from the chunks (tool-call arguments arrive
+    in fragments keyed by index).
+    """
+    content, calls, finish, first = [], {}, "stop", None
+    async with llm_limiter:
+        stream = await provider.create(**request, stream=True)
+        async for chunk in stream:
+            first = first or chunk
+            if not chunk.choices:
+                continue
+            choice = chunk.choices[0]
+            delta  = choice.delta
+            if delta.content:
+                content.append(delta.content)
+                yield delta.content
+            for tc in delta.tool_calls or []:
+                slot = calls.setdefault(tc.index, {"id": "", "type": "function", "function": {"name": "", "arguments": ""}})
+                slot["id"] = tc.id or slot["id"]
+                if tc.function is not None:
+                    slot["function"]["name"]      += tc.function.name or ""
+                    slot["function"]["arguments"] += tc.function.arguments or ""
+            finish = choice.finish_reason or finish
+
+    message = {"role": "assistant", "content": "".join(content) or None}
+    if calls:
+        message["tool_calls"] = [calls[i] for i in sorted(calls)]
+    yield ChatCompletion.model_validate({
+        "id"     : first.id if first else "stream",
+        "object" : "chat.completion",
+        "created": first.created if first else int(time.time()),
+        "model"  : first.model if first else request["model"],
+        "choices": [{"index": 0, "finish_reason": finish, "message": message}],
+    })
+
+
+def set_provider(new_provider) -> None:
+    """Swaps the LLM backend at runtime (benchmarks, tests)."""
+    global provider, MODEL
+    provider, MODEL = new_provider, new_provider.model
+
+
+async def _chat(messages: list, use_cache: bool, stream_tokens: bool = False) -> AsyncIterator[tuple]:
+    """
+    One chat-completion round-trip. Yields ("token", text) for each streamed
+    content delta when stream_tokens is set, then ("response", (response,
+    served_from_cache)). Identical requests are answered from the persistent
+    LLM cache.
+    """
+    request = {
+        "model"      : provider.model,
+        "messages"   : messages,
+        "tools"      : TOOLS,
+        "tool_choice": "auto",
+        "temperature": 0.2,
+    }
+    key = cache_key(**{**request, "messages": _cache_view(messages)}) if use_cache else None
+    if key is not None:
+        cached = await run_sync(llm_cache.get, key)
+        if cached is not None:
+            yield "response", (ChatCompletion.model_validate(cached), True)
+            return
+
+    if stream_tokens:
+        async for item in _stream_completion(request):
+            if isinstance(item, str):
+                yield "token", item
+            else:
+                response = item
+    else:
+        async with llm_limiter:
+            response = await provider.create(**request)
+    if key is not None:
+        await run_sync(llm_cache.put, key, response.model_dump())
+    yield "response", (response, False)
+
+
+async def _with_deadline(items: AsyncIterator, deadline: Optional[float]) -> AsyncIterator:
+    """Re-yields items; raises asyncio.TimeoutError once perf_counter() passes deadline."""
+    try:
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.perf_counter())
+            try:
+                item = await asyncio.wait_for(items.__anext__(), timeout)
+            except StopAsyncIteration:
+                return
+            yield item
+    finally:
+        await items.aclose()
+
+
+async def _run_tool(tool_call, campaign_data: list, index: TrendIndex, limit: asyncio.Semaphore) -> tuple:
+    """
+    Executes one tool call under the concurrency limit. Returns (args,
+    result, ms). A failure — bad JSON arguments included — becomes that
+    call's {"error": ...} result, so the model sees it and the other calls
+    from the same turn still complete.
+    """
+    tool_args = {}
+    started   = time.perf_counter()
+    try:
+        tool_args = json.loads(tool_call.function.arguments)
+        async with limit:
+            started = time.perf_counter()
+            result  = await execute_tool(tool_call.function.name, tool_args, campaign_data, index)
+    except Exception as e:
+        print(f"[Agent] Tool {tool_call.function.name} failed: {type(e).__name__}: {e}")
+        result = {"error": f"{type(e).__name__}: {e}"}
+    return tool_args, result, round((time.perf_counter() - started) * 1000, 1)
+
+
+# ── Budget helpers ───────────────────────────────────────────────────────────
+
+_TOOLS_TOKENS = estimate_tokens(json.dumps(TOOLS))
+
+
+def _message_tokens(message) -> int:
+    if isinstance(message, dict):
+        content, calls = message.get("content"), message.get("tool_calls") or []
+        calls = [(c["function"]["name"], c["function"]["arguments"]) for c in calls]
+    else:
+        content, calls = message.content, [(c.function.name, c.function.arguments) for c in message.tool_calls or []]
+    return estimate_tokens(content or "") + sum(estimate_tokens(f"{n} {a}") for n, a in calls)
+
+
+def _prompt_tokens(messages: list) -> int:
+    """Estimated prompt size of the next call: history plus tool schemas."""
+    return _TOOLS_TOKENS + sum(_message_tokens(m) for m in messages)
+
+
+def _summarize(tool_name: str, args: dict, result: dict) -> str:
+    """One-line stand-in for a tool result the model has already acted on."""
+    if tool_name == "get_campaign_trend" and result.get("success"):
+        return (
+            f"{result['campaign']} {result['metric']} over {result['days_retrieved']} days: "
+            f"{result['trend_direction']} ({result['change_percent']}%)"
+        )
+    if tool_name == "detect_anomalies" and result.get("success"):
+        top = "; ".join(
+            f"{a['campaign']} {a['metric']} {a['direction']} on {a['date']} (score {a['score']})"
+            for a in result["anomalies"][:5]
+        )
+        return f"{result['anomalies_found']} anomalies" + (f"; strongest: {top}" if top else "")
+    return str(result.get("message") or result.get("error") or json.dumps(result)[:200])
+
+
+def _compact(tool_messages: list, iteration: int) -> int:
+    """
+    Shrinks tool results from turns before the previous one, in place.
+    A trend fetched again later (same platform and metric) is dropped
+    outright; every other result becomes its _summarize line. Returns the
+    estimated tokens saved.
+    """
+    saved  = 0
+    latest = {}
+    for entry in tool_messages:
+        if entry["tool"] == "get_campaign_trend":
+            latest[(entry["args"].get("campaign_name"), entry["args"].get("metric", "all"))] = entry
+
+    for entry in tool_messages:
+        if entry["compacted"] or entry["iteration"] >= iteration - 1:
+            continue
+        key = (entry["args"].get("campaign_name"), entry["args"].get("metric", "all"))
+        if entry["tool"] == "get_campaign_trend" and latest.get(key) is not entry:
+            summary = {"compacted": True, "superseded": "a later get_campaign_trend call returned this series"}
+        else:
+            summary = {"compacted": True, "summary": _summarize(entry["tool"], entry["args"], entry["result"])}
+        before = estimate_tokens(entry["message"]["content"])
+        entry["message"]["content"] = json.dumps(summary)
+        entry["compacted"]          = True
+        saved += before - estimate_tokens(entry["message"]["content"])
+    return saved
+
+
+_FORMAT_LABELS = {
+    "pretty" : "JSON",
+    "json"   : "JSON",
+    "table"  : "CSV, one row per platform per day",
+    "summary": "CSV tables",
+}
+
+
+async def _healthy_result(campaign_data: list, verdicts: list, days: int) -> dict:
+    """The agent result for an all-healthy pre-screen — no LLM round-trip."""
+    platforms = [v["campaign"] for v in verdicts]
+    args = {
+        "summary_text"      : templated_report(verdicts, days),
+        "campaigns_analysed": platforms,
+        "total_alerts_fired": 0,
+        "overall_health"    : "healthy",
+    }
+    report = await execute_tool("generate_report", args, campaign_data)
+    print(f"[Agent] Pre-screen: all {len(platforms)} platforms healthy — templated report, LLM skipped")
+    return {
+        "status"        : "success",
+        "alerts"        : [],
+        "report"        : report.get("report", ""),
+        "summary"       : f"All platforms healthy over the last {days} days; no alerts fired.",
+        "overall_health": "healthy",
+        "tool_calls_log": [{"tool": "generate_report", "args": {"campaigns_analysed": platforms}, "iteration": 0}],
+        "rows_analysed" : len(campaign_data),
+        "alerts_count"  : 0,
+        "llm_calls"     : 0,
+        "llm_cache_hits": 0,
+        "prescreen"     : verdicts,
+        "iterations"    : [],
+        "budget"        : {"stop_reason": "prescreen", "tokens_used": 0},
+    }
+
 
-    platforms = list(set(r["campaign"] for r in recent_data))
+def _prescreen_notes(verdicts: list) -> str:
+    lines = []
+    for v in verdicts:
+        if v["needs_review"]:
+            lines.append(f"  - {v['campaign']}: NEEDS REVIEW — " + "; ".join(v["reasons"]))
+        else:
+            lines.append(f"  - {v['campaign']}: passed all rules (ROAS {v['roas']:.2f})")
+    return "\n".join(lines)
+
+
+def _event(name: str, **data) -> dict:
+    return {"event": name, "data": data}
+
+
+async def run_agent_events(
+    campaign_data : list,
+    use_cache     : bool  = True,
+    payload_format: str   = None,
+    prescreen     : bool  = PRESCREEN,
+    stream_tokens : bool  = False,
+    token_budget  : int   = None,
+    time_budget_s : float = None,
+) -> AsyncIterator[dict]:
+    """
+    The agent loop as a stream of {"event", "data"} progress events:
+      prescreen · iteration · token (stream_tokens only) · tool_call ·
+      alert · report · budget (compaction / early stop) · result (always
+      last; data is run_agent's result)
+    """
+    payload_format = payload_format or DEFAULT_FORMAT
+    token_budget   = TOKEN_BUDGET if token_budget is None else token_budget
+    time_budget_s  = TIME_BUDGET_S if time_budget_s is None else time_budget_s
+    started        = time.perf_counter()
+    deadline       = started + time_budget_s if time_budget_s else None
+    # Grouping, screening and encoding run on the worker pool, off the event loop
+    index          = await run_sync(TrendIndex, campaign_data)   # grouped + date-sorted once per run
+    recent_data    = index.recent(days=7)
+
+    verdicts = await run_sync(screen, recent_data)
+    yield _event("prescreen", verdicts=verdicts, llm_skipped=prescreen and all_healthy(verdicts))
+    if prescreen and all_healthy(verdicts):
+        result = await _healthy_result(campaign_data, verdicts, days=7)
+        yield _event("report", report=result["report"], overall_health="healthy")
+        yield _event("result", **result)
+        return
+
+    platforms = sorted(set(r["campaign"] for r in recent_data))
+    payload   = await run_sync(encode_rows, recent_data, payload_format)
+
+    payload_stats = {
+        "format"         : payload_format,
+        "tokens"         : estimate_tokens(payload),
+        "baseline_tokens": estimate_tokens(json.dumps(recent_data, indent=2)),
+        "tool_tokens"    : 0,
+    }
+    print(
+        f"[Agent] Data payload ({payload_format}): ~{payload_stats['tokens']} tokens "
+        f"vs ~{payload_stats['baseline_tokens']} as pretty JSON"
+    )
 
     user_message = f"""
 Analyse the following ad platform performance data.
@@ -86,12 +408,15 @@ This covers the last 7 days aggregated across all industries and countries.
 Platforms being analysed: {platforms}
 Total data rows: {len(recent_data)}
 
-Data:
-{json.dumps(recent_data, indent=2)}
+Data ({_FORMAT_LABELS[payload_format]}):
+{payload}
+
+Rule-based pre-screen (thresholds from your severity rules):
+{_prescreen_notes(verdicts)}
 
 Follow your analysis steps:
 1. Check each platform's ROAS and secondary metrics (CTR, CPC, CPA)
-2. Use get_campaign_trend to verify suspicious platforms
+2. Call detect_anomalies once; use get_campaign_trend only if still unclear
 3. Create alerts for underperforming platforms
 4. Generate the daily cross-platform performance report
 """
@@ -105,38 +430,99 @@ Follow your analysis steps:
     report_result   = None
     tool_calls_log  = []
     overall_health  = "healthy"
-    max_iterations  = 10
     iteration       = 0
+    cache_hits      = 0
     response_message = None
+    tool_limit       = asyncio.Semaphore(TOOL_CONCURRENCY)
+    tool_messages    = []   # every tool result sent, for compaction
+    iterations       = []   # per-call token and latency stats
+    tokens_used      = 0
+    tokens_saved     = 0
+    stop_reason      = "max_iterations"
+
+    while iteration < MAX_ITERATIONS:
+        # ── Budget check before every LLM call ─────────────────────────────
+        prompt_tokens = _prompt_tokens(messages)
+        compacted     = False
+        if token_budget and tokens_used + prompt_tokens + COMPLETION_RESERVE > COMPACT_AT * token_budget:
+            saved = _compact(tool_messages, iteration + 1)
+            if saved:
+                compacted      = True
+                tokens_saved  += saved
+                prompt_tokens -= saved
+                yield _event("budget", action="compact", iteration=iteration + 1, tokens_saved=saved)
+        elapsed = time.perf_counter() - started
+        if token_budget and iteration and tokens_used + prompt_tokens + COMPLETION_RESERVE > token_budget:
+            stop_reason = "token_budget"
+        elif time_budget_s and elapsed >= time_budget_s:
+            stop_reason = "time_budget"
+        if stop_reason != "max_iterations":
+            print(f"[Agent] Budget: stopping before call {iteration + 1} ({stop_reason}, {tokens_used} tokens, {elapsed:.1f}s)")
+            yield _event("budget", action="stop", reason=stop_reason, tokens_used=tokens_used, elapsed_s=round(elapsed, 2))
+            break
 
-    while iteration < max_iterations:
         iteration += 1
-
-        response = await client.chat.completions.create(
-            model       = MODEL,
-            messages    = messages,
-            tools       = TOOLS,
-            tool_choice = "auto",
-            temperature = 0.2,
-        )
+        call_started = time.perf_counter()
+
+        try:
+            async for kind, value in _with_deadline(_chat(messages, use_cache, stream_tokens), deadline):
+                if kind == "token":
+                    yield _event("token", iteration=iteration, delta=value)
+                else:
+                    response, cached = value
+        except asyncio.TimeoutError:
+            stop_reason = "time_budget"
+            elapsed     = time.perf_counter() - started
+            print(f"[Agent] Budget: cancelled call {iteration} ({stop_reason}, {tokens_used} tokens, {elapsed:.1f}s)")
+            yield _event("budget", action="stop", reason=stop_reason, tokens_used=tokens_used, elapsed_s=round(elapsed, 2), cancelled_call=iteration)
+            break
+        cache_hits += cached
 
         response_message = response.choices[0].message
         messages.append(response_message)
 
-        if not response_message.tool_calls:
+        # Provider-reported usage when there is one, else the local estimate
+        usage = response.usage
+        stats = {
+            "iteration"        : iteration,
+            "prompt_tokens"    : usage.prompt_tokens if usage else prompt_tokens,
+            "completion_tokens": usage.completion_tokens if usage else _message_tokens(response_message),
+            "latency_ms"       : round((time.perf_counter() - call_started) * 1000, 1),
+            "cached"           : cached,
+            "compacted"        : compacted,
+        }
+        iterations.append(stats)
+        if not cached:
+            tokens_used += stats["prompt_tokens"] + stats["completion_tokens"]
+
+        tool_calls = response_message.tool_calls or []
+        yield _event(
+            "iteration",
+            **stats,
+            tool_calls = [tc.function.name for tc in tool_calls],
+            content    = response_message.content,
+        )
+        if not tool_calls:
+            stop_reason = "complete"
             break
 
-        for tool_call in response_message.tool_calls:
+        # Independent calls from one turn run concurrently; results are
+        # consumed in the order the model issued them.
+        results = await asyncio.gather(*(
+            _run_tool(tool_call, campaign_data, index, tool_limit)
+            for tool_call in tool_calls
+        ))
+
+        for tool_call, (tool_args, tool_result, duration_ms) in zip(tool_calls, results):
             tool_name = tool_call.function.name
-            tool_args = json.loads(tool_call.function.arguments)
 
             tool_calls_log.append({
-                "tool"     : tool_name,
-                "args"     : tool_args,
-                "iteration": iteration,
+                "tool"       : tool_name,
+                "args"       : tool_args,
+                "iteration"  : iteration,
+                "duration_ms": duration_ms,
             })
-
-            tool_result = await execute_tool(tool_name, tool_args, campaign_data)
+            yield _event("tool_call", **tool_calls_log[-1])
 
             if tool_name == "create_alert" and tool_result.get("success"):
                 alerts_created.append(tool_result["alert"])
@@ -147,42 +533,83 @@ Follow your analysis steps:
                     overall_health = "warning"
                 elif severity == "low" and overall_health == "healthy":
                     overall_health = "warning"
+                yield _event("alert", alert=tool_result["alert"], overall_health=overall_health)
 
             elif tool_name == "generate_report" and tool_result.get("success"):
                 report_result = tool_result
+                yield _event("report", report=tool_result.get("report", ""), overall_health=tool_result.get("overall_health"))
 
+            content = encode_tool_result(tool_result, payload_format)
+            payload_stats["tool_tokens"] += estimate_tokens(content)
             messages.append({
                 "role"        : "tool",
                 "tool_call_id": tool_call.id,
-                "content"     : json.dumps(tool_result),
+                "content"     : content,
+            })
+            tool_messages.append({
+                "message"  : messages[-1],
+                "tool"     : tool_name,
+                "args"     : tool_args,
+                "result"   : tool_result,
+                "iteration": iteration,
+                "compacted": False,
             })
 
+    partial       = stop_reason in ("token_budget", "time_budget")
     final_summary = ""
-    if response_message and response_message.content:
+    if response_message and response_message.content and not partial:
         final_summary = response_message.content
+    elif partial:
+        final_summary = (
+            f"Stopped early ({stop_reason.replace('_', ' ')} reached) after {iteration} LLM calls: "
+            f"{len(alerts_created)} alerts fired, report {'generated' if report_result else 'not generated'}."
+        )
 
-    return {
-        "status"        : "success",
-        "alerts"        : alerts_created,
-        "report"        : report_result.get("report", "") if report_result else "",
-        "summary"       : final_summary,
-        "overall_health": overall_health,
-        "tool_calls_log": tool_calls_log,
-        "rows_analysed" : len(campaign_data),
-        "alerts_count"  : len(alerts_created),
-    }
-
-
-def _get_recent_data(campaign_data: list, days: int = 7) -> list:
-    """Returns most recent N days per platform."""
-    by_platform: dict[str, list] = {}
-    for row in campaign_data:
-        camp = row.get("campaign", "unknown")
-        by_platform.setdefault(camp, []).append(row)
-
-    recent = []
-    for camp, rows in by_platform.items():
-        sorted_rows = sorted(rows, key=lambda x: x.get("date", ""))
-        recent.extend(sorted_rows[-days:])
-
-    return recent
\ No newline at end of file
+    yield _event(
+        "result",
+        status         = "partial" if partial else "success",
+        alerts         = alerts_created,
+        report         = report_result.get("report", "") if report_result else "",
+        summary        = final_summary,
+        overall_health = overall_health,
+        tool_calls_log = tool_calls_log,
+        rows_analysed  = len(campaign_data),
+        alerts_count   = len(alerts_created),
+        llm_calls      = iteration,
+        llm_cache_hits = cache_hits,
+        payload_stats  = payload_stats,
+        prescreen      = verdicts,
+        iterations     = iterations,
+        budget         = {
+            "stop_reason"  : stop_reason,
+            "tokens_used"  : tokens_used,
+            "token_budget" : token_budget,
+            "tokens_saved" : tokens_saved,
+            "elapsed_s"    : round(time.perf_counter() - started, 2),
+            "time_budget_s": time_budget_s,
+        },
+    )
+
+
+async def run_agent(
+    campaign_data : list,
+    use_cache     : bool  = True,
+    payload_format: str   = None,
+    prescreen     : bool  = PRESCREEN,
+    token_budget  : int   = None,
+    time_budget_s : float = None,
+) -> dict:
+    """
+    Runs the tool-calling loop over aggregated platform rows.
+    Set use_cache=False to bypass the LLM response cache for this run.
+    payload_format picks the prompt/tool-result encoding (see payload_encoder).
+    With prescreen, an all-healthy window is reported without calling the LLM.
+    token_budget / time_budget_s override AGENT_TOKEN_BUDGET / AGENT_TIME_BUDGET_S
+    (0 = unlimited); a run that exhausts either returns status "partial".
+    """
+    async for event in run_agent_events(
+        campaign_data, use_cache, payload_format, prescreen,
+        token_budget=token_budget, time_budget_s=time_budget_s,
+    ):
+        if event["event"] == "result":
+            return event["data"]
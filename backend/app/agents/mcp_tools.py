@@ -2,13 +2,17 @@
 # ── MCP Tool Definitions + Execution — Phase 6 update ────────────────────────
 # Only change from Phase 3: _execute_create_alert now calls Airtable
 
-import json
 import os
 from datetime import datetime
-from typing import Any
+from typing import Any, Optional
+
+from app.agents import anomaly_detector
+from app.agents.trend_index import ANALYSES, TrendIndex
+from app.services.alert_store import alert_store
+from app.services.executor import run_sync
+from app.services.shared_state import atomic_write
 
 _ROOT        = os.path.normpath(os.path.join(os.path.dirname(__file__), "..", "..", "..", "data"))
-_ALERTS_PATH = os.path.join(_ROOT, "alerts.json")
 _REPORT_PATH = os.path.join(_ROOT, "latest_report.md")
 
 
@@ -72,12 +76,42 @@ TOOLS = [
                 "properties": {
                     "campaign_name": {"type": "string"},
                     "days":         {"type": "integer", "default": 7},
-                    "metric":       {"type": "string",  "enum": ["roas", "ctr", "conversions", "spend", "revenue", "all"], "default": "all"},
+                    "metric":       {"type": "string",  "enum": ["roas", "ctr", "cpc", "cpa", "conversions", "spend", "revenue", "all"], "default": "all"},
+                    "analysis":     {
+                        "type": "array",
+                        "items": {"type": "string", "enum": ANALYSES},
+                        "description": (
+                            "Optional stats for a single metric: slope (change per day), "
+                            "rolling_mean (3-day), zscore (per-day z-scores and |z|>=2 anomalies)"
+                        ),
+                    },
                 },
                 "required": ["campaign_name"],
             },
         },
     },
+    {
+        "type": "function",
+        "function": {
+            "name": "detect_anomalies",
+            "description": (
+                "Scan ALL platforms and metrics in one call for statistical anomalies: "
+                "rolling z-score and EWMA deviations on recent days, plus change points "
+                "(sustained mean shifts) over the full 30-day window. Returns anomalies "
+                "ranked by strength; `adverse` marks the ones that hurt performance. "
+                "Call this FIRST instead of probing each platform with get_campaign_trend."
+            ),
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "metrics": {"type": "array",   "items": {"type": "string", "enum": anomaly_detector.METRICS}},
+                    "methods": {"type": "array",   "items": {"type": "string", "enum": anomaly_detector.METHODS}},
+                    "days":    {"type": "integer", "default": 7,  "description": "Recent days scored for point anomalies"},
+                    "limit":   {"type": "integer", "default": 20, "description": "Max anomalies returned"},
+                },
+            },
+        },
+    },
 ]
 
 
@@ -85,13 +119,16 @@ TOOLS = [
 # TOOL EXECUTION ROUTER
 # ══════════════════════════════════════════════════════════════════════════════
 
-async def execute_tool(tool_name: str, args: dict, campaign_data: list) -> Any:
+async def execute_tool(tool_name: str, args: dict, campaign_data: list, index: Optional[TrendIndex] = None) -> Any:
+    """`index` is the run's TrendIndex over campaign_data; built on demand if omitted."""
     if tool_name == "create_alert":
         return await _execute_create_alert(args)
     elif tool_name == "generate_report":
         return await _execute_generate_report(args)
     elif tool_name == "get_campaign_trend":
-        return await _execute_get_campaign_trend(args, campaign_data)
+        return await _execute_get_campaign_trend(args, index or TrendIndex(campaign_data))
+    elif tool_name == "detect_anomalies":
+        return await _execute_detect_anomalies(args, campaign_data)
     else:
         return {"error": f"Unknown tool: {tool_name}"}
 
@@ -102,7 +139,7 @@ async def execute_tool(tool_name: str, args: dict, campaign_data: list) -> Any:
 
 async def _execute_create_alert(args: dict) -> dict:
     """
-    1. Saves alert to alerts.json (local)
+    1. Saves alert to the local alert store
     2. Logs alert to Airtable (cloud) ← Phase 6 live
     """
     alert = {
@@ -114,19 +151,8 @@ async def _execute_create_alert(args: dict) -> dict:
         "status"        : "new",
     }
 
-    # ── Save to local alerts.json ─────────────────────────────────────────────
-    os.makedirs(_ROOT, exist_ok=True)
-    existing = []
-    if os.path.exists(_ALERTS_PATH):
-        with open(_ALERTS_PATH, "r") as f:
-            try:
-                existing = json.load(f)
-            except json.JSONDecodeError:
-                existing = []
-
-    existing.append(alert)
-    with open(_ALERTS_PATH, "w") as f:
-        json.dump(existing, f, indent=2)
+    # ── Save to the local alert store (one INSERT, safe across workers) ─────────
+    alert = await run_sync(alert_store.add, alert)
 
     # ── Phase 6: Log to Airtable ──────────────────────────────────────────────
     try:
@@ -155,9 +181,8 @@ async def _execute_generate_report(args: dict) -> dict:
 
 {args.get("summary_text", "")}
 """
-    os.makedirs(_ROOT, exist_ok=True)
-    with open(_REPORT_PATH, "w", encoding="utf-8") as f:
-        f.write(report_content)
+    # Atomic replace — GET /api/report on another worker never reads a half-written file
+    await run_sync(atomic_write, _REPORT_PATH, report_content)
 
     return {
         "success"       : True,
@@ -168,44 +193,21 @@ async def _execute_generate_report(args: dict) -> dict:
     }
 
 
-async def _execute_get_campaign_trend(args: dict, campaign_data: list) -> dict:
-    campaign_name = args["campaign_name"]
-    days          = args.get("days", 7)
-    metric        = args.get("metric", "all")
-
-    rows = [r for r in campaign_data if r.get("campaign") == campaign_name]
-
-    if not rows:
-        return {
-            "success": False,
-            "message": f"No data found for: {campaign_name}",
-            "trend"  : [],
-        }
-
-    rows_sorted = sorted(rows, key=lambda x: x.get("date", ""))
-    recent_rows = rows_sorted[-days:]
-
-    if metric != "all":
-        trend = [{"date": r.get("date"), metric: r.get(metric)} for r in recent_rows]
-    else:
-        trend = recent_rows
-
-    # Trend direction
-    if len(recent_rows) >= 2 and metric != "all":
-        first_val  = recent_rows[0].get(metric, 0) or 0
-        last_val   = recent_rows[-1].get(metric, 0) or 0
-        change_pct = round(((last_val - first_val) / first_val) * 100, 1) if first_val > 0 else 0
-        direction  = "declining" if change_pct < -5 else "improving" if change_pct > 5 else "stable"
-    else:
-        change_pct = None
-        direction  = "unknown"
-
-    return {
-        "success"        : True,
-        "campaign"       : campaign_name,
-        "days_retrieved" : len(trend),
-        "metric"         : metric,
-        "trend"          : trend,
-        "trend_direction": direction,
-        "change_percent" : change_pct,
-    }
\ No newline at end of file
+async def _execute_get_campaign_trend(args: dict, index: TrendIndex) -> dict:
+    return index.trend(
+        args["campaign_name"],
+        days     = args.get("days", 7),
+        metric   = args.get("metric", "all"),
+        analysis = args.get("analysis"),
+    )
+
+
+async def _execute_detect_anomalies(args: dict, campaign_data: list) -> dict:
+    return await run_sync(
+        anomaly_detector.detect,
+        campaign_data,
+        metrics = args.get("metrics"),
+        methods = args.get("methods"),
+        days    = args.get("days", 7),
+        limit   = args.get("limit", 20),
+    )
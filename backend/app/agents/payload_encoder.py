@@ -0,0 +1,104 @@
+# backend/app/agents/payload_encoder.py
+# ── Prompt payload encoders — fewer tokens for the same data ─────────────────
+#
+# Formats for the data embedded in the agent's prompt and tool results:
+#   pretty  — json.dumps(indent=2), the original format (baseline)
+#   json    — minified JSON, no whitespace
+#   table   — CSV-style: one header line, then one line per row
+#   summary — per-platform summary stats followed by the table (default)
+#
+# Token counts are estimated locally so savings can be logged per run
+# without a tokenizer dependency.
+#
+
+import csv
+import io
+import json
+import os
+import re
+from typing import Any, List
+
+import pandas as pd
+
+FORMATS        = ("pretty", "json", "table", "summary")
+DEFAULT_FORMAT = os.getenv("AGENT_PAYLOAD_FORMAT", "summary")
+
+# Roughly how BPE tokenizers split JSON/CSV: words, numbers and single
+# punctuation marks each cost about one token.
+_TOKEN_RE = re.compile(r"[A-Za-z]+|\d+|[^\sA-Za-z\d]")
+
+
+def estimate_tokens(text: str) -> int:
+    return len(_TOKEN_RE.findall(text))
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# ENCODERS
+# ══════════════════════════════════════════════════════════════════════════════
+
+def to_table(rows: List[dict]) -> str:
+    """Header line plus one CSV line per row; keys are never repeated."""
+    if not rows:
+        return ""
+    columns = list(rows[0].keys())
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator="\n")
+    writer.writerow(columns)
+    writer.writerows([row.get(col, "") for col in columns] for row in rows)
+    return buf.getvalue().rstrip("\n")
+
+
+def summarize_platforms(rows: List[dict]) -> List[dict]:
+    """Per-platform totals, spend-weighted ROAS and ROAS range over the rows."""
+    if not rows:
+        return []
+    df = pd.DataFrame(rows).sort_values(["campaign", "date"])
+    g  = df.groupby("campaign", sort=True)
+    summary = pd.DataFrame({
+        "days"      : g["date"].count(),
+        "spend"     : g["spend"].sum().round(2),
+        "revenue"   : g["revenue"].sum().round(2),
+        "roas"      : (g["revenue"].sum() / g["spend"].sum()).round(2),
+        "roas_first": g["roas"].first(),
+        "roas_last" : g["roas"].last(),
+        "roas_min"  : g["roas"].min(),
+        "roas_max"  : g["roas"].max(),
+        "cpa"       : (g["spend"].sum() / g["conversions"].sum()).round(2),
+    }).reset_index()
+    return summary.to_dict(orient="records")
+
+
+def encode_rows(rows: List[dict], fmt: str = DEFAULT_FORMAT) -> str:
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown payload format: {fmt!r} (expected one of {FORMATS})")
+    if fmt == "pretty":
+        return json.dumps(rows, indent=2)
+    if fmt == "json":
+        return json.dumps(rows, separators=(",", ":"))
+    if fmt == "table":
+        return to_table(rows)
+    return (
+        "Per-platform summary (roas = total revenue / total spend):\n"
+        f"{to_table(summarize_platforms(rows))}\n\n"
+        "Daily rows:\n"
+        f"{to_table(rows)}"
+    )
+
+
+def encode_tool_result(result: Any, fmt: str = DEFAULT_FORMAT) -> str:
+    """
+    Serializes a tool result for the conversation. Compact formats send row
+    lists as {"columns": [...], "rows": [[...], ...]} in minified JSON.
+    """
+    if fmt == "pretty":
+        return json.dumps(result)
+    if fmt in ("table", "summary") and isinstance(result, dict):
+        result = {k: _columnar(v) for k, v in result.items()}
+    return json.dumps(result, separators=(",", ":"))
+
+
+def _columnar(value: Any) -> Any:
+    if isinstance(value, list) and value and all(isinstance(r, dict) for r in value):
+        columns = list(value[0].keys())
+        return {"columns": columns, "rows": [[r.get(c) for c in columns] for r in value]}
+    return value
@@ -0,0 +1,50 @@
+# backend/app/agents/rate_limiter.py
+# ── Process-wide limiter for LLM requests ────────────────────────────────────
+#
+# Every chat-completion round-trip goes through one shared limiter, so batch
+# runs with many concurrent agents stay inside the provider's quota:
+#   LLM_MAX_CONCURRENCY  requests in flight at once   (default 4)
+#   LLM_RATE_PER_SEC     request starts per second    (default 2, 0 = no cap)
+#
+
+import asyncio
+import os
+import time
+
+
+class AsyncRateLimiter:
+    """Caps in-flight requests and spaces request starts at least 1/rate apart."""
+
+    def __init__(self, rate: float, max_concurrency: int):
+        self._interval  = 1.0 / rate if rate > 0 else 0.0
+        self._slots     = asyncio.Semaphore(max_concurrency)
+        self._lock      = asyncio.Lock()
+        self._next_slot = 0.0
+        self.waited_s   = 0.0
+
+    async def __aenter__(self) -> "AsyncRateLimiter":
+        started = time.monotonic()
+        await self._slots.acquire()
+        try:
+            if self._interval:
+                async with self._lock:
+                    now   = time.monotonic()
+                    delay = self._next_slot - now
+                    self._next_slot = max(now, self._next_slot) + self._interval
+                if delay > 0:
+                    await asyncio.sleep(delay)
+        except BaseException:
+            # Cancelled while spacing (client went away) — __aexit__ won't run, so give the slot back
+            self._slots.release()
+            raise
+        self.waited_s += time.monotonic() - started
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        self._slots.release()
+
+
+llm_limiter = AsyncRateLimiter(
+    rate            = float(os.getenv("LLM_RATE_PER_SEC", "2")),
+    max_concurrency = int(os.getenv("LLM_MAX_CONCURRENCY", "4")),
+)
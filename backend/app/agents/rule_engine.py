@@ -0,0 +1,131 @@
+# backend/app/agents/rule_engine.py
+# ── Deterministic pre-screen — the SYSTEM_PROMPT rules, applied locally ──────
+#
+# Scores every platform over the recent window with the same thresholds the
+# agent is told to use:
+#   ROAS < 0.8 → high, 0.8–1.2 → medium, 1.2–1.5 → low
+# and only counts multi-day problems (a single bad day is not a trend).
+# Platforms that pass every rule need no narrative; if all of them pass,
+# run_agent writes a templated report and never calls the LLM.
+#
+
+import os
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+ROAS_TARGET   = 1.5
+SEVERITY_BINS = [0.8, 1.2, ROAS_TARGET]   # upper bounds of high / medium / low
+SEVERITIES    = ["high", "medium", "low"]
+MIN_BAD_DAYS  = 2      # consecutive days below target that make a trend
+DECLINE_PCT   = -5.0   # same cut-off as get_campaign_trend's "declining"
+CPA_RATIO     = float(os.getenv("RULE_CPA_RATIO", "2.0"))  # × best platform's CPA = "high CPA"
+
+
+def _trailing_runs(below: pd.Series, keys: pd.Series) -> pd.Series:
+    """
+    Per key, the length of the run of True values at the end of `below`
+    (rows already in order within each key). Every False row starts a new
+    run id, so a cumulative sum of `below` within (key, run) is the streak
+    length — one vectorized pass, no per-group Python calls.
+    """
+    run    = (~below).groupby(keys, sort=False).cumsum()
+    streak = below.astype(np.int64).groupby([keys, run], sort=False).cumsum()
+    return streak.groupby(keys, sort=True).last()
+
+
+def screen(recent_data: List[dict]) -> List[dict]:
+    """
+    One verdict per platform over the given rows (typically the last 7 days).
+    `needs_review` is True when any rule fires; `reasons` says which.
+    """
+    if not recent_data:
+        return []
+
+    df = pd.DataFrame(recent_data).sort_values(["campaign", "date"])
+    g  = df.groupby("campaign", sort=True)
+
+    spend       = g["spend"].sum()
+    revenue     = g["revenue"].sum()
+    conversions = g["conversions"].sum()
+    roas        = (revenue / spend.where(spend > 0)).fillna(0.0)
+    cpa         = spend / conversions.where(conversions > 0)
+
+    first      = g["roas"].first()
+    last       = g["roas"].last()
+    change_pct = ((last - first) / first.where(first > 0) * 100).fillna(0.0).round(1)
+    bad_days   = _trailing_runs(df["roas"] < ROAS_TARGET, df["campaign"])
+
+    # Severity of the window's spend-weighted ROAS; None at or above target
+    bins     = np.digitize(roas.to_numpy(), SEVERITY_BINS)
+    severity = pd.Series([SEVERITIES[b] if b < len(SEVERITIES) else None for b in bins], index=roas.index)
+    high_cpa = cpa > CPA_RATIO * cpa.min()
+
+    verdicts = []
+    for camp in roas.index:
+        reasons = []
+        if severity[camp] is not None:
+            reasons.append(f"ROAS {roas[camp]:.2f} below {ROAS_TARGET} over the window")
+        if bad_days[camp] >= MIN_BAD_DAYS:
+            reasons.append(f"ROAS below {ROAS_TARGET} for the last {bad_days[camp]} days")
+        if bool(high_cpa[camp]):
+            reasons.append(f"CPA ${cpa[camp]:.2f} is over {CPA_RATIO:g}x the best platform's")
+        verdicts.append({
+            "campaign"       : str(camp),
+            "roas"           : round(float(roas[camp]), 2),
+            "cpa"            : round(float(cpa[camp]), 2) if pd.notna(cpa[camp]) else None,
+            "spend"          : round(float(spend[camp]), 2),
+            "revenue"        : round(float(revenue[camp]), 2),
+            "change_percent" : float(change_pct[camp]),
+            "trend_direction": "declining" if change_pct[camp] < DECLINE_PCT
+                               else "improving" if change_pct[camp] > -DECLINE_PCT else "stable",
+            "severity"       : severity[camp],
+            "needs_review"   : bool(reasons),
+            "reasons"        : reasons,
+        })
+    return verdicts
+
+
+def all_healthy(verdicts: List[dict]) -> bool:
+    return bool(verdicts) and not any(v["needs_review"] for v in verdicts)
+
+
+def templated_report(verdicts: List[dict], days: int) -> str:
+    """Markdown summary for an all-healthy run, in the agent report's layout."""
+    best  = max(verdicts, key=lambda v: v["roas"])
+    worst = min(verdicts, key=lambda v: v["roas"])
+
+    lines = [
+        "## Summary",
+        "",
+        f"All {len(verdicts)} platforms are healthy over the last {days} days — "
+        f"every platform's ROAS is at or above the {ROAS_TARGET} target, none stayed "
+        f"below it for {MIN_BAD_DAYS}+ consecutive days and CPA is in line across "
+        "platforms. No alerts were fired.",
+        "",
+        "## Platform Comparison",
+        "",
+        "| Platform | Spend | Revenue | ROAS | CPA | Trend |",
+        "|---|---|---|---|---|---|",
+    ]
+    for v in sorted(verdicts, key=lambda v: v["roas"], reverse=True):
+        cpa = f"${v['cpa']:,.2f}" if v["cpa"] is not None else "—"
+        lines.append(
+            f"| {v['campaign']} | ${v['spend']:,.2f} | ${v['revenue']:,.2f} | {v['roas']:.2f} "
+            f"| {cpa} | {v['trend_direction']} ({v['change_percent']:+.1f}%) |"
+        )
+    lines += [
+        "",
+        "## Highlights",
+        "",
+        f"- Best ROAS: **{best['campaign']}** at {best['roas']:.2f} "
+        f"(${best['roas']:.2f} revenue per $1 spent)",
+        f"- Lowest ROAS: **{worst['campaign']}** at {worst['roas']:.2f}",
+    ]
+    if best["campaign"] != worst["campaign"]:
+        lines.append(
+            f"- Consider shifting incremental budget from {worst['campaign']} "
+            f"towards {best['campaign']}."
+        )
+    return "\n".join(lines) + "\n"
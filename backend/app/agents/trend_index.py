@@ -0,0 +1,128 @@
+# backend/app/agents/trend_index.py
+# ── Per-platform series index for one agent run ──────────────────────────────
+#
+# run_agent builds this once from the aggregated rows. Rows are grouped by
+# platform and date-sorted a single time; metric columns become float64
+# arrays on first use. Every trend lookup after that is a tail slice of
+# `days` elements instead of a filter + sort over all rows.
+#
+
+from typing import Dict, List, Optional
+
+import numpy as np
+
+ANALYSES       = ["slope", "rolling_mean", "zscore"]
+ROLLING_WINDOW = 3      # days in the rolling mean
+ZSCORE_ALERT   = 2.0    # |z| at or above this marks a day as anomalous
+
+
+class _Series:
+    """One platform's rows in date order, with lazily built metric arrays."""
+
+    def __init__(self, rows: List[dict]):
+        dates = np.array([r.get("date", "") for r in rows])
+        if len(dates) > 1 and (dates[1:] < dates[:-1]).any():
+            order = np.argsort(dates, kind="stable")
+            rows  = [rows[i] for i in order]
+            dates = dates[order]
+        self.rows   = rows
+        self.dates  = dates
+        self._cols: Dict[str, np.ndarray] = {}
+
+    def column(self, metric: str) -> np.ndarray:
+        values = self._cols.get(metric)
+        if values is None:
+            values = np.array([r.get(metric) for r in self.rows], dtype=np.float64)
+            self._cols[metric] = values
+        return values
+
+
+class TrendIndex:
+    """Date-sorted per-platform series over one run's campaign_data."""
+
+    def __init__(self, campaign_data: List[dict]):
+        by_platform: Dict[str, List[dict]] = {}
+        for row in campaign_data:
+            by_platform.setdefault(row.get("campaign", "unknown"), []).append(row)
+        self._series = {camp: _Series(rows) for camp, rows in by_platform.items()}
+
+    def platforms(self) -> List[str]:
+        return list(self._series)
+
+    def recent(self, days: int = 7) -> List[dict]:
+        """Most recent N rows per platform, platforms in first-seen order."""
+        return [row for series in self._series.values() for row in series.rows[-days:]]
+
+    def trend(self, campaign_name: str, days: int = 7, metric: str = "all", analysis: Optional[List[str]] = None) -> dict:
+        """The get_campaign_trend tool result for one platform's last N days."""
+        series = self._series.get(campaign_name)
+        if series is None:
+            return {
+                "success": False,
+                "message": f"No data found for: {campaign_name}",
+                "trend"  : [],
+            }
+
+        recent_rows = series.rows[-days:]
+        if metric != "all":
+            trend = [{"date": r.get("date"), metric: r.get(metric)} for r in recent_rows]
+        else:
+            trend = recent_rows
+
+        # Trend direction
+        if len(recent_rows) >= 2 and metric != "all":
+            first_val  = recent_rows[0].get(metric, 0) or 0
+            last_val   = recent_rows[-1].get(metric, 0) or 0
+            change_pct = round(((last_val - first_val) / first_val) * 100, 1) if first_val > 0 else 0
+            direction  = "declining" if change_pct < -5 else "improving" if change_pct > 5 else "stable"
+        else:
+            change_pct = None
+            direction  = "unknown"
+
+        result = {
+            "success"        : True,
+            "campaign"       : campaign_name,
+            "days_retrieved" : len(trend),
+            "metric"         : metric,
+            "trend"          : trend,
+            "trend_direction": direction,
+            "change_percent" : change_pct,
+        }
+        if analysis and metric != "all":
+            result.update(self._analyse(series, days, metric, analysis))
+        return result
+
+    @staticmethod
+    def _analyse(series: _Series, days: int, metric: str, analysis: List[str]) -> dict:
+        values = series.column(metric)[-days:]
+        dates  = series.dates[-days:]
+        out    = {}
+
+        if "slope" in analysis:
+            # Least-squares change per calendar day (gaps between dates count)
+            x = dates.astype("datetime64[D]").astype(np.int64) if len(dates) else np.empty(0)
+            out["slope_per_day"] = (
+                round(float(np.polyfit(x - x[0], values, 1)[0]), 4)
+                if len(values) >= 2 and np.isfinite(values).all() else None
+            )
+
+        if "rolling_mean" in analysis:
+            # Trailing mean via prefix sums; the first days average what exists
+            csum  = np.cumsum(np.r_[0.0, values])
+            end   = np.arange(1, len(values) + 1)
+            width = np.minimum(end, ROLLING_WINDOW)
+            means = (csum[end] - csum[end - width]) / width
+            out["rolling_mean"] = [
+                {"date": str(d), f"{metric}_{ROLLING_WINDOW}d_mean": round(float(m), 4)}
+                for d, m in zip(dates, means)
+            ]
+
+        if "zscore" in analysis:
+            std = values.std()
+            z   = (values - values.mean()) / std if std > 0 else np.zeros_like(values)
+            out["zscores"]   = [{"date": str(d), "z": round(float(v), 2)} for d, v in zip(dates, z)]
+            out["anomalies"] = [
+                {"date": str(d), metric: float(values[i]), "z": round(float(z[i]), 2)}
+                for i, d in enumerate(dates) if abs(z[i]) >= ZSCORE_ALERT
+            ]
+        return out
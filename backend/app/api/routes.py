@@ -3,11 +3,12 @@
 
 import json
 import os
-from datetime import datetime
-from typing import List, Optional
+from datetime import date, datetime
+from typing import Dict, List, Literal, Optional, Union
 
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
 
 from app.data.data_loader import (
     load_campaigns_for_chart,
@@ -15,12 +16,18 @@ from app.data.data_loader import (
     get_latest_snapshot,
     get_campaign_names,
     get_filter_options,
+    get_cache_stats,
+    expand_segments,
+    load_segments_for_agent,
+    ingest_csv,
+    ingest_records,
 )
+from app.services.alert_store import alert_store
+from app.services.executor import loop_monitor, run_sync, sync_executor
 
 router = APIRouter()
 
 _ROOT        = os.path.normpath(os.path.join(os.path.dirname(__file__), "..", "..", "..", "data"))
-_ALERTS_PATH = os.path.join(_ROOT, "alerts.json")
 _REPORT_PATH = os.path.join(_ROOT, "latest_report.md")
 
 
@@ -28,13 +35,56 @@ _REPORT_PATH = os.path.join(_ROOT, "latest_report.md")
 # SCHEMAS
 # ══════════════════════════════════════════════════════════════════════════════
 
+RatioMode     = Literal["weighted", "mean"]
+PayloadFormat = Literal["pretty", "json", "table", "summary"]
+AlertStatus   = Literal["new", "acknowledged", "resolved", "dismissed"]
+
+
 class AnalyzeRequest(BaseModel):
     # All filters are optional — if not set, analyse everything
+    platform  : Optional[str] = None
+    industry  : Optional[str] = None
+    country   : Optional[str] = None
+    # "weighted" = ratios of summed components, "mean" = legacy mean of row ratios
+    ratio_mode: RatioMode = "weighted"
+    # Set False to force fresh LLM calls instead of the response cache
+    use_cache : bool = True
+    # Prompt data encoding; defaults to AGENT_PAYLOAD_FORMAT ("summary")
+    payload_format: Optional[PayloadFormat] = None
+    # Set False to always run the LLM, even when the rule engine finds no issues
+    prescreen : bool = True
+    # /analyze/stream only: also emit `token` events as the model writes
+    stream_tokens: bool = False
+    # Per-run LLM token / wall-clock limits; None = AGENT_TOKEN_BUDGET /
+    # AGENT_TIME_BUDGET_S, 0 = unlimited. Exhausting one returns status "partial".
+    token_budget : Optional[int]   = Field(None, ge=0)
+    time_budget_s: Optional[float] = Field(None, ge=0)
+
+
+class Segment(BaseModel):
     platform: Optional[str] = None
     industry: Optional[str] = None
     country : Optional[str] = None
 
 
+class BatchAnalyzeRequest(BaseModel):
+    # Either an explicit list of segments…
+    segments  : Optional[List[Segment]] = None
+    # …or a cross product, e.g. {"industry": "*", "country": ["UK", "USA"]}
+    dimensions: Optional[Dict[str, Union[str, List[str]]]] = None
+    ratio_mode: RatioMode = "weighted"
+    use_cache : bool = True
+    prescreen : bool = True
+    payload_format: Optional[PayloadFormat] = None
+    # Agent runs in flight at once (LLM calls are also globally rate-limited)
+    concurrency: int = Field(4, ge=1, le=16)
+    # True = NDJSON stream, one line per segment as it finishes
+    stream    : bool = False
+
+
+MAX_BATCH_SEGMENTS = int(os.getenv("MAX_BATCH_SEGMENTS", "500"))
+
+
 class Alert(BaseModel):
     campaign      : str
     issue         : str
@@ -44,21 +94,25 @@ class Alert(BaseModel):
     status        : Optional[str] = "new"
 
 
+class AlertUpdate(BaseModel):
+    status: AlertStatus
+
+
 # ══════════════════════════════════════════════════════════════════════════════
 # HELPERS
 # ══════════════════════════════════════════════════════════════════════════════
 
-def _read_alerts() -> List[dict]:
-    if not os.path.exists(_ALERTS_PATH):
-        return []
-    with open(_ALERTS_PATH, "r") as f:
-        return json.load(f)
+def _parse_list(value: Optional[str]) -> Optional[List[str]]:
+    if not value:
+        return None
+    return [v.strip() for v in value.split(",") if v.strip()] or None
 
 
-def _write_alerts(alerts: List[dict]) -> None:
-    os.makedirs(os.path.dirname(_ALERTS_PATH), exist_ok=True)
-    with open(_ALERTS_PATH, "w") as f:
-        json.dump(alerts, f, indent=2)
+def _read_report() -> Optional[str]:
+    if not os.path.exists(_REPORT_PATH):
+        return None
+    with open(_REPORT_PATH, "r", encoding="utf-8") as f:
+        return f.read()
 
 
 # ══════════════════════════════════════════════════════════════════════════════
@@ -67,17 +121,27 @@ def _write_alerts(alerts: List[dict]) -> None:
 
 @router.get("/campaigns", tags=["Campaigns"])
 async def get_campaigns(
-    platform: Optional[str] = None,
-    industry: Optional[str] = None,
-    country : Optional[str] = None,
+    platform  : Optional[str] = None,
+    industry  : Optional[str] = None,
+    country   : Optional[str] = None,
+    ratio_mode: RatioMode = "weighted",
+    start     : Optional[date] = None,
+    end       : Optional[date] = None,
 ):
-    """Returns 90-day chart data. Accepts optional query params for filtering."""
+    """
+    Returns 90-day chart data, or the inclusive start/end range (YYYY-MM-DD)
+    when given. Accepts optional query params for filtering; comma-separate
+    values to match several (e.g. country=UK,UAE).
+    """
+    if start and end and start > end:
+        raise HTTPException(status_code=422, detail="start must be on or before end.")
     try:
-        data = load_campaigns_for_chart(platform, industry, country)
+        data  = await run_sync(load_campaigns_for_chart, platform, industry, country, ratio_mode, start, end)
+        names = await run_sync(get_campaign_names)
         return {
             "status"   : "success",
             "count"    : len(data),
-            "campaigns": get_campaign_names(),
+            "campaigns": names,
             "data"     : data,
         }
     except FileNotFoundError as e:
@@ -86,13 +150,14 @@ async def get_campaigns(
 
 @router.get("/campaigns/latest", tags=["Campaigns"])
 async def get_latest_campaigns(
-    platform: Optional[str] = None,
-    industry: Optional[str] = None,
-    country : Optional[str] = None,
+    platform  : Optional[str] = None,
+    industry  : Optional[str] = None,
+    country   : Optional[str] = None,
+    ratio_mode: RatioMode = "weighted",
 ):
     """Returns most recent platform snapshot for cards. Filterable."""
     try:
-        data = get_latest_snapshot(platform, industry, country)
+        data = await run_sync(get_latest_snapshot, platform, industry, country, ratio_mode)
         return {"status": "success", "data": data}
     except FileNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
@@ -102,11 +167,51 @@ async def get_latest_campaigns(
 async def get_filters():
     """Returns unique filter values for dropdowns."""
     try:
-        return {"status": "success", "filters": get_filter_options()}
+        return {"status": "success", "filters": await run_sync(get_filter_options)}
     except FileNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
 
 
+@router.get("/campaigns/cache", tags=["Campaigns"])
+async def get_dataset_cache_stats():
+    """Hit/miss/reload counters for the in-process dataset cache."""
+    return {"status": "success", "cache": get_cache_stats()}
+
+
+@router.get("/runtime", tags=["Health"])
+async def get_runtime_stats():
+    """Worker-pool usage and event-loop lag for this server process."""
+    return {
+        "status"    : "success",
+        "pid"       : os.getpid(),
+        "executor"  : sync_executor.stats(),
+        "event_loop": loop_monitor.stats(),
+    }
+
+
+@router.post("/ingest", tags=["Data"])
+async def ingest(request: Request):
+    """
+    Appends a batch of raw rows (Kaggle export columns) to the dataset.
+    Send either a CSV body (Content-Type: text/csv) with a header row, or
+    JSON — a list of row objects or {"rows": [...]}. Rollups are updated
+    in place; no full reload happens.
+    """
+    content_type = request.headers.get("content-type", "")
+    try:
+        if "csv" in content_type or content_type.startswith("text/"):
+            result = await run_sync(ingest_csv, (await request.body()).decode("utf-8"))
+        else:
+            body = await request.json()
+            rows = body.get("rows") if isinstance(body, dict) else body
+            result = await run_sync(ingest_records, rows)
+        return {"status": "success", **result}
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+
 @router.post("/analyze", tags=["Analysis"])
 async def analyze_campaigns(request: AnalyzeRequest = AnalyzeRequest()):
     """
@@ -114,10 +219,12 @@ async def analyze_campaigns(request: AnalyzeRequest = AnalyzeRequest()):
     Filters are applied before aggregation inside the data loader.
     """
     try:
-        all_data = load_campaigns_for_agent(
-            platform = request.platform,
-            industry = request.industry,
-            country  = request.country,
+        all_data = await run_sync(
+            load_campaigns_for_agent,
+            platform   = request.platform,
+            industry   = request.industry,
+            country    = request.country,
+            ratio_mode = request.ratio_mode,
         )
 
         if not all_data:
@@ -130,7 +237,14 @@ async def analyze_campaigns(request: AnalyzeRequest = AnalyzeRequest()):
             )
 
         from app.agents.marketing_agent import run_agent
-        result = await run_agent(all_data)
+        result = await run_agent(
+            all_data,
+            use_cache      = request.use_cache,
+            payload_format = request.payload_format,
+            prescreen      = request.prescreen,
+            token_budget   = request.token_budget,
+            time_budget_s  = request.time_budget_s,
+        )
         return result
 
     except HTTPException:
@@ -141,36 +255,223 @@ async def analyze_campaigns(request: AnalyzeRequest = AnalyzeRequest()):
         raise HTTPException(status_code=500, detail=f"Agent failed: {str(e)}")
 
 
+@router.post("/analyze/stream", tags=["Analysis"])
+async def analyze_campaigns_stream(request: AnalyzeRequest):
+    """
+    Same analysis as POST /analyze, streamed as server-sent events:
+    prescreen, iteration, tool_call, alert, report and finally `result`
+    (the /analyze response body). Set stream_tokens for `token` events.
+    Data errors are mapped like /analyze before the stream starts.
+    """
+    try:
+        all_data = await run_sync(
+            load_campaigns_for_agent,
+            platform   = request.platform,
+            industry   = request.industry,
+            country    = request.country,
+            ratio_mode = request.ratio_mode,
+        )
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Agent failed: {str(e)}")
+    if not all_data:
+        raise HTTPException(
+            status_code=404,
+            detail="No data found for the selected filters.",
+        )
+
+    from app.agents.marketing_agent import run_agent_events
+    from app.api.sse import sse_response
+    return sse_response(run_agent_events(
+        all_data,
+        use_cache      = request.use_cache,
+        payload_format = request.payload_format,
+        prescreen      = request.prescreen,
+        stream_tokens  = request.stream_tokens,
+        token_budget   = request.token_budget,
+        time_budget_s  = request.time_budget_s,
+    ))
+
+
+@router.post("/analyze/batch", tags=["Analysis"])
+async def analyze_batch(request: BatchAnalyzeRequest):
+    """
+    Runs the agent over many segments in parallel. Send `segments` and/or a
+    `dimensions` cross product ("*" = every value). Returns all results in
+    input order, or with stream=true an NDJSON line per finished segment
+    followed by a {"done": true} summary line.
+    """
+    segments = [s.model_dump() for s in request.segments or []]
+    try:
+        if request.dimensions:
+            segments += await run_sync(expand_segments, request.dimensions)
+        if not segments:
+            raise HTTPException(status_code=422, detail="Provide `segments` or `dimensions`.")
+        if len(segments) > MAX_BATCH_SEGMENTS:
+            raise HTTPException(
+                status_code=422,
+                detail=f"{len(segments)} segments requested; the limit is {MAX_BATCH_SEGMENTS}.",
+            )
+        # Loaded here, not inside the stream, so a missing dataset is a 404 like /analyze
+        datasets = await run_sync(load_segments_for_agent, segments, ratio_mode=request.ratio_mode)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+    from app.services.batch_analysis import iter_batch, run_batch
+    options = {
+        "concurrency"   : request.concurrency,
+        "ratio_mode"    : request.ratio_mode,
+        "use_cache"     : request.use_cache,
+        "prescreen"     : request.prescreen,
+        "payload_format": request.payload_format,
+        "datasets"      : datasets,
+    }
+
+    if not request.stream:
+        return await run_batch(segments, **options)
+
+    async def ndjson():
+        failed = 0
+        async for entry in iter_batch(segments, **options):
+            failed += entry["status"] != "success"
+            yield json.dumps(entry, default=str) + "\n"
+        yield json.dumps({"done": True, "count": len(segments), "failed": failed}) + "\n"
+
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+
+@router.get("/analyze/cache", tags=["Analysis"])
+async def get_llm_cache_stats():
+    """Hit/miss counters and size of the LLM response cache."""
+    from app.agents.llm_cache import llm_cache
+    return {"status": "success", "cache": await run_sync(llm_cache.stats)}
+
+
+@router.delete("/analyze/cache", tags=["Analysis"])
+async def clear_llm_cache():
+    from app.agents.llm_cache import llm_cache
+    await run_sync(llm_cache.clear)
+    return {"status": "success", "message": "LLM response cache cleared."}
+
+
+@router.get("/jobs/{job_id}", tags=["Jobs"])
+async def get_job(job_id: str):
+    """Status of a background job; `result` is set once it has succeeded."""
+    from app.services.job_queue import job_queue, public_view
+    job = await run_sync(job_queue.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"No job with id {job_id}.")
+    return public_view(job)
+
+
+@router.get("/jobs", tags=["Jobs"])
+async def get_job_queue_stats():
+    from app.services.job_queue import job_queue
+    return {"status": "success", "queue": await run_sync(job_queue.stats)}
+
+
 @router.get("/report", tags=["Analysis"])
 async def get_latest_report():
-    if not os.path.exists(_REPORT_PATH):
+    report = await run_sync(_read_report)
+    if report is None:
         return {"status": "not_found", "message": "No report yet.", "report": ""}
-    with open(_REPORT_PATH, "r", encoding="utf-8") as f:
-        return {"status": "success", "report": f.read()}
+    return {"status": "success", "report": report}
 
 
 @router.get("/alerts", tags=["Alerts"])
-async def get_alerts():
-    alerts = _read_alerts()
+async def get_alerts(
+    campaign: Optional[str] = None,
+    severity: Optional[str] = None,
+    status  : Optional[str] = None,
+    since   : Optional[str] = None,
+    until   : Optional[str] = None,
+    limit   : int = Query(100, ge=1, le=1000),
+    cursor  : Optional[str] = None,
+):
+    """
+    Newest alerts first, one page at a time. campaign/severity/status accept
+    comma-separated values; since/until are inclusive ISO dates or
+    timestamps. Pass `next_cursor` back as `cursor` for the next page.
+    `count` is the page size; `total` counts every matching alert and
+    `severity_counts` breaks the matches down ignoring the severity filter.
+    """
+    if until and len(until) == 10:
+        until += "T23:59:59.999999"   # a bare date covers the whole day
+    filters    = {"campaign": _parse_list(campaign), "status": _parse_list(status), "since": since, "until": until}
+    severities = _parse_list(severity)
+    try:
+        alerts, next_cursor = await run_sync(
+            alert_store.query, severity=severities, limit=limit, cursor=cursor, **filters,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    counts = await run_sync(alert_store.severity_counts, **filters)
     return {
-        "status": "success",
-        "count" : len(alerts),
-        "alerts": sorted(alerts, key=lambda x: x.get("timestamp", ""), reverse=True),
+        "status"         : "success",
+        "count"          : len(alerts),
+        "total"          : sum(n for sev, n in counts.items() if not severities or sev in severities),
+        "severity_counts": counts,
+        "alerts"         : alerts,
+        "next_cursor"    : next_cursor,
+        "has_more"       : next_cursor is not None,
     }
 
 
+@router.get("/alerts/cloud", tags=["Alerts"])
+async def get_cloud_alerts(
+    limit  : int = Query(50, ge=1, le=1000),
+    max_age: Optional[float] = Query(None, ge=0, description="Max mirror staleness in seconds"),
+):
+    """
+    Alerts logged to Airtable, read from the local mirror. The mirror is
+    synced incrementally first when older than max_age (default
+    AIRTABLE_SYNC_MAX_AGE).
+    """
+    from app.services.airtable_service import airtable_sync, get_recent_alerts_from_airtable
+    alerts = await get_recent_alerts_from_airtable(limit, max_age)
+    synced = await run_sync(airtable_sync.synced_at)
+    return {
+        "status"   : "success",
+        "count"    : len(alerts),
+        "alerts"   : alerts,
+        "synced_at": datetime.fromtimestamp(synced).isoformat() if synced else None,
+    }
+
+
+@router.post("/alerts/cloud/sync", tags=["Alerts"])
+async def sync_cloud_alerts(full: bool = False):
+    """Pulls Airtable changes into the mirror now; full=true also drops deleted records."""
+    from app.services.airtable_service import AIRTABLE_API_KEY, airtable_sync
+    if not AIRTABLE_API_KEY:
+        raise HTTPException(status_code=503, detail="Airtable is not configured.")
+    try:
+        result = await airtable_sync.sync(full=full)
+    except Exception as e:
+        raise HTTPException(status_code=502, detail=f"Airtable sync failed: {e}")
+    # Another worker's sync outlasted the wait — it will still land in the mirror
+    return {"status": "busy" if result.get("busy") else "success", **result}
+
+
+@router.patch("/alerts/{alert_id}", tags=["Alerts"])
+async def update_alert(alert_id: int, update: AlertUpdate):
+    alert = await run_sync(alert_store.update_status, alert_id, update.status)
+    if alert is None:
+        raise HTTPException(status_code=404, detail=f"No alert with id {alert_id}.")
+    return {"status": "success", "alert": alert}
+
+
 @router.post("/alerts", tags=["Alerts"])
 async def create_alert(alert: Alert):
-    alerts = _read_alerts()
     new_alert = alert.dict()
     new_alert["timestamp"] = datetime.now().isoformat()
     new_alert["status"]    = "new"
-    alerts.append(new_alert)
-    _write_alerts(alerts)
-    return {"status": "success", "alert": new_alert}
+    return {"status": "success", "alert": await run_sync(alert_store.add, new_alert)}
 
 
 @router.delete("/alerts", tags=["Alerts"])
 async def clear_alerts():
-    _write_alerts([])
+    await run_sync(alert_store.clear)
     return {"status": "success", "message": "All alerts cleared."}
\ No newline at end of file
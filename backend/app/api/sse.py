@@ -0,0 +1,41 @@
+# backend/app/api/sse.py
+# ── Server-sent events for agent progress ────────────────────────────────────
+#
+# Wraps run_agent_events in a text/event-stream response:
+#   event: tool_call
+#   data: {"tool": "get_campaign_trend", ...}
+#
+# The first bytes go out before any LLM call, so proxies see an active
+# response immediately. A failure mid-run becomes an `error` event.
+#
+
+import json
+from typing import AsyncIterator, Optional
+
+from fastapi.responses import StreamingResponse
+
+_HEADERS = {
+    "Cache-Control"    : "no-cache",
+    "X-Accel-Buffering": "no",   # nginx: flush each event instead of buffering
+}
+
+
+def format_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+async def _encode(events: AsyncIterator[dict], extra: Optional[dict]) -> AsyncIterator[str]:
+    yield ": stream open\n\n"
+    try:
+        async for event in events:
+            data = event["data"]
+            if event["event"] == "result" and extra:
+                data = {**data, **extra}
+            yield format_event(event["event"], data)
+    except Exception as e:
+        yield format_event("error", {"status": "error", "detail": f"Agent failed: {e}"})
+
+
+def sse_response(events: AsyncIterator[dict], extra: Optional[dict] = None) -> StreamingResponse:
+    """`extra` fields are merged into the final `result` event."""
+    return StreamingResponse(_encode(events, extra), media_type="text/event-stream", headers=_HEADERS)
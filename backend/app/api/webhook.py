@@ -2,43 +2,113 @@
 # ── n8n Webhook Receiver — Phase 3 update ────────────────────────────────────
 # The AI agent is now wired into the webhook endpoint.
 #
+# Tunables (.env):
+#   WEBHOOK_WAIT_TIMEOUT  seconds a "wait": true call holds the request
+#                         before answering 202 with the job id (default 300)
+#
 
+import hashlib
+import json
+import os
 from datetime import datetime
 from fastapi import APIRouter, Request
 from fastapi.responses import JSONResponse
 
+from app.services.executor import run_sync
+from app.services.job_queue import ACTIVE, job_queue
+
 router = APIRouter()
 
+_WAIT_TIMEOUT = float(os.getenv("WEBHOOK_WAIT_TIMEOUT", "300"))
+
+
+# ── Background job: one n8n-triggered analysis ───────────────────────────────
+async def _run_n8n_analysis(payload: dict) -> dict:
+    from app.data.campaigns import load_campaigns
+    from app.agents.marketing_agent import run_agent
+
+    campaign_data = await run_sync(load_campaigns)
+    result        = await run_agent(campaign_data, use_cache=not payload.get("no_cache", False))
+    return {
+        **result,
+        "triggered_by": "n8n_webhook",
+        "timestamp"   : datetime.now().isoformat(),
+    }
+
+
+job_queue.register("n8n_analysis", _run_n8n_analysis)
+
+
+def _idempotency_key(request: Request, body: dict) -> str:
+    """
+    Explicit key from the Idempotency-Key header or body. Without one,
+    identical bodies are coalesced while a run for them is still in flight.
+    """
+    key = request.headers.get("idempotency-key") or body.get("idempotency_key")
+    if key:
+        return str(key)
+    digest = hashlib.sha256(json.dumps(body, sort_keys=True, default=str).encode()).hexdigest()
+    return f"auto:{digest[:32]}"
+
 
 # ── POST /api/webhook/n8n ─────────────────────────────────────────────────────
 @router.post("/webhook/n8n", tags=["Webhook"])
 async def n8n_webhook(request: Request):
     """
     n8n calls this endpoint on its daily schedule.
-    Triggers the full AI analysis pipeline and returns results
-    back to n8n so it can route alerts to Slack/Gmail.
+    The analysis is queued as a background job and the job id comes back
+    immediately (202); poll GET /api/jobs/{id} or pass `callback_url` to
+    have the result POSTed back. Retries with the same Idempotency-Key
+    (header or body) return the existing job instead of starting another.
+    Send "wait": true for the old behaviour — the full agent result once
+    the job finishes, so n8n's IF node can check result["alerts"]. A run
+    that outlasts WEBHOOK_WAIT_TIMEOUT still gets the 202 with its job id.
+    `callback_url` must point at a host listed in JOB_CALLBACK_HOSTS (422).
     """
     try:
         try:
             body = await request.json()
         except Exception:
             body = {}
+        if not isinstance(body, dict):
+            body = {}
 
-        # ── Load campaign data and run the agent ──────────────────────────────
-        from app.data.campaigns import load_campaigns
-        from app.agents.marketing_agent import run_agent
+        try:
+            job, created = await job_queue.submit(
+                "n8n_analysis",
+                {"no_cache": bool(body.get("no_cache", False))},
+                idempotency_key = _idempotency_key(request, body),
+                callback_url    = body.get("callback_url"),
+            )
+        except ValueError as e:
+            return JSONResponse(
+                status_code=422,
+                content={
+                    "status"   : "error",
+                    "detail"   : str(e),
+                    "timestamp": datetime.now().isoformat(),
+                },
+            )
 
-        campaign_data = load_campaigns()
-        result        = await run_agent(campaign_data)
+        status = "queued" if created else "duplicate"
+        if body.get("wait"):
+            job = await job_queue.wait(job["id"], timeout=_WAIT_TIMEOUT)
+            if job["status"] == "failed":
+                raise RuntimeError(job["error"])
+            if job["status"] not in ACTIVE:
+                return JSONResponse(content={**job["result"], "job_id": job["id"]})
+            status = "timeout"   # still running — n8n polls status_url from here
 
-        # ── Return result to n8n ──────────────────────────────────────────────
-        # n8n's IF node will check result["alerts"] to decide
-        # whether to send Slack/Gmail notifications
-        return JSONResponse(content={
-            **result,
-            "triggered_by": "n8n_webhook",
-            "timestamp"   : datetime.now().isoformat(),
-        })
+        return JSONResponse(
+            status_code=202,
+            content={
+                "status"    : status,
+                "job_id"    : job["id"],
+                "job_status": job["status"],
+                "status_url": f"/api/jobs/{job['id']}",
+                "timestamp" : datetime.now().isoformat(),
+            },
+        )
 
     except Exception as e:
         return JSONResponse(
@@ -51,6 +121,44 @@ async def n8n_webhook(request: Request):
         )
 
 
+# ── POST /api/webhook/n8n/stream ──────────────────────────────────────────────
+@router.post("/webhook/n8n/stream", tags=["Webhook"])
+async def n8n_webhook_stream(request: Request):
+    """
+    Streaming variant of /webhook/n8n — server-sent progress events, ending
+    with a `result` event that carries the same body /webhook/n8n returns.
+    """
+    try:
+        body = await request.json()
+    except Exception:
+        body = {}
+
+    from app.data.campaigns import load_campaigns
+    from app.agents.marketing_agent import run_agent_events
+    from app.api.sse import sse_response
+
+    try:
+        campaign_data = await run_sync(load_campaigns)
+    except Exception as e:
+        # Fails before the stream opens, so it can still be a plain status
+        return JSONResponse(
+            status_code=404 if isinstance(e, FileNotFoundError) else 500,
+            content={
+                "status"   : "error",
+                "detail"   : str(e),
+                "timestamp": datetime.now().isoformat(),
+            },
+        )
+    return sse_response(
+        run_agent_events(
+            campaign_data,
+            use_cache     = not body.get("no_cache", False),
+            stream_tokens = bool(body.get("stream_tokens", False)),
+        ),
+        extra={"triggered_by": "n8n_webhook", "timestamp": datetime.now().isoformat()},
+    )
+
+
 # ── GET /api/webhook/test ─────────────────────────────────────────────────────
 @router.get("/webhook/test", tags=["Webhook"])
 async def webhook_test():
@@ -1,7 +1,7 @@
 # backend/app/data/campaigns.py
 # Delegates to data_loader.py — kept for backward compatibility
 from app.data.data_loader import (
-    load_campaigns,
+    load_campaigns_for_agent as load_campaigns,
     get_latest_snapshot,
     get_campaign_names,
 )
\ No newline at end of file
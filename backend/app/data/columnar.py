@@ -0,0 +1,333 @@
+# backend/app/data/columnar.py
+# ── Typed columnar storage for the ads dataset ───────────────────────────────
+#
+# The CSV is converted once into a directory of .npy column files plus a
+# manifest.json. Rows are partitioned by calendar month, and every part
+# records its min/max day so date-range reads can skip whole parts.
+# Ingested batches are added as extra parts, one per month they touch; once a
+# month holds more than COLUMNAR_COMPACT_PARTS parts they are merged back into
+# one. Dates are stored as int32 days since 1970-01-01 and the
+# dimension columns as dictionary-encoded codes, so loading is a handful of
+# memory-mapped reads instead of string parsing.
+#
+# Convert with:  python -m app.data.columnar  (from inside /backend folder)
+#
+# Tunables (.env):
+#   COLUMNAR_COMPACT_PARTS   default: 8 — parts per month before a merge
+#
+
+import json
+import os
+import shutil
+import sys
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from app.data.partitions import to_day
+
+MANIFEST       = "manifest.json"
+FORMAT_VERSION = 3
+
+# Column renames applied to the Kaggle export — shared with the CSV loader
+RENAMES = {
+    "ad_spend": "spend",
+    "CTR"     : "ctr",
+    "ROAS"    : "roas",
+    "CPC"     : "cpc",
+    "CPA"     : "cpa",
+    "platform": "campaign",
+}
+CATEGORY_COLS = ["campaign", "campaign_type", "industry", "country"]
+
+# Narrow numeric dtypes. Spend and revenue stay float64 so summed money is
+# exact to the cent; per-row counts fit int32 and per-row ratios float32.
+COUNT_COLS   = ["impressions", "clicks", "conversions"]
+FLOAT32_COLS = ["ctr", "cpc", "cpa", "roas"]
+
+COMPACT_PARTS = int(os.getenv("COLUMNAR_COMPACT_PARTS", "8"))
+
+# out_dir → (manifest file stat, usable, recorded source) — see is_fresh
+_freshness: Dict[str, tuple] = {}
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# HELPERS
+# ══════════════════════════════════════════════════════════════════════════════
+
+def columnar_path_for(csv_path: str) -> str:
+    """Default columnar directory that sits next to a CSV file."""
+    return os.path.splitext(csv_path)[0] + ".columnar"
+
+
+def source_signature(path: str) -> Optional[dict]:
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return {"mtime_ns": st.st_mtime_ns, "size": st.st_size}
+
+
+def read_manifest(out_dir: str) -> Optional[dict]:
+    path = os.path.join(out_dir, MANIFEST)
+    if not os.path.exists(path):
+        return None
+    with open(path, "r") as f:
+        manifest = json.load(f)
+    if manifest.get("version") != FORMAT_VERSION:
+        return None
+    return manifest
+
+
+def is_fresh(out_dir: str, csv_path: str) -> bool:
+    """
+    True if the columnar copy exists and was built from the current CSV.
+    Runs on every dataset cache lookup, so the manifest is only re-parsed
+    when its file changes (the swap in _write_manifest gives a new inode).
+    """
+    try:
+        st = os.stat(os.path.join(out_dir, MANIFEST))
+    except FileNotFoundError:
+        return False
+    stat   = (st.st_ino, st.st_mtime_ns, st.st_size)
+    cached = _freshness.get(out_dir)
+    if cached is None or cached[0] != stat:
+        manifest = read_manifest(out_dir)
+        cached   = (stat, manifest is not None, manifest.get("source") if manifest else None)
+        _freshness[out_dir] = cached
+    _, usable, source = cached
+    if not usable:
+        return False
+    current = source_signature(csv_path)
+    # No CSV left to compare against — the columnar copy is the source of truth
+    return current is None or source == current
+
+
+def compact_numeric(col: str, values: np.ndarray) -> np.ndarray:
+    """Narrows a numeric column per the dtype policy above; no copy if already narrow."""
+    if col in COUNT_COLS and (values.size == 0 or np.abs(values).max() < 2**31):
+        return values.astype(np.int32, copy=False)
+    if col in FLOAT32_COLS:
+        return values.astype(np.float32, copy=False)
+    return values
+
+
+def _codes_dtype(n_categories: int):
+    return np.int8 if n_categories < 127 else np.int16 if n_categories < 32767 else np.int32
+
+
+def _write_manifest(out_dir: str, manifest: dict) -> None:
+    tmp_path = os.path.join(out_dir, f"{MANIFEST}.tmp-{os.getpid()}")
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, os.path.join(out_dir, MANIFEST))
+
+
+def _write_part(part_dir: str, df: pd.DataFrame, columns: dict) -> dict:
+    """
+    Encodes one renamed frame into .npy files under `part_dir`.
+    Category dictionaries in `columns` are extended in place with unseen
+    values, so codes written by earlier parts stay valid.
+    """
+    os.makedirs(part_dir, exist_ok=True)
+    dtypes = {}
+    for col in df.columns:
+        entry = columns.setdefault(col, {})
+        if col == "date":
+            values = pd.to_datetime(df[col]).to_numpy().astype("datetime64[D]").astype(np.int32)
+            entry["kind"] = "days"
+        elif col in CATEGORY_COLS:
+            categories = entry.setdefault("categories", [])
+            known      = set(categories)
+            categories.extend(v for v in pd.unique(df[col].astype(str)) if v not in known)
+            codes  = pd.Categorical(df[col].astype(str), categories=categories).codes
+            values = codes.astype(_codes_dtype(len(categories)))
+            entry["kind"] = "category"
+        else:
+            values = compact_numeric(col, df[col].to_numpy())
+            entry["kind"] = "numeric"
+        dtypes[col] = str(values.dtype)
+        np.save(os.path.join(part_dir, f"{col}.npy"), values, allow_pickle=False)
+    return dtypes
+
+
+def _month(day: int) -> int:
+    return int(np.datetime64(day, "D").astype("datetime64[M]").astype(np.int64))
+
+
+def _next_name(manifest: dict) -> str:
+    # Numbered past the highest existing part — merges remove parts, so len() would collide
+    taken = [int(part["name"].rsplit("-", 1)[1]) for part in manifest["parts"]]
+    return f"part-{max(taken, default=-1) + 1:05d}"
+
+
+def _part_entry(name: str, df: pd.DataFrame, dtypes: dict) -> dict:
+    days = pd.to_datetime(df["date"]).to_numpy().astype("datetime64[D]").astype(np.int64)
+    return {
+        "name"   : name,
+        "rows"   : int(len(df)),
+        "min_day": int(days.min()),
+        "max_day": int(days.max()),
+        "dtypes" : dtypes,
+    }
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# CONVERTER
+# ══════════════════════════════════════════════════════════════════════════════
+
+def convert_csv(csv_path: str, out_dir: Optional[str] = None) -> dict:
+    """
+    Converts the Kaggle CSV into a typed columnar directory.
+    The directory is written next to the target and swapped in atomically.
+    """
+    out_dir = out_dir or columnar_path_for(csv_path)
+    df = pd.read_csv(csv_path).rename(columns=RENAMES)
+
+    tmp_dir = f"{out_dir}.tmp-{os.getpid()}"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+
+    # One part per calendar month, written in date order
+    dates  = pd.to_datetime(df["date"])
+    df     = df.iloc[np.argsort(dates.to_numpy(), kind="stable")].reset_index(drop=True)
+    months = pd.to_datetime(df["date"]).dt.to_period("M")
+
+    columns, parts = {}, []
+    for month, part_df in df.groupby(months, sort=True):
+        name = f"part-{len(parts):05d}"
+        parts.append(_part_entry(name, part_df, _write_part(os.path.join(tmp_dir, name), part_df, columns)))
+
+    manifest = {
+        "version": FORMAT_VERSION,
+        "rows"   : int(len(df)),
+        "source" : source_signature(csv_path),
+        "columns": columns,
+        "parts"  : parts,
+    }
+    _write_manifest(tmp_dir, manifest)
+
+    old_dir = f"{out_dir}.old-{os.getpid()}"
+    if os.path.exists(out_dir):
+        os.replace(out_dir, old_dir)
+    os.replace(tmp_dir, out_dir)
+    shutil.rmtree(old_dir, ignore_errors=True)
+    return manifest
+
+
+def append_part(out_dir: str, df: pd.DataFrame, csv_path: Optional[str] = None) -> dict:
+    """
+    Appends already-renamed rows as new parts (one per calendar month in the
+    batch) without rewriting old parts, then compacts any month that now has
+    more than COMPACT_PARTS parts. When `csv_path` is given, the recorded
+    source signature is refreshed so the columnar copy stays fresh after the
+    CSV was appended to as well.
+    """
+    manifest = read_manifest(out_dir)
+    if manifest is None:
+        raise FileNotFoundError(f"No columnar dataset at {out_dir}.")
+
+    months = pd.to_datetime(df["date"]).dt.to_period("M")
+    for _, month_df in df.groupby(months, sort=True):
+        name   = _next_name(manifest)
+        dtypes = _write_part(os.path.join(out_dir, name), month_df, manifest["columns"])
+        manifest["parts"].append(_part_entry(name, month_df, dtypes))
+    manifest["rows"] += int(len(df))
+    if csv_path is not None:
+        manifest["source"] = source_signature(csv_path)
+
+    touched = {_month(part["min_day"]) for part in manifest["parts"][-months.nunique():]}
+    retired = [name for month in sorted(touched) for name in _compact_month(out_dir, manifest, month)]
+    # The manifest swap is the commit point — readers never see a half-written part
+    _write_manifest(out_dir, manifest)
+    for name in retired:
+        shutil.rmtree(os.path.join(out_dir, name), ignore_errors=True)
+    return manifest
+
+
+def _compact_month(out_dir: str, manifest: dict, month: int) -> List[str]:
+    """
+    Merges a month's parts into one once there are more than COMPACT_PARTS.
+    Updates `manifest` in place and returns the retired part names, which
+    stay on disk until the new manifest is written.
+    """
+    group = [
+        part for part in manifest["parts"]
+        if _month(part["min_day"]) == month == _month(part["max_day"])
+    ]
+    if len(group) <= COMPACT_PARTS:
+        return []
+
+    frame = _read_parts(out_dir, manifest, group, mmap=False)
+    frame = frame.iloc[np.argsort(frame["date"].to_numpy(), kind="stable")].reset_index(drop=True)
+    name  = _next_name(manifest)
+    entry = _part_entry(name, frame, _write_part(os.path.join(out_dir, name), frame, manifest["columns"]))
+
+    retired = {part["name"] for part in group}
+    at      = next(i for i, part in enumerate(manifest["parts"]) if part["name"] in retired)
+    kept    = [part for part in manifest["parts"] if part["name"] not in retired]
+    manifest["parts"] = kept[:at] + [entry] + kept[at:]
+    return sorted(retired)
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# READER
+# ══════════════════════════════════════════════════════════════════════════════
+
+def read_columnar(
+    out_dir: str,
+    mmap   : bool = True,
+    start  = None,
+    end    = None,
+) -> pd.DataFrame:
+    """
+    Loads a columnar directory as a DataFrame with the CSV loader's column names.
+    Numeric columns stay memory-mapped when `mmap` is set and a single part
+    is read; dates come back as datetime64 and dimensions as categoricals.
+    With `start`/`end` (inclusive, date-like) only parts whose min/max day
+    overlap the range are opened — rows outside it may still be returned.
+    """
+    manifest = read_manifest(out_dir)
+    if manifest is None:
+        raise FileNotFoundError(f"No columnar dataset at {out_dir}.")
+
+    start_day = to_day(start) if start is not None else None
+    end_day   = to_day(end)   if end   is not None else None
+    parts = [
+        part for part in manifest["parts"]
+        if (start_day is None or part["max_day"] >= start_day)
+        and (end_day is None or part["min_day"] <= end_day)
+    ]
+    return _read_parts(out_dir, manifest, parts, mmap)
+
+
+def _read_parts(out_dir: str, manifest: dict, parts: List[dict], mmap: bool) -> pd.DataFrame:
+    data = {}
+    for col, entry in manifest["columns"].items():
+        chunks = [
+            np.load(os.path.join(out_dir, part["name"], f"{col}.npy"), mmap_mode="r" if mmap else None)
+            for part in parts
+        ]
+        if not chunks:
+            values = np.empty(0, dtype=np.int32 if entry["kind"] != "numeric" else np.float64)
+        else:
+            values = chunks[0] if len(chunks) == 1 else np.concatenate(chunks)
+        if entry["kind"] == "days":
+            data[col] = values.astype("datetime64[D]").astype("datetime64[ns]")
+        elif entry["kind"] == "category":
+            data[col] = pd.Categorical.from_codes(values, categories=entry["categories"])
+        else:
+            data[col] = values
+    return pd.DataFrame(data, copy=False)
+
+
+if __name__ == "__main__":
+    from app.data.data_loader import _CSV_PATH
+
+    src = sys.argv[1] if len(sys.argv) > 1 else _CSV_PATH
+    dst = sys.argv[2] if len(sys.argv) > 2 else columnar_path_for(src)
+    manifest = convert_csv(src, dst)
+    print(f"✅  Converted {manifest['rows']} rows into {len(manifest['parts'])} monthly parts  →  {dst}")
+    for col, entry in manifest["columns"].items():
+        print(f"    {col:<14} {entry['kind']:<9} {manifest['parts'][0]['dtypes'][col]}")
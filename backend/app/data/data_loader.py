@@ -1,34 +1,345 @@
 # backend/app/data/data_loader.py
 # ── Kaggle Dataset Loader & Normalizer ───────────────────────────────────────
 
+import io
+import itertools
 import os
+import threading
+import numpy as np
 import pandas as pd
 from typing import List, Optional
 
+from app.data.columnar import (
+    CATEGORY_COLS,
+    MANIFEST,
+    RENAMES,
+    append_part,
+    columnar_path_for,
+    compact_numeric,
+    is_fresh,
+    read_columnar,
+)
+from app.data.indexes import FrameIndex
+from app.data.partitions import PartitionTable, frame_days, to_day
+from app.data.rollup import RollupCube, finalize, sum_components
+from app.services.shared_state import file_lock
+
 _ROOT     = os.path.normpath(os.path.join(os.path.dirname(__file__), "..", "..", "..", "data"))
 _CSV_PATH = os.path.join(_ROOT, "global_ads_performance_dataset.csv")
 
+# Typed columnar copy of the CSV — build it with `python -m app.data.columnar`
+_COLUMNAR_PATH = columnar_path_for(_CSV_PATH)
 
-def _load_raw() -> pd.DataFrame:
+# Set DATA_ROLLUPS=0 to answer queries by scanning the raw rows instead
+_USE_ROLLUPS = os.getenv("DATA_ROLLUPS", "1") != "0"
+
+# Raw Kaggle export layout — ingested batches are appended in this order
+_RAW_COLUMNS = [
+    "date", "platform", "campaign_type", "industry", "country",
+    "impressions", "clicks", "CTR", "CPC", "ad_spend", "conversions", "CPA", "revenue", "ROAS",
+]
+_RAW_DIMS    = ["platform", "campaign_type", "industry", "country"]
+_RAW_COUNTS  = ["impressions", "clicks", "conversions"]
+_RAW_MONEY   = ["ad_spend", "revenue"]
+# Per-row ratios are optional on ingest and derived from components if absent
+_RAW_RATIOS  = {
+    "CTR" : ("clicks",   "impressions", 4),
+    "CPC" : ("ad_spend", "clicks",      2),
+    "CPA" : ("ad_spend", "conversions", 2),
+    "ROAS": ("revenue",  "ad_spend",    2),
+}
+
+
+def _source_path() -> str:
+    """Prefers the columnar copy when it was built from the current CSV."""
+    if is_fresh(_COLUMNAR_PATH, _CSV_PATH):
+        return os.path.join(_COLUMNAR_PATH, MANIFEST)
+    return _CSV_PATH
+
+
+def _normalize(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Compact in-memory layout: categorical dimensions, a native datetime64
+    date column and narrow numeric dtypes. Dates are only formatted as
+    strings when rows are serialized (see _records).
+    """
+    df = df.rename(columns=RENAMES)
+    df["date"] = pd.to_datetime(df["date"])
+    for col in df.columns:
+        if col in CATEGORY_COLS:
+            df[col] = df[col].astype("category")
+        elif col != "date":
+            df[col] = compact_numeric(col, df[col].to_numpy())
+    return df
+
+
+def _records(df: pd.DataFrame) -> List[dict]:
+    """Serializes aggregated rows — the only place dates become strings."""
+    if df.empty:
+        return []
+    return df.assign(date=df["date"].dt.strftime("%Y-%m-%d")).to_dict(orient="records")
+
+
+def _read_dataset() -> pd.DataFrame:
+    if is_fresh(_COLUMNAR_PATH, _CSV_PATH):
+        return _normalize(read_columnar(_COLUMNAR_PATH))
     if not os.path.exists(_CSV_PATH):
         raise FileNotFoundError(
             f"Kaggle dataset not found at {_CSV_PATH}.\n"
             "Download from Kaggle and place it in the /data folder."
         )
-    df = pd.read_csv(_CSV_PATH)
-    df = df.rename(columns={
-        "ad_spend": "spend",
-        "CTR"     : "ctr",
-        "ROAS"    : "roas",
-        "CPC"     : "cpc",
-        "CPA"     : "cpa",
-        "platform": "campaign",
-    })
-    df["date"] = pd.to_datetime(df["date"]).dt.strftime("%Y-%m-%d")
-    for col in ["spend", "revenue", "roas", "ctr", "cpc", "cpa"]:
-        if col in df.columns:
-            df[col] = df[col].round(2)
-    return df
+    if os.path.exists(_COLUMNAR_PATH):
+        print(f"[Data] ⚠️  {_COLUMNAR_PATH} is older than the CSV — reading CSV. Re-run the converter.")
+    return _normalize(pd.read_csv(_CSV_PATH))
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# DATASET CACHE
+# ══════════════════════════════════════════════════════════════════════════════
+
+def _concat_rows(frame: pd.DataFrame, rows: pd.DataFrame) -> pd.DataFrame:
+    """Appends normalized rows, unioning category dictionaries so dtypes stay compact."""
+    frame, rows = frame.copy(deep=False), rows.copy(deep=False)
+    for col in CATEGORY_COLS:
+        if col in frame.columns:
+            categories = frame[col].cat.categories.append(
+                rows[col].cat.categories.difference(frame[col].cat.categories)
+            )
+            frame[col] = frame[col].cat.set_categories(categories)
+            rows[col]  = rows[col].cat.set_categories(categories)
+    return pd.concat([frame, rows], ignore_index=True)
+
+
+class _Dataset:
+    """
+    A loaded frame plus the rollups, indexes and partitions derived from it
+    at load time. The frame is kept sorted by date, so row positions double
+    as a time axis and each month is a contiguous partition.
+    """
+
+    def __init__(
+        self,
+        frame: pd.DataFrame,
+        cube : Optional[RollupCube] = None,
+        index: Optional[FrameIndex] = None,
+    ):
+        if not frame["date"].is_monotonic_increasing:
+            frame = frame.sort_values("date", kind="stable").reset_index(drop=True)
+            index = None
+        self.frame      = frame
+        self.cube       = cube if cube is not None else RollupCube(frame) if _USE_ROLLUPS else None
+        self.index      = index if index is not None else FrameIndex(frame)
+        self.partitions = PartitionTable(frame_days(frame["date"]))
+
+    def appended(self, rows: pd.DataFrame) -> tuple:
+        """
+        Returns (new dataset with `rows` added, rollup cells updated).
+        Only the cube cells the rows touch are rebuilt; the original
+        dataset stays valid for readers that already hold it. Rows dated
+        before the current max date force a re-sort and index rebuild.
+        """
+        cube, touched = None, 0
+        if self.cube is not None:
+            cube    = self.cube.copy()
+            touched = cube.apply(rows)
+        in_order = self.frame.empty or rows["date"].min() >= self.frame["date"].iloc[-1]
+        index    = self.index.appended(rows) if in_order else None
+        return _Dataset(_concat_rows(self.frame, rows), cube, index), touched
+
+
+class _DatasetCache:
+    """
+    Holds the normalized dataset in memory, shared by every request.
+    The source file is re-read only when its mtime or size changes.
+    The cached frame is shared — callers must never mutate it in place.
+    """
+
+    def __init__(self):
+        self._lock      = threading.Lock()
+        self._dataset   : Optional[_Dataset] = None
+        self._signature : Optional[tuple] = None
+        self._hits      = 0
+        self._misses    = 0
+        self._reloads   = 0
+
+    @staticmethod
+    def _stat() -> tuple:
+        path = _source_path()
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return (path, st.st_mtime_ns, st.st_size)
+
+    def get(self) -> _Dataset:
+        signature = self._stat()
+        with self._lock:
+            return self._get_locked(signature)
+
+    def _get_locked(self, signature: tuple, writing: bool = False) -> _Dataset:
+        if self._dataset is not None and signature == self._signature:
+            self._hits += 1
+            return self._dataset
+
+        # Load under the lock so concurrent misses parse the file once. The
+        # shared file lock keeps another worker's ingest from landing
+        # mid-read (a writer already holds the exclusive one).
+        if writing:
+            dataset = _Dataset(_read_dataset())
+        else:
+            with file_lock("dataset", shared=True):
+                dataset = _Dataset(_read_dataset())
+        if self._dataset is None:
+            self._misses += 1
+        else:
+            self._reloads += 1
+        self._dataset   = dataset
+        self._signature = signature
+        return dataset
+
+    def append(self, batch: pd.DataFrame) -> dict:
+        """
+        Persists a validated raw batch and folds it into the cached dataset
+        without re-reading the store. Writers are serialized by the cache lock
+        within a process and by the "dataset" file lock across workers; the
+        reload check runs inside both, so another worker's batch is never lost.
+        """
+        with self._lock, file_lock("dataset"):
+            dataset  = self._get_locked(self._stat(), writing=True)
+            columnar = is_fresh(_COLUMNAR_PATH, _CSV_PATH)
+
+            if os.path.exists(_CSV_PATH):
+                with open(_CSV_PATH, "a", newline="") as f:
+                    batch.to_csv(f, header=False, index=False)
+            if columnar:
+                csv_path = _CSV_PATH if os.path.exists(_CSV_PATH) else None
+                append_part(_COLUMNAR_PATH, batch.rename(columns=RENAMES), csv_path)
+
+            rows             = _normalize(batch)
+            updated, touched = dataset.appended(rows)
+            self._dataset    = updated
+            self._signature  = self._stat()
+
+        return {
+            "rows_ingested"  : len(rows),
+            "rows_total"     : len(updated.frame),
+            "date_range"     : [rows["date"].min().strftime("%Y-%m-%d"), rows["date"].max().strftime("%Y-%m-%d")],
+            "store"          : "columnar" if columnar else "csv",
+            "rollups_updated": touched,
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._dataset   = None
+            self._signature = None
+
+    def stats(self) -> dict:
+        with self._lock:
+            dataset = self._dataset
+            return {
+                "hits"      : self._hits,
+                "misses"    : self._misses,
+                "reloads"   : self._reloads,
+                "loaded"    : dataset is not None,
+                "rows"      : len(dataset.frame) if dataset is not None else 0,
+                "rollups"   : len(dataset.cube) if dataset is not None and dataset.cube is not None else 0,
+                "partitions": len(dataset.partitions) if dataset is not None else 0,
+            }
+
+
+_cache = _DatasetCache()
+
+
+def _load_raw() -> pd.DataFrame:
+    return _cache.get().frame
+
+
+def _parse_filter(value: Optional[str]) -> Optional[List[str]]:
+    """None / "All" → no filter; "UK,UAE" → ["UK", "UAE"]."""
+    if not value:
+        return None
+    values = [v.strip() for v in value.split(",") if v.strip()]
+    if not values or "All" in values:
+        return None
+    return values
+
+
+def _filters(platform: Optional[str], industry: Optional[str], country: Optional[str]) -> dict:
+    return {
+        "campaign": _parse_filter(platform),
+        "industry": _parse_filter(industry),
+        "country" : _parse_filter(country),
+    }
+
+
+def _cube_for(dataset: _Dataset, filters: dict) -> Optional[RollupCube]:
+    """The rollup cube, if it can answer these filters (single value per dimension)."""
+    if dataset.cube is None or any(v is not None and len(v) > 1 for v in filters.values()):
+        return None
+    return dataset.cube
+
+
+def _cube_args(filters: dict) -> tuple:
+    return tuple(v[0] if v else None for v in filters.values())
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# INGESTION
+# ══════════════════════════════════════════════════════════════════════════════
+
+def _validate_batch(raw: pd.DataFrame) -> pd.DataFrame:
+    """
+    Checks a batch of raw export rows and returns it in _RAW_COLUMNS order.
+    Raises ValueError describing every problem found.
+    """
+    if raw.empty:
+        raise ValueError("No rows to ingest.")
+
+    required = ["date"] + _RAW_DIMS + _RAW_COUNTS + _RAW_MONEY
+    missing  = [c for c in required if c not in raw.columns]
+    unknown  = [c for c in raw.columns if c not in _RAW_COLUMNS]
+    if missing or unknown:
+        raise ValueError(f"Missing columns: {missing}; unknown columns: {unknown}")
+
+    raw    = raw.copy()
+    errors = []
+
+    dates = pd.to_datetime(raw["date"], errors="coerce", format="%Y-%m-%d")
+    if dates.isna().any():
+        errors.append(f"invalid date in rows {raw.index[dates.isna()].tolist()[:10]}")
+    raw["date"] = dates.dt.strftime("%Y-%m-%d")
+
+    for col in _RAW_DIMS:
+        values = raw[col].astype("string").str.strip()
+        blank  = values.isna() | (values == "")
+        if blank.any():
+            errors.append(f"empty {col} in rows {raw.index[blank].tolist()[:10]}")
+        raw[col] = values
+
+    for col in _RAW_COUNTS + _RAW_MONEY + list(_RAW_RATIOS):
+        if col not in raw.columns:
+            continue
+        values = pd.to_numeric(raw[col], errors="coerce")
+        bad    = values < 0 if col in _RAW_RATIOS else values.isna() | (values < 0)
+        if bad.any():
+            errors.append(f"invalid {col} in rows {raw.index[bad].tolist()[:10]}")
+        if col in _RAW_COUNTS and (values.dropna() % 1 != 0).any():
+            errors.append(f"{col} must be whole numbers")
+        raw[col] = values
+
+    if errors:
+        raise ValueError("; ".join(errors))
+
+    for col, (num, den, digits) in _RAW_RATIOS.items():
+        derived = np.divide(
+            raw[num].to_numpy(dtype=float), raw[den].to_numpy(dtype=float),
+            out=np.zeros(len(raw)), where=raw[den].to_numpy() != 0,
+        ).round(digits)
+        raw[col] = raw[col].fillna(pd.Series(derived, index=raw.index)) if col in raw.columns else derived
+    for col in _RAW_COUNTS:
+        raw[col] = raw[col].astype(np.int64)
+
+    return raw[_RAW_COLUMNS].reset_index(drop=True)
 
 
 def _apply_filters(
@@ -36,88 +347,169 @@ def _apply_filters(
     platform: Optional[str] = None,
     industry: Optional[str] = None,
     country : Optional[str] = None,
+    index   : Optional[FrameIndex] = None,
 ) -> pd.DataFrame:
-    """Filter BEFORE aggregation so industry/country work correctly."""
-    if platform and platform != "All":
-        df = df[df["campaign"] == platform]
-    if industry and industry != "All":
-        df = df[df["industry"] == industry]
-    if country and country != "All":
-        df = df[df["country"] == country]
+    """
+    Filter BEFORE aggregation so industry/country work correctly.
+    Filters accept comma-separated values (country="UK,UAE"). With the
+    dataset's `index`, rows are picked by intersecting precomputed
+    positions; without one, each active filter is a column mask.
+    """
+    filters = _filters(platform, industry, country)
+    if index is not None:
+        positions = index.select(filters)
+        return df if positions is None else df.iloc[positions]
+    for col, values in filters.items():
+        if values:
+            df = df[df[col].isin(values)]
     return df
 
 
-def _aggregate(df: pd.DataFrame) -> pd.DataFrame:
+def _aggregate(df: pd.DataFrame, ratio_mode: str = "weighted") -> pd.DataFrame:
+    """
+    (date, campaign) rollup of raw rows. Ratio metrics come from summed
+    components (ratio_mode="weighted") or from the legacy mean of per-row
+    ratios (ratio_mode="mean").
+    """
     if df.empty:
         return df
-    agg = df.groupby(["date", "campaign"]).agg(
-        impressions = ("impressions", "sum"),
-        clicks      = ("clicks",      "sum"),
-        spend       = ("spend",       "sum"),
-        conversions = ("conversions", "sum"),
-        revenue     = ("revenue",     "sum"),
-        roas        = ("roas",        "mean"),
-        ctr         = ("ctr",         "mean"),
-        cpc         = ("cpc",         "mean"),
-        cpa         = ("cpa",         "mean"),
-    ).reset_index()
-    for col in ["spend", "revenue", "roas", "ctr", "cpc", "cpa"]:
-        agg[col] = agg[col].round(2)
-    return agg
-
-
-def _tail_days(df: pd.DataFrame, days: int) -> pd.DataFrame:
-    """
-    Returns last N days relative to the DATASET's own max date.
+    components = sum_components(df, ["date", "campaign"]).astype({"campaign": object})
+    return finalize(components.sort_values(["date", "campaign"]), ratio_mode)
+
+
+def _tail_days(
+    dataset  : _Dataset,
+    positions: Optional[np.ndarray],
+    days     : Optional[int] = None,
+    start    = None,
+    end      = None,
+) -> pd.DataFrame:
+    """
+    Rows at `positions` (None = all rows) inside the date window.
+    Without start/end: last N days relative to those rows' own max date.
     This works correctly even if the dataset is from a past year.
     Never use pd.Timestamp.today() — the dataset dates won't match.
+
+    Partition min/max metadata bounds the row range first, so only rows
+    in overlapping partitions are ever materialized.
     """
-    if df.empty:
-        return df
-    max_date = pd.to_datetime(df["date"]).max()
-    cutoff   = max_date - pd.Timedelta(days=days)
-    return df[pd.to_datetime(df["date"]) >= cutoff]
+    parts = dataset.partitions
+    if positions is not None and not len(positions):
+        return dataset.frame.iloc[:0]
+
+    if start is not None or end is not None:
+        lo, hi = parts.row_range(
+            to_day(start) if start is not None else None,
+            to_day(end)   if end   is not None else None,
+        )
+    elif days is not None:
+        last    = int(positions[-1]) if positions is not None else len(dataset.frame) - 1
+        if last < 0:
+            return dataset.frame
+        max_day = parts.day_at(last)
+        lo, hi  = parts.row_range(max_day - days, max_day)
+    else:
+        lo, hi = 0, len(dataset.frame)
+
+    if positions is None:
+        return dataset.frame.iloc[lo:hi]
+    return dataset.frame.iloc[positions[np.searchsorted(positions, lo):np.searchsorted(positions, hi)]]
 
 
 # ── Public functions ──────────────────────────────────────────────────────────
 
 def load_campaigns_for_chart(
-    platform: Optional[str] = None,
-    industry: Optional[str] = None,
-    country : Optional[str] = None,
+    platform  : Optional[str] = None,
+    industry  : Optional[str] = None,
+    country   : Optional[str] = None,
+    ratio_mode: str = "weighted",
+    start     = None,
+    end       = None,
 ) -> List[dict]:
-    """Last 90 days (relative to dataset) for the ROAS chart."""
-    df = _load_raw()
-    df = _apply_filters(df, platform, industry, country)
-    df = _tail_days(df, 90)
-    return _aggregate(df).to_dict(orient="records") if not df.empty else []
+    """
+    Last 90 days (relative to dataset) for the ROAS chart, or the explicit
+    inclusive start/end date range when either is given.
+    Filters accept comma-separated values, e.g. country="UK,UAE".
+    """
+    return _window(platform, industry, country, 90, ratio_mode, start, end)
 
 
 def load_campaigns_for_agent(
-    platform: Optional[str] = None,
-    industry: Optional[str] = None,
-    country : Optional[str] = None,
+    platform  : Optional[str] = None,
+    industry  : Optional[str] = None,
+    country   : Optional[str] = None,
+    ratio_mode: str = "weighted",
 ) -> List[dict]:
     """Last 30 days (relative to dataset) for the AI agent."""
-    df = _load_raw()
-    df = _apply_filters(df, platform, industry, country)
-    df = _tail_days(df, 30)
-    return _aggregate(df).to_dict(orient="records") if not df.empty else []
+    return _window(platform, industry, country, 30, ratio_mode)
+
+
+def load_segments_for_agent(segments: List[dict], ratio_mode: str = "weighted") -> List[List[dict]]:
+    """
+    load_campaigns_for_agent for many {platform, industry, country} segments
+    at once. All segments are cut from one dataset snapshot, so a batch sees
+    consistent data even if an ingest lands mid-way.
+    """
+    dataset = _cache.get()
+    return [
+        _window(s.get("platform"), s.get("industry"), s.get("country"), 30, ratio_mode, dataset=dataset)
+        for s in segments
+    ]
+
+
+def expand_segments(dimensions: dict) -> List[dict]:
+    """
+    Cross product of dimension values → list of segments. Keys are
+    platform / industry / country; a value is a list, a single value, or
+    "*" for every known value. Missing dimensions are left unfiltered.
+    """
+    options = get_filter_options()
+    known   = {"platform": options["platforms"], "industry": options["industries"], "country": options["countries"]}
+    unknown = [k for k in dimensions if k not in known]
+    if unknown:
+        raise ValueError(f"Unknown dimensions: {unknown} (expected {list(known)})")
+
+    axes = []
+    for dim in known:
+        values = dimensions.get(dim)
+        if values is None:
+            continue
+        if values == "*":
+            values = known[dim]
+        elif isinstance(values, str):
+            values = [values]
+        axes.append([(dim, v) for v in values])
+    return [dict(combo) for combo in itertools.product(*axes)]
+
+
+def _window(platform, industry, country, days: int, ratio_mode: str, start=None, end=None, dataset=None) -> List[dict]:
+    dataset = dataset or _cache.get()
+    filters = _filters(platform, industry, country)
+    cube    = _cube_for(dataset, filters)
+    if cube is not None:
+        return _records(cube.query(*_cube_args(filters), days=days, ratio_mode=ratio_mode, start=start, end=end))
+    df = _tail_days(dataset, dataset.index.select(filters), days, start, end)
+    return _records(_aggregate(df, ratio_mode))
 
 
 def get_latest_snapshot(
-    platform: Optional[str] = None,
-    industry: Optional[str] = None,
-    country : Optional[str] = None,
+    platform  : Optional[str] = None,
+    industry  : Optional[str] = None,
+    country   : Optional[str] = None,
+    ratio_mode: str = "weighted",
 ) -> List[dict]:
     """Most recent aggregated row per platform for dashboard cards."""
-    df  = _load_raw()
-    df  = _apply_filters(df, platform, industry, country)
-    agg = _aggregate(df)
+    dataset = _cache.get()
+    filters = _filters(platform, industry, country)
+    cube    = _cube_for(dataset, filters)
+    if cube is not None:
+        return _records(cube.latest(*_cube_args(filters), ratio_mode=ratio_mode))
+    df  = _apply_filters(dataset.frame, platform, industry, country, dataset.index)
+    agg = _aggregate(df, ratio_mode)
     if agg.empty:
         return []
-    latest = agg.sort_values("date").groupby("campaign").tail(1)
-    return latest.to_dict(orient="records")
+    latest = agg.sort_values("date").groupby("campaign", observed=True).tail(1)
+    return _records(latest)
 
 
 def get_filter_options() -> dict:
@@ -130,6 +522,72 @@ def get_filter_options() -> dict:
     }
 
 
+def ingest_records(records: List[dict]) -> dict:
+    """
+    Validates raw export rows (Kaggle column names) and appends them to the
+    dataset store and the in-memory dataset without a full reload.
+    """
+    if not isinstance(records, list) or not all(isinstance(r, dict) for r in records):
+        raise ValueError("Expected a list of row objects.")
+    return _cache.append(_validate_batch(pd.DataFrame.from_records(records)))
+
+
+def ingest_csv(text: str) -> dict:
+    """Same as ingest_records, for a CSV body with a header row."""
+    try:
+        raw = pd.read_csv(io.StringIO(text))
+    except (pd.errors.EmptyDataError, pd.errors.ParserError) as e:
+        raise ValueError(f"Could not parse CSV: {e}")
+    return _cache.append(_validate_batch(raw))
+
+
+def get_cache_stats() -> dict:
+    """Hit/miss/reload counters for the in-process dataset cache."""
+    return _cache.stats()
+
+
+def clear_cache() -> None:
+    """Drop the cached dataset; the next call re-reads the file."""
+    _cache.clear()
+
+
 def get_campaign_names() -> List[str]:
     df = _load_raw()
-    return sorted(df["campaign"].unique().tolist())
\ No newline at end of file
+    return sorted(df["campaign"].unique().tolist())
+
+
+def get_memory_report() -> dict:
+    """
+    Compares the compact in-memory frame against the legacy layout
+    (object strings for dates and dimensions, 64-bit numerics).
+    """
+    compact = _load_raw()
+    legacy  = compact.astype({
+        col: "object" if col in CATEGORY_COLS
+        else "int64" if pd.api.types.is_integer_dtype(compact[col])
+        else "float64"
+        for col in compact.columns if col != "date"
+    })
+    legacy["date"] = compact["date"].dt.strftime("%Y-%m-%d")
+
+    before = legacy.memory_usage(deep=True, index=False)
+    after  = compact.memory_usage(deep=True, index=False)
+    return {
+        "rows"        : len(compact),
+        "before_bytes": int(before.sum()),
+        "after_bytes" : int(after.sum()),
+        "reduction"   : round(before.sum() / after.sum(), 2) if after.sum() else None,
+        "columns"     : {
+            col: {"before": int(before[col]), "after": int(after[col]), "dtype": str(compact[col].dtype)}
+            for col in compact.columns
+        },
+    }
+
+
+if __name__ == "__main__":
+    report = get_memory_report()
+    print(f"📊  Rows: {report['rows']}")
+    print(f"    {'column':<14} {'dtype':<10} {'before':>10} {'after':>10}")
+    for col, usage in report["columns"].items():
+        print(f"    {col:<14} {usage['dtype']:<10} {usage['before']:>10} {usage['after']:>10}")
+    print(f"\n✅  {report['before_bytes']:,} B  →  {report['after_bytes']:,} B  ({report['reduction']}x smaller)")
@@ -0,0 +1,74 @@
+# backend/app/data/indexes.py
+# ── Secondary row-position indexes on the dimension columns ──────────────────
+#
+# Each dimension value maps to a sorted int64 array of row positions.
+# Filters become array lookups, unions (multi-value filters such as
+# country=UK,UAE) and sorted intersections instead of full-column scans.
+#
+
+from functools import reduce
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+INDEXED_COLS = ["campaign", "industry", "country"]
+
+_EMPTY = np.empty(0, dtype=np.int64)
+
+
+class DimensionIndex:
+    """value → sorted row positions for one categorical column."""
+
+    def __init__(self, values: pd.Series, offset: int = 0):
+        cat    = values.astype("category").cat
+        codes  = cat.codes.to_numpy()
+        order  = np.argsort(codes, kind="stable")
+        bounds = np.searchsorted(codes[order], np.arange(len(cat.categories) + 1), side="left")
+        self._positions: Dict[str, np.ndarray] = {
+            str(value): order[bounds[i]:bounds[i + 1]].astype(np.int64) + offset
+            for i, value in enumerate(cat.categories)
+            if bounds[i + 1] > bounds[i]
+        }
+
+    def lookup(self, values: List[str]) -> np.ndarray:
+        """Sorted positions of rows matching any of `values`."""
+        hits = [self._positions[v] for v in values if v in self._positions]
+        if not hits:
+            return _EMPTY
+        return hits[0] if len(hits) == 1 else np.sort(np.concatenate(hits))
+
+    def appended(self, values: pd.Series, offset: int) -> "DimensionIndex":
+        """New index with rows starting at `offset` added; positions stay sorted."""
+        delta = DimensionIndex(values, offset)
+        out   = DimensionIndex.__new__(DimensionIndex)
+        out._positions = dict(self._positions)
+        for value, positions in delta._positions.items():
+            existing = out._positions.get(value)
+            out._positions[value] = positions if existing is None else np.concatenate([existing, positions])
+        return out
+
+
+class FrameIndex:
+    """Dimension indexes for a whole frame, built once per dataset load."""
+
+    def __init__(self, df: pd.DataFrame):
+        self._dims = {col: DimensionIndex(df[col]) for col in INDEXED_COLS if col in df.columns}
+        self._rows = len(df)
+
+    def select(self, filters: Dict[str, Optional[List[str]]]) -> Optional[np.ndarray]:
+        """
+        Sorted positions matching every active filter (values within one
+        dimension are OR-ed, dimensions are AND-ed). None means no filter.
+        """
+        hits = [self._dims[col].lookup(values) for col, values in filters.items() if values]
+        if not hits:
+            return None
+        hits.sort(key=len)
+        return reduce(lambda a, b: np.intersect1d(a, b, assume_unique=True), hits)
+
+    def appended(self, rows: pd.DataFrame) -> "FrameIndex":
+        out = FrameIndex.__new__(FrameIndex)
+        out._dims = {col: index.appended(rows[col], self._rows) for col, index in self._dims.items()}
+        out._rows = self._rows + len(rows)
+        return out
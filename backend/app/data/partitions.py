@@ -0,0 +1,76 @@
+# backend/app/data/partitions.py
+# ── Monthly time partitions over the date-sorted dataset ─────────────────────
+#
+# The in-memory frame is kept sorted by date, so every calendar month is a
+# contiguous run of rows. Each partition records its row range and min/max
+# day; window queries prune to the overlapping partitions and only then
+# binary-search inside the boundary partitions.
+#
+
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+def to_day(value) -> int:
+    """Date-like (str, date, Timestamp, datetime64) → days since 1970-01-01."""
+    return int(pd.Timestamp(value).to_datetime64().astype("datetime64[D]").astype(np.int64))
+
+
+def frame_days(dates: pd.Series) -> np.ndarray:
+    return dates.to_numpy().astype("datetime64[D]").astype(np.int64)
+
+
+class PartitionTable:
+    """Month partitions of a date-sorted day array."""
+
+    def __init__(self, days: np.ndarray):
+        self._days = days
+        if len(days):
+            months      = days.astype("datetime64[D]").astype("datetime64[M]").astype(np.int64)
+            bounds      = np.flatnonzero(np.diff(months)) + 1
+            self.starts = np.r_[0, bounds]
+            self.stops  = np.r_[bounds, len(days)]
+        else:
+            self.starts = self.stops = np.empty(0, dtype=np.int64)
+        self.min_day = days[self.starts]
+        self.max_day = days[self.stops - 1]
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def day_at(self, row: int) -> int:
+        return int(self._days[row])
+
+    def row_range(self, start_day: Optional[int] = None, end_day: Optional[int] = None) -> Tuple[int, int]:
+        """
+        [lo, hi) row range covering start_day..end_day inclusive. Only the
+        partitions whose [min_day, max_day] overlap the range are searched.
+        """
+        if not len(self):
+            return 0, 0
+        first = 0 if start_day is None else int(np.searchsorted(self.max_day, start_day, side="left"))
+        last  = len(self) if end_day is None else int(np.searchsorted(self.min_day, end_day, side="right"))
+        if first >= last:
+            lo = int(self.starts[first]) if first < len(self) else len(self._days)
+            return lo, lo
+
+        lo, hi = int(self.starts[first]), int(self.stops[last - 1])
+        if start_day is not None:
+            lo += int(np.searchsorted(self._days[lo:self.stops[first]], start_day, side="left"))
+        if end_day is not None:
+            tail_start = int(self.starts[last - 1])
+            hi = tail_start + int(np.searchsorted(self._days[tail_start:hi], end_day, side="right"))
+        return lo, hi
+
+    def describe(self) -> List[dict]:
+        return [
+            {
+                "month"   : str(np.datetime64(int(self.min_day[i]), "D").astype("datetime64[M]")),
+                "rows"    : int(self.stops[i] - self.starts[i]),
+                "min_date": str(np.datetime64(int(self.min_day[i]), "D")),
+                "max_date": str(np.datetime64(int(self.max_day[i]), "D")),
+            }
+            for i in range(len(self))
+        ]
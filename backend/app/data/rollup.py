@@ -0,0 +1,231 @@
+# backend/app/data/rollup.py
+# ── Pre-aggregated rollup cube for filter combinations ───────────────────────
+#
+# Built once per dataset load. Every (platform, industry, country) combination,
+# including "All" for each dimension, maps to a (date, campaign) frame of
+# summed components sorted by date. Queries become a dict lookup plus a slice.
+#
+
+import itertools
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app.data.partitions import frame_days, to_day
+
+ALL = "All"
+
+SUM_COLS   = ["impressions", "clicks", "spend", "conversions", "revenue"]
+RATIO_COLS = ["roas", "ctr", "cpc", "cpa"]
+ROUND_COLS = ["spend", "revenue", "roas", "ctr", "cpc", "cpa"]
+
+# How ratio metrics are derived from summed components:
+#   weighted — ratio of sums (revenue/spend, clicks/impressions, ...)
+#   mean     — legacy unweighted mean of the per-row ratios
+RATIO_MODES = ("weighted", "mean")
+_WEIGHTED_RATIOS = {
+    "roas": ("revenue", "spend"),
+    "ctr" : ("clicks",  "impressions"),
+    "cpc" : ("spend",   "clicks"),
+    "cpa" : ("spend",   "conversions"),
+}
+
+# Per-row ratios are also carried as sums plus a row count so the
+# mean-of-ratios mode can be reproduced exactly from any rollup level.
+_COMPONENT_COLS = SUM_COLS + [f"{c}_sum" for c in RATIO_COLS] + ["rows"]
+_OUTPUT_COLS    = ["date", "campaign"] + SUM_COLS + RATIO_COLS
+_DIMS           = ["campaign", "industry", "country"]
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# COMPONENT HELPERS
+# ══════════════════════════════════════════════════════════════════════════════
+
+def _widen(values: pd.Series) -> pd.Series:
+    # Raw rows use narrow dtypes; sums must not overflow or lose precision
+    return values.astype(np.int64 if pd.api.types.is_integer_dtype(values) else np.float64)
+
+
+def sum_components(df: pd.DataFrame, by: list) -> pd.DataFrame:
+    """Groups raw rows by `by` and sums every additive component."""
+    parts = df[by].copy()
+    for col in SUM_COLS:
+        parts[col] = _widen(df[col])
+    for col in RATIO_COLS:
+        parts[f"{col}_sum"] = _widen(df[col])
+    parts["rows"] = 1
+    return parts.groupby(by, dropna=False, observed=True, sort=False)[_COMPONENT_COLS].sum().reset_index()
+
+
+def sum_components_from(components: pd.DataFrame, by: list) -> pd.DataFrame:
+    """Re-sums already-aggregated components at a coarser grouping."""
+    return components.groupby(by, dropna=False, observed=True, sort=False)[_COMPONENT_COLS].sum().reset_index()
+
+
+def finalize(components: pd.DataFrame, ratio_mode: str = "weighted") -> pd.DataFrame:
+    """
+    Turns summed components into the public (date, campaign) metric rows.
+    Ratios are derived in one vectorized pass; rounding happens only here.
+    """
+    if ratio_mode not in RATIO_MODES:
+        raise ValueError(f"Unknown ratio_mode: {ratio_mode!r} (expected one of {RATIO_MODES})")
+    if components.empty:
+        return pd.DataFrame(columns=_OUTPUT_COLS)
+
+    if ratio_mode == "weighted":
+        num = components[[n for n, _ in _WEIGHTED_RATIOS.values()]].to_numpy(dtype=np.float64)
+        den = components[[d for _, d in _WEIGHTED_RATIOS.values()]].to_numpy(dtype=np.float64)
+    else:
+        num = components[[f"{c}_sum" for c in RATIO_COLS]].to_numpy(dtype=np.float64)
+        den = components[["rows"]].to_numpy(dtype=np.float64)
+    ratios = np.divide(num, den, out=np.zeros(num.shape), where=den != 0)
+
+    out = components[["date", "campaign"] + SUM_COLS].copy()
+    out[RATIO_COLS] = ratios
+    out[ROUND_COLS] = out[ROUND_COLS].round(2)
+    return out.reset_index(drop=True)
+
+
+def _key(platform: Optional[str], industry: Optional[str], country: Optional[str]) -> Tuple[str, str, str]:
+    return (platform or ALL, industry or ALL, country or ALL)
+
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# ROLLUP CUBE
+# ══════════════════════════════════════════════════════════════════════════════
+
+class _Slice:
+    """One cube cell: components sorted by (day, campaign) plus the latest row per campaign."""
+
+    __slots__ = ("components", "days", "latest")
+
+    def __init__(self, components: pd.DataFrame):
+        components = components.astype({"campaign": object})
+        days  = frame_days(components["date"])
+        order = np.lexsort((components["campaign"].to_numpy(), days))
+        self._set(components.iloc[order].reset_index(drop=True), days[order])
+
+    def _set(self, components: pd.DataFrame, days: np.ndarray) -> None:
+        self.components = components
+        self.days       = days
+        self.latest     = components.drop_duplicates("campaign", keep="last")
+
+    def merged(self, delta: pd.DataFrame) -> "_Slice":
+        """
+        Adds delta components. Only rows dated on or after the delta's first
+        day are re-summed and re-sorted; the older head is reused as-is.
+        """
+        start  = int(np.searchsorted(self.days, frame_days(delta["date"]).min(), side="left"))
+        merged = pd.concat([self.components.iloc[start:], delta.astype({"campaign": object})], ignore_index=True)
+        tail   = _Slice(sum_components_from(merged, ["date", "campaign"]))
+
+        out = _Slice.__new__(_Slice)
+        out._set(
+            pd.concat([self.components.iloc[:start], tail.components], ignore_index=True),
+            np.concatenate([self.days[:start], tail.days]),
+        )
+        return out
+
+
+def _cube_cells(components: pd.DataFrame):
+    """
+    Yields ((platform, industry, country), cell) for every cube key the
+    given (campaign, industry, country, date) components contribute to.
+    Industry and/or country collapse to "All"; campaign always stays in
+    the output grouping, so platform filters are a split, not a sum.
+    """
+    for keep_industry, keep_country in itertools.product([True, False], repeat=2):
+        kept  = [d for d, keep in (("industry", keep_industry), ("country", keep_country)) if keep]
+        level = components if len(kept) == 2 else sum_components_from(components, kept + ["date", "campaign"])
+
+        groups = level.groupby(kept, dropna=False, observed=True, sort=False) if kept else [((), level)]
+        for values, cell in groups:
+            values   = values if isinstance(values, tuple) else (values,)
+            dims     = dict(zip(kept, values))
+            industry = dims.get("industry", ALL)
+            country  = dims.get("country", ALL)
+            cell     = cell[["date", "campaign"] + _COMPONENT_COLS]
+
+            yield (ALL, industry, country), cell
+            for platform, platform_cell in cell.groupby("campaign", observed=True, sort=False):
+                yield (platform, industry, country), platform_cell
+
+
+class RollupCube:
+    """
+    Pre-aggregated sums for every platform/industry/country combination.
+    Each lookup costs O(result) — no scan over the raw rows.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self._cells: Dict[Tuple[str, str, str], _Slice] = {}
+        if df.empty:
+            return
+        for key, cell in _cube_cells(sum_components(df, _DIMS + ["date"])):
+            self._cells[key] = _Slice(cell)
+
+    def copy(self) -> "RollupCube":
+        """Shallow copy — cells are immutable, so an update can swap them safely."""
+        out = RollupCube.__new__(RollupCube)
+        out._cells = dict(self._cells)
+        return out
+
+    def apply(self, rows: pd.DataFrame) -> int:
+        """
+        Folds newly ingested raw rows into the cube. Only the cells those
+        rows contribute to are touched. Returns the number of cells updated.
+        """
+        if rows.empty:
+            return 0
+        touched = 0
+        for key, delta in _cube_cells(sum_components(rows, _DIMS + ["date"])):
+            cell = self._cells.get(key)
+            self._cells[key] = _Slice(delta) if cell is None else cell.merged(delta)
+            touched += 1
+        return touched
+
+    def query(
+        self,
+        platform  : Optional[str] = None,
+        industry  : Optional[str] = None,
+        country   : Optional[str] = None,
+        days      : Optional[int] = None,
+        ratio_mode: str = "weighted",
+        start     = None,
+        end       = None,
+    ) -> pd.DataFrame:
+        """
+        Aggregated (date, campaign) rows for the filter combination.
+        `days` keeps the last N days relative to that slice's own max date;
+        `start`/`end` (inclusive, date-like) select an explicit range instead.
+        """
+        cell = self._cells.get(_key(platform, industry, country))
+        if cell is None:
+            return finalize(pd.DataFrame(), ratio_mode)
+        lo, hi = 0, len(cell.days)
+        if start is not None or end is not None:
+            if start is not None:
+                lo = int(np.searchsorted(cell.days, to_day(start), side="left"))
+            if end is not None:
+                hi = int(np.searchsorted(cell.days, to_day(end), side="right"))
+        elif days is not None:
+            lo = int(np.searchsorted(cell.days, cell.days[-1] - days, side="left"))
+        return finalize(cell.components.iloc[lo:hi], ratio_mode)
+
+    def latest(
+        self,
+        platform  : Optional[str] = None,
+        industry  : Optional[str] = None,
+        country   : Optional[str] = None,
+        ratio_mode: str = "weighted",
+    ) -> pd.DataFrame:
+        """Most recent aggregated row per platform for the filter combination."""
+        cell = self._cells.get(_key(platform, industry, country))
+        if cell is None:
+            return finalize(pd.DataFrame(), ratio_mode)
+        return finalize(cell.latest, ratio_mode)
+
+    def __len__(self) -> int:
+        return len(self._cells)
@@ -1,6 +1,7 @@
 # backend/app/main.py
 # ── Entry point for the FastAPI application ──────────────────────────────────
 # Run with: uvicorn app.main:app --reload  (from inside /backend folder)
+# Production (one worker per core): gunicorn -c gunicorn.conf.py app.main:app
 # Docs at:  http://localhost:8000/docs
 
 from fastapi import FastAPI
@@ -8,6 +9,10 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.routes  import router as main_router
 from app.api.webhook import router as webhook_router
+from app.services.airtable_service import AIRTABLE_API_KEY, airtable_sink
+from app.services.executor import loop_monitor, sync_executor
+from app.services.job_queue import job_queue
+from app.services.shared_state import register_process
 
 # ── App instance ─────────────────────────────────────────────────────────────
 app = FastAPI(
@@ -30,6 +35,25 @@ app.add_middleware(
 app.include_router(main_router,    prefix="/api")
 app.include_router(webhook_router, prefix="/api")
 
+# ── Background workers — jobs and the Airtable outbox resume where they left off
+# (under gunicorn this runs once per worker process)
+@app.on_event("startup")
+async def start_background_workers():
+    register_process()
+    loop_monitor.start()
+    job_queue.start()
+    if AIRTABLE_API_KEY:
+        airtable_sink.start()
+
+
+@app.on_event("shutdown")
+async def stop_background_workers():
+    await job_queue.stop()
+    await airtable_sink.stop()
+    await loop_monitor.stop()
+    sync_executor.shutdown()
+
+
 # ── Health check ─────────────────────────────────────────────────────────────
 @app.get("/", tags=["Health"])
 async def root():
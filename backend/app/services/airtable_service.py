@@ -7,30 +7,69 @@
 # Airtable acts as a cloud audit log — persistent, queryable,
 # and shareable with clients directly.
 #
+# Writes never block the agent: log_alert_to_airtable only appends the
+# record to a durable local outbox (SQLite). A background flusher drains it
+# through one pooled HTTP client in batches of up to 10 records (Airtable's
+# per-request maximum), spaced under the 5 requests/second API limit.
+# Failed batches are retried with exponential backoff; anything still in
+# the outbox at shutdown is replayed on the next start. With several server
+# workers every one runs a flusher, but each drain round takes the
+# "airtable-outbox" file lock, so a row is only ever sent by one of them.
+#
+# Tunables (.env):
+#   AIRTABLE_API_URL        default: https://api.airtable.com/v0 (point at a mock)
+#   AIRTABLE_OUTBOX_PATH    default: data/airtable_outbox.sqlite3
+#   AIRTABLE_RATE_PER_SEC   default: 4
+#   AIRTABLE_MAX_ATTEMPTS   default: 8 — then the record is parked as "dead"
+#   AIRTABLE_SYNC_MAX_AGE   default: 300 — staleness bound for mirror reads
+#   AIRTABLE_SYNC_WAIT      default: 30 — max wait for another worker's sync
+#
+# Reads go the other way through AirtableSync: the table is mirrored into
+# the local alert store incrementally and served from there.
+#
 
+import asyncio
+import json
 import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, List, Optional
+
 import httpx
-from datetime import datetime
+from datetime import datetime, timezone
 from dotenv import load_dotenv
 
+from app.agents.rate_limiter import AsyncRateLimiter
+from app.services.alert_store import AlertStore, alert_store
+from app.services.executor import run_sync
+from app.services.shared_state import try_lock
+
 load_dotenv(os.path.join(os.path.dirname(__file__), "..","..", ".env"))
 
 AIRTABLE_API_KEY = os.getenv("AIRTABLE_API_KEY")
 AIRTABLE_BASE_ID = os.getenv("AIRTABLE_BASE_ID")
+AIRTABLE_API_URL = os.getenv("AIRTABLE_API_URL", "https://api.airtable.com/v0").rstrip("/")
 TABLE_NAME       = "Insights"
 
+_ROOT         = os.path.normpath(os.path.join(os.path.dirname(__file__), "..", "..", "..", "data"))
+_OUTBOX_PATH  = os.getenv("AIRTABLE_OUTBOX_PATH", os.path.join(_ROOT, "airtable_outbox.sqlite3"))
+_RATE_PER_SEC = float(os.getenv("AIRTABLE_RATE_PER_SEC", "4"))
+_MAX_ATTEMPTS = int(os.getenv("AIRTABLE_MAX_ATTEMPTS", "8"))
 
-async def log_alert_to_airtable(alert: dict) -> bool:
-    """
-    Write a single alert record to Airtable.
+BATCH_SIZE    = 10      # Airtable accepts at most 10 records per create request
+_BACKOFF_BASE = 1.0     # seconds; doubles per failed attempt
+_BACKOFF_MAX  = 300.0
 
-    Args:
-        alert: dict with keys — campaign, issue, severity, recommendation
+_SYNC_MAX_AGE = float(os.getenv("AIRTABLE_SYNC_MAX_AGE", "300"))   # seconds a mirror read may lag
+_SYNC_WAIT    = float(os.getenv("AIRTABLE_SYNC_WAIT", "30"))       # seconds to wait on a peer's sync
+_SYNC_SKEW    = 60.0    # seconds of overlap between incremental pulls
+_PAGE_SIZE    = 100     # Airtable's maximum page size for list requests
+_PEER_POLL    = 1.0     # seconds between retries while another worker holds a lock
 
-    Returns:
-        True if successful, False if failed (non-blocking — never crashes the agent)
-    """
 
+def _credentials_ok() -> bool:
     # ── Guard: skip if credentials not configured ─────────────────────────────
     if not AIRTABLE_API_KEY or not AIRTABLE_BASE_ID:
         print("[Airtable] ⚠️  Skipping — AIRTABLE_API_KEY or AIRTABLE_BASE_ID not set in .env")
@@ -39,73 +78,408 @@ async def log_alert_to_airtable(alert: dict) -> bool:
     if AIRTABLE_API_KEY == "your-key" or AIRTABLE_BASE_ID == "your-base-id":
         print("[Airtable] ⚠️  Skipping — placeholder credentials detected. Update your .env file.")
         return False
+    return True
+
+
+def _table_url() -> str:
+    return f"{AIRTABLE_API_URL}/{AIRTABLE_BASE_ID}/{TABLE_NAME}"
+
 
-    url     = f"https://api.airtable.com/v0/{AIRTABLE_BASE_ID}/{TABLE_NAME}"
-    headers = {
+def _headers() -> dict:
+    return {
         "Authorization" : f"Bearer {AIRTABLE_API_KEY}",
         "Content-Type"  : "application/json",
     }
 
-    payload = {
-        "records": [
-            {
-                "fields": {
-                    "Date"          : datetime.now().strftime("%Y-%m-%d"),
-                    "Campaign"      : alert.get("campaign", "Unknown"),
-                    "Issue"         : alert.get("issue", ""),
-                    "Severity"      : alert.get("severity", "low"),
-                    "Recommendation": alert.get("recommendation", ""),
-                    "Status"        : "new",
-                }
-            }
-        ]
-    }
 
-    try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.post(url, json=payload, headers=headers)
+# ══════════════════════════════════════════════════════════════════════════════
+# OUTBOX + BACKGROUND FLUSHER
+# ══════════════════════════════════════════════════════════════════════════════
+
+class AirtableSink:
+    """Durable outbox drained by a background task through a pooled client."""
+
+    def __init__(self, path: str = _OUTBOX_PATH, rate: float = _RATE_PER_SEC, max_attempts: int = _MAX_ATTEMPTS):
+        self._path         = path
+        self._rate         = rate
+        self._max_attempts = max_attempts
+        self._lock         = threading.Lock()
+        self._ready        = False
+        self._client       : Optional[httpx.AsyncClient] = None
+        self._limiter      : Optional[AsyncRateLimiter] = None
+        self._wake         : Optional[asyncio.Event] = None
+        self._task         : Optional[asyncio.Task] = None
+        self.sent          = 0
+        self.failed_posts  = 0
+
+    # ── storage ──────────────────────────────────────────────────────────────
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        with self._lock:
+            if not self._ready:
+                os.makedirs(os.path.dirname(self._path), exist_ok=True)
+            conn = sqlite3.connect(self._path, timeout=5.0)
+            try:
+                if not self._ready:
+                    self._init_schema(conn)
+                with conn:
+                    yield conn
+            finally:
+                conn.close()
+
+    def _init_schema(self, conn: sqlite3.Connection) -> None:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS outbox ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " fields TEXT NOT NULL,"
+            " status TEXT NOT NULL DEFAULT 'pending',"
+            " attempts INTEGER NOT NULL DEFAULT 0,"
+            " next_attempt_at REAL NOT NULL,"
+            " last_error TEXT)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS outbox_due ON outbox (status, next_attempt_at)")
+        self._ready = True
+
+    def _insert(self, fields: dict) -> int:
+        with self._connect() as conn:
+            cur = conn.execute(
+                "INSERT INTO outbox (fields, next_attempt_at) VALUES (?, ?)",
+                (json.dumps(fields), time.time()),
+            )
+        return cur.lastrowid
+
+    async def enqueue(self, fields: dict) -> int:
+        # SQLite on the worker pool; the wake-up stays on the loop (asyncio.Event is not thread-safe)
+        row_id = await run_sync(self._insert, fields)
+        if self._wake is not None:
+            self._wake.set()
+        return row_id
+
+    def _due(self, limit: int = BATCH_SIZE) -> List[tuple]:
+        with self._connect() as conn:
+            return conn.execute(
+                "SELECT id, fields, attempts FROM outbox"
+                " WHERE status = 'pending' AND next_attempt_at <= ?"
+                " ORDER BY id LIMIT ?",
+                (time.time(), limit),
+            ).fetchall()
+
+    def _next_due_in(self) -> Optional[float]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT MIN(next_attempt_at) FROM outbox WHERE status = 'pending'").fetchone()
+        return None if row[0] is None else max(row[0] - time.time(), 0.0)
+
+    def _delete(self, ids: List[int]) -> None:
+        with self._connect() as conn:
+            conn.executemany("DELETE FROM outbox WHERE id = ?", [(i,) for i in ids])
+
+    def _reschedule(self, rows: List[tuple], error: str, permanent: bool = False, not_before: float = 0.0) -> None:
+        with self._connect() as conn:
+            for row_id, _, attempts in rows:
+                attempts += 1
+                dead  = permanent or attempts >= self._max_attempts
+                delay = min(_BACKOFF_BASE * 2 ** (attempts - 1), _BACKOFF_MAX)
+                conn.execute(
+                    "UPDATE outbox SET attempts = ?, next_attempt_at = ?, last_error = ?, status = ? WHERE id = ?",
+                    (attempts, max(time.time() + delay, not_before), error[:500], "dead" if dead else "pending", row_id),
+                )
+
+    def _defer_all(self, until: float) -> None:
+        """Pushes every pending row to `until` at the earliest — a rate-limit pause every worker sees."""
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE outbox SET next_attempt_at = MAX(next_attempt_at, ?) WHERE status = 'pending'",
+                (until,),
+            )
+
+    # ── sending ──────────────────────────────────────────────────────────────
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        # One long-lived client: keep-alive connections, no TLS handshake per write
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout = 10.0,
+                limits  = httpx.Limits(max_connections=4, max_keepalive_connections=4),
+            )
+        return self._client
+
+    @property
+    def limiter(self) -> AsyncRateLimiter:
+        # Outbox sends and mirror pulls share it — both count against the 5 req/s limit
+        if self._limiter is None:
+            self._limiter = AsyncRateLimiter(rate=self._rate, max_concurrency=1)
+        return self._limiter
+
+    async def _send(self, rows: List[tuple]) -> None:
+        payload = {"records": [{"fields": json.loads(fields)} for _, fields, _ in rows]}
+        try:
+            async with self.limiter:
+                response = await self.client.post(_table_url(), json=payload, headers=_headers())
+        except httpx.HTTPError as e:
+            self.failed_posts += 1
+            await run_sync(self._reschedule, rows, f"{type(e).__name__}: {e}")
+            print(f"[Airtable] ⚠️  Batch of {len(rows)} failed ({type(e).__name__}) — will retry")
+            return
 
         if response.status_code == 200:
-            record_id = response.json()["records"][0]["id"]
-            print(f"[Airtable] ✅ Alert logged — Record ID: {record_id} | Campaign: {alert.get('campaign')}")
-            return True
+            await run_sync(self._delete, [row_id for row_id, _, _ in rows])
+            self.sent += len(rows)
+            ids = [r["id"] for r in response.json().get("records", [])]
+            print(f"[Airtable] ✅ Logged {len(rows)} alert(s) — Record IDs: {', '.join(ids)}")
+            return
+
+        self.failed_posts += 1
+        # 429 and 5xx are transient; other 4xx mean the records themselves are bad
+        transient = response.status_code == 429 or response.status_code >= 500
+        error     = f"HTTP {response.status_code}: {response.text[:200]}"
+        if response.status_code == 429:
+            # Airtable asks for a 30s pause after hitting the rate limit. The
+            # pause is written to the outbox rather than slept here, so the
+            # outbox lock is released and no flush waits on it.
+            resume_at = time.time() + _retry_after(response)
+            await run_sync(self._reschedule, rows, error, not_before=resume_at)
+            await run_sync(self._defer_all, resume_at)
         else:
-            print(f"[Airtable] ❌ Failed — Status {response.status_code}: {response.text}")
-            return False
+            await run_sync(self._reschedule, rows, error, permanent=not transient)
+        print(f"[Airtable] ❌ Batch failed — Status {response.status_code}" + ("; will retry" if transient else ""))
 
-    except httpx.TimeoutException:
-        print("[Airtable] ⚠️  Request timed out — Airtable may be slow. Alert saved locally.")
-        return False
-    except Exception as e:
-        print(f"[Airtable] ❌ Unexpected error: {e}")
+    async def _drain_once(self) -> Optional[int]:
+        """
+        Sends one due batch if no other worker is mid-send. Returns the rows
+        sent, 0 if nothing was due, None if another worker holds the outbox.
+        """
+        with try_lock("airtable-outbox") as acquired:
+            if not acquired:
+                return None
+            rows = await run_sync(self._due)
+            if rows:
+                await self._send(rows)
+            return len(rows)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                drained = await self._drain_once()
+                if drained:
+                    continue
+            except Exception as e:
+                # Keep the flusher alive — the rows stay in the outbox
+                print(f"[Airtable] ❌ Flusher error: {e}")
+                await asyncio.sleep(5.0)
+                continue
+            self._wake.clear()
+            timeout = _PEER_POLL if drained is None else await run_sync(self._next_due_in) or 60.0
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self) -> None:
+        """Starts the flusher on the running loop; pending outbox rows are replayed."""
+        if self._task is not None and not self._task.done():
+            return
+        self._limiter = AsyncRateLimiter(rate=self._rate, max_concurrency=1)
+        self._wake    = asyncio.Event()
+        self._task    = asyncio.create_task(self._run())
+
+    async def flush(self, timeout: float = 30.0) -> int:
+        """Sends everything currently due, inline. Returns rows still pending."""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            drained = await self._drain_once()
+            if drained == 0:
+                break
+            if drained is None:
+                await asyncio.sleep(_PEER_POLL / 10)
+        return (await run_sync(self.stats))["pending"]
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        self._limiter = None
+
+    def stats(self) -> dict:
+        with self._connect() as conn:
+            counts = dict(conn.execute("SELECT status, COUNT(*) FROM outbox GROUP BY status").fetchall())
+        return {
+            "pending"     : counts.get("pending", 0),
+            "dead"        : counts.get("dead", 0),
+            "sent"        : self.sent,
+            "failed_posts": self.failed_posts,
+            "running"     : self._task is not None and not self._task.done(),
+        }
+
+
+def _retry_after(response: httpx.Response) -> float:
+    try:
+        return max(float(response.headers.get("Retry-After", 30)), 0.0)
+    except ValueError:
+        return 30.0
+
+
+airtable_sink = AirtableSink()
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# PUBLIC API
+# ══════════════════════════════════════════════════════════════════════════════
+
+async def log_alert_to_airtable(alert: dict) -> bool:
+    """
+    Queue a single alert record for Airtable.
+
+    Args:
+        alert: dict with keys — campaign, issue, severity, recommendation
+
+    Returns:
+        True if queued, False if skipped (non-blocking — never crashes the agent)
+    """
+    if not _credentials_ok():
         return False
 
+    airtable_sink.start()
+    await airtable_sink.enqueue({
+        "Date"          : datetime.now().strftime("%Y-%m-%d"),
+        "Campaign"      : alert.get("campaign", "Unknown"),
+        "Issue"         : alert.get("issue", ""),
+        "Severity"      : alert.get("severity", "low"),
+        "Recommendation": alert.get("recommendation", ""),
+        "Status"        : "new",
+    })
+    return True
+
 
-async def get_recent_alerts_from_airtable(limit: int = 10) -> list:
+async def get_recent_alerts_from_airtable(limit: int = 10, max_age: Optional[float] = None) -> list:
     """
-    Fetch the most recent alert records from Airtable.
-    Optional — useful for syncing the frontend with cloud records.
+    Most recent alert records from the Airtable table, served from the local
+    mirror. The mirror is synced first if older than `max_age` seconds
+    (default AIRTABLE_SYNC_MAX_AGE), so page loads rarely touch the API.
     """
     if not AIRTABLE_API_KEY or not AIRTABLE_BASE_ID:
         return []
+    await airtable_sync.ensure_fresh(max_age)
+    return await run_sync(alert_store.query_remote, limit)
 
-    url     = f"https://api.airtable.com/v0/{AIRTABLE_BASE_ID}/{TABLE_NAME}"
-    headers = {"Authorization": f"Bearer {AIRTABLE_API_KEY}"}
-    params  = {
-        "maxRecords"  : limit,
-        "sort[0][field]"    : "Date",
-        "sort[0][direction]": "desc",
-    }
 
-    try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(url, headers=headers, params=params)
+# ══════════════════════════════════════════════════════════════════════════════
+# CLOUD → LOCAL MIRROR
+# ══════════════════════════════════════════════════════════════════════════════
+
+class AirtableSync:
+    """
+    Incremental pull of the Insights table into the alert store's mirror.
+    Each sync asks only for records modified since the last watermark
+    (LAST_MODIFIED_TIME() filter) and follows Airtable's `offset` paging;
+    upserts by record id make overlapping pulls harmless. A full sync also
+    drops mirrored records deleted remotely.
+    """
+
+    def __init__(self, store: AlertStore = alert_store, max_age: float = _SYNC_MAX_AGE):
+        self._store   = store
+        self._max_age = max_age
+        self._lock    : Optional[asyncio.Lock] = None
+
+    def synced_at(self) -> Optional[float]:
+        value = self._store.get_sync_state("airtable_synced_at")
+        return float(value) if value else None
+
+    def age(self) -> Optional[float]:
+        synced = self.synced_at()
+        return None if synced is None else time.time() - synced
+
+    async def _pull(self, since: Optional[str]) -> List[dict]:
+        params  = {"pageSize": _PAGE_SIZE}
+        if since:
+            params["filterByFormula"] = f"IS_AFTER(LAST_MODIFIED_TIME(), DATETIME_PARSE('{since}'))"
+        headers = {"Authorization": f"Bearer {AIRTABLE_API_KEY}"}
+        records = []
+        while True:
+            async with airtable_sink.limiter:
+                response = await airtable_sink.client.get(_table_url(), headers=headers, params=params)
+            response.raise_for_status()
+            body = response.json()
+            records.extend(body.get("records", []))
+            if not body.get("offset"):
+                return records
+            params["offset"] = body["offset"]
+
+    async def sync(self, full: bool = False, timeout: float = _SYNC_WAIT) -> dict:
+        """
+        Pulls changes now. Concurrent callers share one in-flight sync — in
+        this process through the asyncio lock, across workers through the
+        "airtable-sync" file lock (a caller that finds another worker
+        syncing waits for it and returns without pulling again). If that
+        worker is still syncing after `timeout` seconds the result is
+        marked "busy" instead.
+        """
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            with try_lock("airtable-sync") as acquired:
+                if acquired:
+                    return await self._sync_locked(full)
+            waited   = time.time()
+            deadline = time.monotonic() + timeout
+            busy     = True
+            while time.monotonic() < deadline:
+                await asyncio.sleep(_PEER_POLL / 10)
+                with try_lock("airtable-sync") as acquired:
+                    if acquired:
+                        busy = False
+                        break
+            return {
+                "fetched"    : 0,
+                "pruned"     : 0,
+                "full"       : full,
+                "peer"       : True,   # another worker synced (or is still syncing) the shared mirror
+                "busy"       : busy,
+                "duration_ms": round((time.time() - waited) * 1000, 1),
+            }
+
+    async def _sync_locked(self, full: bool) -> dict:
+        started   = time.time()
+        watermark = None if full else await run_sync(self._store.get_sync_state, "airtable_watermark")
+        records   = await self._pull(watermark)
+        await run_sync(self._store.upsert_remote, records)
+        pruned = await run_sync(self._store.prune_remote, {r["id"] for r in records}) if full else 0
+        # Overlap the next window a little to absorb clock skew with Airtable
+        await run_sync(
+            self._store.set_sync_state,
+            airtable_watermark = datetime.fromtimestamp(started - _SYNC_SKEW, timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.000Z"),
+            airtable_synced_at = repr(started),
+        )
+        result = {
+            "fetched"    : len(records),
+            "pruned"     : pruned,
+            "full"       : full or watermark is None,
+            "duration_ms": round((time.time() - started) * 1000, 1),
+        }
+        print(f"[Airtable] 🔄 Synced {result['fetched']} record(s) into the local mirror")
+        return result
+
+    async def ensure_fresh(self, max_age: Optional[float] = None) -> Optional[dict]:
+        """Syncs if the mirror is older than max_age. Errors leave stale data served."""
+        max_age = self._max_age if max_age is None else max_age
+        age     = await run_sync(self.age)
+        if age is not None and age <= max_age:
+            return None
+        if self._lock is not None and self._lock.locked():
+            # Another request is already syncing — wait for it instead of re-pulling
+            async with self._lock:
+                return None
+        try:
+            return await self.sync()
+        except Exception as e:
+            print(f"[Airtable] ⚠️  Sync failed, serving the local mirror: {e}")
+            return {"error": str(e)}
 
-        if response.status_code == 200:
-            records = response.json().get("records", [])
-            return [r["fields"] for r in records]
-        return []
 
-    except Exception as e:
-        print(f"[Airtable] ❌ Fetch failed: {e}")
-        return []
\ No newline at end of file
+airtable_sync = AirtableSync()
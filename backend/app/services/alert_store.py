@@ -0,0 +1,308 @@
+# backend/app/services/alert_store.py
+# ── Alert storage — SQLite in WAL mode ───────────────────────────────────────
+#
+# Replaces the read-modify-write of data/alerts.json. Each alert is one
+# INSERT, so adding an alert no longer rewrites every alert before it, and
+# WAL lets readers run alongside writers from other worker processes
+# (SQLite serializes the writers; busy writers wait up to 5s).
+#
+# An existing alerts.json is imported once on first use and renamed to
+# alerts.json.migrated. Every ALERT_COMPACT_EVERY inserts (default 500) the
+# store compacts itself: alerts older than ALERT_RETENTION_DAYS are dropped
+# (0 = keep everything, the default), the WAL is checkpointed and
+# truncated, and freed pages are returned to the OS.
+#
+# Tunables (.env):
+#   ALERT_DB_PATH         default: data/alerts.sqlite3
+#   ALERT_RETENTION_DAYS  default: 0
+#   ALERT_COMPACT_EVERY   default: 500
+#
+
+import base64
+import json
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional
+
+from app.services.shared_state import file_lock
+
+_ROOT           = os.path.normpath(os.path.join(os.path.dirname(__file__), "..", "..", "..", "data"))
+_DB_PATH        = os.getenv("ALERT_DB_PATH", os.path.join(_ROOT, "alerts.sqlite3"))
+_LEGACY_PATH    = os.path.join(_ROOT, "alerts.json")
+_RETENTION_DAYS = float(os.getenv("ALERT_RETENTION_DAYS", "0"))
+_COMPACT_EVERY  = int(os.getenv("ALERT_COMPACT_EVERY", "500"))
+
+FIELDS   = ["campaign", "issue", "severity", "recommendation", "timestamp", "status"]
+STATUSES = ["new", "acknowledged", "resolved", "dismissed"]
+
+# Newest-first listing and every filter walk an index instead of the table
+_INDEXES = {
+    "alerts_timestamp": "(timestamp DESC, id DESC)",
+    "alerts_campaign" : "(campaign, timestamp DESC, id DESC)",
+    "alerts_severity" : "(severity, timestamp DESC, id DESC)",
+    "alerts_status"   : "(status, timestamp DESC, id DESC)",
+}
+
+
+class AlertStore:
+    """Append-mostly alert table shared by the agent tools and the API."""
+
+    def __init__(self, path: str = _DB_PATH, legacy_path: Optional[str] = _LEGACY_PATH):
+        self._path        = path
+        self._legacy_path = legacy_path
+        self._lock        = threading.Lock()
+        self._ready       = False
+        self._inserts     = 0
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Lock-guarded connection that commits on success and always closes."""
+        with self._lock:
+            if not self._ready:
+                os.makedirs(os.path.dirname(self._path), exist_ok=True)
+            conn = sqlite3.connect(self._path, timeout=5.0)
+            try:
+                if not self._ready:
+                    self._init_schema(conn)
+                with conn:
+                    yield conn
+            finally:
+                conn.close()
+
+    def _init_schema(self, conn: sqlite3.Connection) -> None:
+        # auto_vacuum only sticks on a file with no tables yet, or through a
+        # VACUUM — so it is set before WAL creates the file, and files made
+        # without it are rebuilt once (one worker; the rest see mode 2)
+        conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+            with file_lock("alerts-vacuum"):
+                if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+                    conn.execute("VACUUM")
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS alerts ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " campaign TEXT NOT NULL,"
+            " issue TEXT NOT NULL,"
+            " severity TEXT NOT NULL,"
+            " recommendation TEXT NOT NULL,"
+            " timestamp TEXT NOT NULL,"
+            " status TEXT NOT NULL DEFAULT 'new')"
+        )
+        for name, columns in _INDEXES.items():
+            conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON alerts {columns}")
+        # Read-only mirror of the Airtable "Insights" table (see airtable_service)
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS airtable_records ("
+            " record_id TEXT PRIMARY KEY,"
+            " date TEXT,"
+            " created_time TEXT NOT NULL,"
+            " fields TEXT NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS airtable_records_recent ON airtable_records (date DESC, created_time DESC)")
+        conn.execute("CREATE TABLE IF NOT EXISTS sync_state (key TEXT PRIMARY KEY, value TEXT)")
+        # One worker imports alerts.json; the rest find it already renamed
+        with file_lock("alerts-migrate"):
+            with conn:
+                migrated = self._migrate_legacy(conn)
+            # Only once the inserts are committed — a failed import keeps alerts.json
+            if migrated is not None:
+                os.replace(self._legacy_path, self._legacy_path + ".migrated")
+                print(f"[Alerts] Migrated {migrated} alerts from {self._legacy_path}")
+        self._ready = True
+
+    def _migrate_legacy(self, conn: sqlite3.Connection) -> Optional[int]:
+        """Inserts the alerts.json rows (uncommitted). Returns how many, or None if there is no file."""
+        if not self._legacy_path or not os.path.exists(self._legacy_path):
+            return None
+        try:
+            with open(self._legacy_path, "r") as f:
+                legacy = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            legacy = []
+        conn.executemany(
+            f"INSERT INTO alerts ({', '.join(FIELDS)}) VALUES ({', '.join('?' * len(FIELDS))})",
+            [_row(alert) for alert in legacy if isinstance(alert, dict)],
+        )
+        return len(legacy)
+
+    # ── API ──────────────────────────────────────────────────────────────────
+
+    def add(self, alert: dict) -> dict:
+        """Inserts one alert; returns it with its `id`."""
+        with self._connect() as conn:
+            cur = conn.execute(
+                f"INSERT INTO alerts ({', '.join(FIELDS)}) VALUES ({', '.join('?' * len(FIELDS))})",
+                _row(alert),
+            )
+            stored = {"id": cur.lastrowid, **{k: v for k, v in zip(FIELDS, _row(alert))}}
+        self._inserts += 1
+        if _COMPACT_EVERY and self._inserts % _COMPACT_EVERY == 0:
+            self.compact()
+        return stored
+
+    def query(
+        self,
+        campaign: Optional[List[str]] = None,
+        severity: Optional[List[str]] = None,
+        status  : Optional[List[str]] = None,
+        since   : Optional[str] = None,
+        until   : Optional[str] = None,
+        limit   : int = 100,
+        cursor  : Optional[str] = None,
+    ) -> tuple:
+        """
+        One page of alerts, newest first. Returns (alerts, next_cursor);
+        next_cursor is None on the last page. since/until are inclusive
+        ISO timestamps. Keyset pagination on (timestamp, id) keeps every
+        page an index range scan, however deep the cursor.
+        """
+        where, params = _filters(campaign, severity, status, since, until)
+        if cursor:
+            ts, row_id = decode_cursor(cursor)
+            where.append("(timestamp < ? OR (timestamp = ? AND id < ?))")
+            params += [ts, ts, row_id]
+
+        sql = f"SELECT id, {', '.join(FIELDS)} FROM alerts"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY timestamp DESC, id DESC LIMIT ?"
+        with self._connect() as conn:
+            rows = conn.execute(sql, params + [limit + 1]).fetchall()
+
+        alerts = [dict(zip(["id"] + FIELDS, row)) for row in rows[:limit]]
+        more   = len(rows) > limit
+        return alerts, encode_cursor(alerts[-1]) if more and alerts else None
+
+    def severity_counts(
+        self,
+        campaign: Optional[List[str]] = None,
+        status  : Optional[List[str]] = None,
+        since   : Optional[str] = None,
+        until   : Optional[str] = None,
+    ) -> Dict[str, int]:
+        """Alerts per severity under the same filters as query (severity itself excluded)."""
+        where, params = _filters(campaign, None, status, since, until)
+        sql = "SELECT severity, COUNT(*) FROM alerts"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        with self._connect() as conn:
+            return dict(conn.execute(sql + " GROUP BY severity", params).fetchall())
+
+    def get(self, alert_id: int) -> Optional[dict]:
+        with self._connect() as conn:
+            row = conn.execute(f"SELECT id, {', '.join(FIELDS)} FROM alerts WHERE id = ?", (alert_id,)).fetchone()
+        return dict(zip(["id"] + FIELDS, row)) if row else None
+
+    def update_status(self, alert_id: int, status: str) -> Optional[dict]:
+        """Sets one alert's status in place. Returns the alert, or None if missing."""
+        with self._connect() as conn:
+            updated = conn.execute("UPDATE alerts SET status = ? WHERE id = ?", (status, alert_id)).rowcount
+        return self.get(alert_id) if updated else None
+
+    def count(self) -> int:
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM alerts").fetchone()[0]
+
+    def clear(self) -> None:
+        with self._connect() as conn:
+            conn.execute("DELETE FROM alerts")
+        self.compact()
+
+    # ── Airtable mirror ──────────────────────────────────────────────────────
+
+    def upsert_remote(self, records: List[dict]) -> int:
+        """Inserts or replaces Airtable records ({id, createdTime, fields})."""
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO airtable_records (record_id, date, created_time, fields) VALUES (?, ?, ?, ?)",
+                [(r["id"], r["fields"].get("Date"), r.get("createdTime", ""), json.dumps(r["fields"])) for r in records],
+            )
+        return len(records)
+
+    def prune_remote(self, keep_ids: set) -> int:
+        """Drops mirrored records that no longer exist remotely (full syncs only)."""
+        with self._connect() as conn:
+            stored = [r[0] for r in conn.execute("SELECT record_id FROM airtable_records")]
+            gone   = [(r,) for r in stored if r not in keep_ids]
+            conn.executemany("DELETE FROM airtable_records WHERE record_id = ?", gone)
+        return len(gone)
+
+    def query_remote(self, limit: int = 10) -> List[dict]:
+        """Most recent mirrored records' fields, newest Date first."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT record_id, fields FROM airtable_records ORDER BY date DESC, created_time DESC LIMIT ?",
+                (limit,),
+            ).fetchall()
+        return [{"record_id": record_id, **json.loads(fields)} for record_id, fields in rows]
+
+    def get_sync_state(self, key: str) -> Optional[str]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT value FROM sync_state WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_sync_state(self, **values: str) -> None:
+        with self._connect() as conn:
+            conn.executemany("INSERT OR REPLACE INTO sync_state (key, value) VALUES (?, ?)", values.items())
+
+    def compact(self) -> dict:
+        """Applies retention, then checkpoints the WAL and frees unused pages."""
+        removed = 0
+        with self._connect() as conn:
+            if _RETENTION_DAYS > 0:
+                cutoff  = (datetime.now() - timedelta(days=_RETENTION_DAYS)).isoformat()
+                removed = conn.execute("DELETE FROM alerts WHERE timestamp < ?", (cutoff,)).rowcount
+        with self._connect() as conn:
+            conn.execute("PRAGMA incremental_vacuum")
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            conn.execute("PRAGMA optimize")
+        return {"removed": removed}
+
+
+def _filters(campaign, severity, status, since, until) -> tuple:
+    """WHERE clauses + params shared by query and severity_counts."""
+    where, params = [], []
+    for col, values in (("campaign", campaign), ("severity", severity), ("status", status)):
+        if values:
+            where.append(f"{col} IN ({', '.join('?' * len(values))})")
+            params += values
+    if since:
+        where.append("timestamp >= ?")
+        params.append(since)
+    if until:
+        where.append("timestamp <= ?")
+        params.append(until)
+    return where, params
+
+
+def encode_cursor(alert: dict) -> str:
+    raw = f"{alert['timestamp']}|{alert['id']}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple:
+    """Raises ValueError on a malformed cursor."""
+    try:
+        raw     = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        ts, id_ = raw.rsplit("|", 1)
+        return ts, int(id_)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+
+
+def _row(alert: dict) -> list:
+    return [
+        str(alert.get("campaign", "")),
+        str(alert.get("issue", "")),
+        str(alert.get("severity", "low")),
+        str(alert.get("recommendation", "")),
+        str(alert.get("timestamp") or datetime.now().isoformat()),
+        str(alert.get("status") or "new"),
+    ]
+
+
+alert_store = AlertStore()
@@ -0,0 +1,80 @@
+# backend/app/services/batch_analysis.py
+# ── Fan-out of the agent over many filter segments ───────────────────────────
+#
+# All segments are cut from one dataset snapshot, then one agent run per
+# segment is scheduled with bounded parallelism. LLM traffic from every
+# run shares the global limiter in app.agents.rate_limiter, so raising the
+# batch concurrency never exceeds the provider quota.
+#
+
+import asyncio
+import time
+from typing import AsyncIterator, List, Optional
+
+from app.data.data_loader import load_segments_for_agent
+from app.services.executor import run_sync
+
+MAX_CONCURRENCY = 16
+
+
+async def _run_segment(index: int, segment: dict, data: list, limit: asyncio.Semaphore, options: dict) -> dict:
+    from app.agents.marketing_agent import run_agent
+
+    if not data:
+        return {"index": index, "segment": segment, "status": "error", "detail": "No data found for this segment."}
+    async with limit:
+        started = time.perf_counter()
+        try:
+            result = await run_agent(data, **options)
+        except Exception as e:
+            return {"index": index, "segment": segment, "status": "error", "detail": f"Agent failed: {e}"}
+    return {
+        "index"      : index,
+        "segment"    : segment,
+        "status"     : "success",
+        "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+        "result"     : result,
+    }
+
+
+async def iter_batch(
+    segments   : List[dict],
+    concurrency: int  = 4,
+    ratio_mode : str  = "weighted",
+    datasets   : Optional[List[list]] = None,
+    **options,
+) -> AsyncIterator[dict]:
+    """
+    Yields one entry per segment as soon as its agent run finishes
+    (completion order; `index` refers back to the input list).
+    `datasets` are the segments' rows if already loaded (see
+    load_segments_for_agent); `options` are passed through to run_agent.
+    """
+    if datasets is None:
+        datasets = await run_sync(load_segments_for_agent, segments, ratio_mode=ratio_mode)
+    limit    = asyncio.Semaphore(max(1, min(concurrency, MAX_CONCURRENCY)))
+    tasks    = [
+        asyncio.create_task(_run_segment(i, segment, data, limit, options))
+        for i, (segment, data) in enumerate(zip(segments, datasets))
+    ]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        # Client went away mid-stream — don't leave agent runs behind
+        for task in tasks:
+            task.cancel()
+
+
+async def run_batch(segments: List[dict], **kwargs) -> dict:
+    """Runs the whole batch and returns the results in input order."""
+    started = time.perf_counter()
+    results = [entry async for entry in iter_batch(segments, **kwargs)]
+    results.sort(key=lambda entry: entry["index"])
+    return {
+        "status"     : "success",
+        "count"      : len(results),
+        "failed"     : sum(entry["status"] != "success" for entry in results),
+        "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+        "results"    : results,
+    }
@@ -0,0 +1,156 @@
+# backend/app/services/executor.py
+# ── Worker pool for blocking calls + event-loop lag monitor ─────────────────
+#
+# Route handlers are `async def`, so any pandas work, SQLite query or file
+# write they call directly runs on the event loop and stalls every other
+# request — including agent runs waiting on the LLM. `run_sync` moves such
+# calls onto a dedicated thread pool and awaits the result; pandas and
+# SQLite release the GIL for most of their work, so dashboard reads really
+# do overlap.
+#
+# A thread pool rather than a process pool: the dataset cache and the
+# SQLite stores are per-process objects that worker threads can share, and
+# gunicorn already spreads requests over one process per core.
+#
+# LoopLagMonitor wakes every LOOP_LAG_INTERVAL_MS and records how late it
+# was — the time the loop spent blocked. Both are reported by GET /api/runtime.
+#
+# Tunables (.env):
+#   EXECUTOR_THREADS        default: min(32, CPU count + 4)
+#   LOOP_LAG_INTERVAL_MS    default: 100
+#   LOOP_LAG_WARN_MS        default: 250 — log a stall at or above this
+#
+
+import asyncio
+import functools
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+_THREADS      = int(os.getenv("EXECUTOR_THREADS", str(min(32, (os.cpu_count() or 1) + 4))))
+_LAG_INTERVAL = float(os.getenv("LOOP_LAG_INTERVAL_MS", "100")) / 1000
+_LAG_WARN_MS  = float(os.getenv("LOOP_LAG_WARN_MS", "250"))
+
+
+class SyncExecutor:
+    """Thread pool for blocking calls, with queue-wait and run-time counters."""
+
+    def __init__(self, threads: int = _THREADS):
+        self._threads  = threads
+        self._pool     : Optional[ThreadPoolExecutor] = None
+        self._lock     = threading.Lock()
+        self.calls     = 0
+        self.in_flight = 0
+        self.busy_ms   = 0.0
+        self.max_ms    = 0.0
+        self.wait_ms   = 0.0   # total time calls sat queued before a thread took them
+
+    @property
+    def pool(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self._threads, thread_name_prefix="sync")
+        return self._pool
+
+    def _timed(self, submitted: float, func: Callable, args: tuple, kwargs: dict) -> Any:
+        started = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            ran_ms = (time.perf_counter() - started) * 1000
+            with self._lock:
+                self.busy_ms += ran_ms
+                self.max_ms   = max(self.max_ms, ran_ms)
+                self.wait_ms += (started - submitted) * 1000
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        with self._lock:
+            self.calls     += 1
+            self.in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            call = functools.partial(self._timed, time.perf_counter(), func, args, kwargs)
+            return await loop.run_in_executor(self.pool, call)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "threads"    : self._threads,
+                "calls"      : self.calls,
+                "in_flight"  : self.in_flight,
+                "avg_ms"     : round(self.busy_ms / self.calls, 2) if self.calls else 0.0,
+                "max_ms"     : round(self.max_ms, 2),
+                "avg_wait_ms": round(self.wait_ms / self.calls, 2) if self.calls else 0.0,
+            }
+
+
+class LoopLagMonitor:
+    """Samples how late a periodic timer fires — i.e. how long the loop was blocked."""
+
+    def __init__(self, interval: float = _LAG_INTERVAL, warn_ms: float = _LAG_WARN_MS, window: int = 600):
+        self._interval = interval
+        self._warn_ms  = warn_ms
+        self._samples  : deque = deque(maxlen=window)   # last `window` lags, ms
+        self._task     : Optional[asyncio.Task] = None
+        self.max_ms    = 0.0
+        self.stalls    = 0
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self._interval
+            await asyncio.sleep(self._interval)
+            lag_ms = max(loop.time() - expected, 0.0) * 1000
+            self._samples.append(lag_ms)
+            self.max_ms = max(self.max_ms, lag_ms)
+            if lag_ms >= self._warn_ms:
+                self.stalls += 1
+                print(f"[Loop] ⚠️  Event loop blocked for {lag_ms:.0f}ms")
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def stats(self) -> dict:
+        samples = sorted(self._samples)
+
+        def pct(p: float) -> float:
+            return round(samples[min(int(len(samples) * p), len(samples) - 1)], 2) if samples else 0.0
+
+        return {
+            "interval_ms": round(self._interval * 1000, 1),
+            "samples"    : len(samples),
+            "last_ms"    : round(self._samples[-1], 2) if self._samples else 0.0,
+            "p50_ms"     : pct(0.50),
+            "p95_ms"     : pct(0.95),
+            "p99_ms"     : pct(0.99),
+            "max_ms"     : round(self.max_ms, 2),
+            "stalls"     : self.stalls,
+            "warn_ms"    : self._warn_ms,
+            "running"    : self._task is not None and not self._task.done(),
+        }
+
+
+sync_executor = SyncExecutor()
+loop_monitor  = LoopLagMonitor()
+
+
+async def run_sync(func: Callable, *args, **kwargs) -> Any:
+    """Runs a blocking call on the shared worker pool and awaits its result."""
+    return await sync_executor.run(func, *args, **kwargs)
@@ -0,0 +1,344 @@
+# backend/app/services/job_queue.py
+# ── In-process background job queue ─────────────────────────────────────────
+#
+# Long agent runs are taken off the request path: callers get a job id
+# straight away and poll GET /api/jobs/{id} (or receive a callback POST).
+#
+#   · a pool of asyncio workers consumes an in-memory queue
+#   · every job is written through to SQLite (JOB_QUEUE_PERSIST=1, default)
+#     so status survives restarts and unfinished jobs are resumed on start
+#   · an idempotency key coalesces duplicate triggers (n8n retries) into
+#     the job that is already queued, running or finished
+#   · only queued/running jobs stay in memory; finished ones are read back
+#     from SQLite (memory-only mode keeps the newest JOB_MEMORY_LIMIT)
+#   · with several server workers, each job is owned by the process that
+#     runs it; status reads go to the shared table, and a starting worker
+#     only resumes jobs whose owner has exited (see shared_state)
+#
+# Tunables (.env):
+#   JOB_WORKERS          concurrent jobs                         (default 2)
+#   JOB_QUEUE_PATH       SQLite file   (default data/jobs.sqlite3)
+#   JOB_QUEUE_PERSIST    0 = memory only
+#   JOB_IDEMPOTENCY_TTL  seconds a finished job still absorbs its key (86400)
+#   JOB_MEMORY_LIMIT     finished jobs kept when JOB_QUEUE_PERSIST=0 (1000)
+#   JOB_CALLBACK_HOSTS   comma-separated hosts a callback_url may point at
+#                        (default none — callbacks are refused until set)
+#
+
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Awaitable, Callable, Dict, Iterator, Optional
+from urllib.parse import urlparse
+
+import httpx
+
+from app.services.executor import run_sync
+from app.services.shared_state import PROCESS_ID, file_lock, is_alive, register_process
+
+_ROOT            = os.path.normpath(os.path.join(os.path.dirname(__file__), "..", "..", "..", "data"))
+_QUEUE_PATH      = os.getenv("JOB_QUEUE_PATH", os.path.join(_ROOT, "jobs.sqlite3"))
+_PERSIST         = os.getenv("JOB_QUEUE_PERSIST", "1") != "0"
+_WORKERS         = int(os.getenv("JOB_WORKERS", "2"))
+_IDEMPOTENCY_TTL = float(os.getenv("JOB_IDEMPOTENCY_TTL", "86400"))
+_MEMORY_LIMIT    = int(os.getenv("JOB_MEMORY_LIMIT", "1000"))
+_CALLBACK_HOSTS  = {h.strip().lower() for h in os.getenv("JOB_CALLBACK_HOSTS", "").split(",") if h.strip()}
+
+ACTIVE   = ("queued", "running")
+_COLUMNS = [
+    "id", "kind", "status", "payload", "result", "error", "idempotency_key",
+    "callback_url", "callback_status", "created_at", "started_at", "finished_at", "owner",
+]
+_JSON_COLUMNS = {"payload", "result"}
+
+Handler = Callable[[dict], Awaitable[dict]]
+
+
+class JobQueue:
+    """asyncio worker pool with an optional SQLite write-through job table."""
+
+    def __init__(self, path: str = _QUEUE_PATH, workers: int = _WORKERS, persist: bool = _PERSIST):
+        self._path     = path
+        self._persist  = persist
+        self._workers  = workers
+        self._lock     = threading.Lock()
+        self._ready    = False
+        self._jobs     : Dict[str, dict] = {}            # queued + running only
+        self._finished : "OrderedDict[str, dict]" = OrderedDict()   # memory-only mode
+        self._handlers : Dict[str, Handler] = {}
+        self._queue    : Optional[asyncio.Queue] = None
+        self._tasks    : list = []
+
+    # ── storage ──────────────────────────────────────────────────────────────
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        with self._lock:
+            if not self._ready:
+                os.makedirs(os.path.dirname(self._path), exist_ok=True)
+            conn = sqlite3.connect(self._path, timeout=5.0)
+            try:
+                if not self._ready:
+                    self._init_schema(conn)
+                with conn:
+                    yield conn
+            finally:
+                conn.close()
+
+    def _init_schema(self, conn: sqlite3.Connection) -> None:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            " id TEXT PRIMARY KEY, kind TEXT NOT NULL, status TEXT NOT NULL,"
+            " payload TEXT, result TEXT, error TEXT, idempotency_key TEXT,"
+            " callback_url TEXT, callback_status TEXT,"
+            " created_at REAL NOT NULL, started_at REAL, finished_at REAL, owner TEXT)"
+        )
+        if "owner" not in {row[1] for row in conn.execute("PRAGMA table_info(jobs)")}:
+            conn.execute("ALTER TABLE jobs ADD COLUMN owner TEXT")
+        conn.execute("CREATE INDEX IF NOT EXISTS jobs_key ON jobs (idempotency_key, created_at)")
+        conn.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status)")
+        self._ready = True
+
+    def _save(self, job: dict) -> None:
+        # Called from worker-pool threads (run_sync) — in-memory maps change under the lock
+        with self._lock:
+            if job["status"] in ACTIVE:
+                self._jobs[job["id"]] = job
+            else:
+                self._jobs.pop(job["id"], None)
+            if not self._persist and job["status"] not in ACTIVE:
+                # Nowhere else to keep it — hold the newest finished jobs only
+                self._finished[job["id"]] = job
+                self._finished.move_to_end(job["id"])
+                while len(self._finished) > _MEMORY_LIMIT:
+                    self._finished.popitem(last=False)
+        if not self._persist:
+            return
+        row = [json.dumps(job[c]) if c in _JSON_COLUMNS else job[c] for c in _COLUMNS]
+        with self._connect() as conn:
+            conn.execute(
+                f"INSERT OR REPLACE INTO jobs ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' * len(_COLUMNS))})",
+                row,
+            )
+
+    @staticmethod
+    def _from_row(row: tuple) -> dict:
+        job = dict(zip(_COLUMNS, row))
+        for col in _JSON_COLUMNS:
+            job[col] = json.loads(job[col]) if job[col] is not None else None
+        return job
+
+    def _query(self, where: str, params: tuple) -> list:
+        if not self._persist:
+            return []
+        with self._connect() as conn:
+            rows = conn.execute(f"SELECT {', '.join(_COLUMNS)} FROM jobs WHERE {where}", params).fetchall()
+        return [self._from_row(r) for r in rows]
+
+    def get(self, job_id: str) -> Optional[dict]:
+        """This process's live copy, else the shared table (finished jobs, other workers' jobs)."""
+        job = self._jobs.get(job_id) or self._finished.get(job_id)
+        if job is None:
+            found = self._query("id = ?", (job_id,))
+            job   = found[0] if found else None
+        return job
+
+    def _find_by_key(self, key: str) -> Optional[dict]:
+        """Newest job for `key` that should absorb a new trigger, if any."""
+        cutoff     = time.time() - _IDEMPOTENCY_TTL
+        # In-memory jobs are only the active ones (plus the capped finished
+        # set without persistence); everything else is an indexed lookup
+        with self._lock:
+            in_memory = [*self._jobs.values(), *self._finished.values()]
+        candidates = [j for j in in_memory if j["idempotency_key"] == key]
+        if self._persist:
+            candidates += self._query("idempotency_key = ? AND created_at >= ?", (key, cutoff))
+        for job in sorted(candidates, key=lambda j: j["created_at"], reverse=True):
+            if job["status"] in ACTIVE:
+                return job
+            # Finished jobs only absorb explicit keys, and never failures
+            if job["status"] == "succeeded" and not key.startswith("auto:") and job["created_at"] >= cutoff:
+                return job
+        return None
+
+    # ── workers ──────────────────────────────────────────────────────────────
+
+    def register(self, kind: str, handler: Handler) -> None:
+        self._handlers[kind] = handler
+
+    def start(self) -> None:
+        """
+        Starts the workers on the running loop; unfinished jobs whose owning
+        process is gone are resumed in the background.
+        """
+        if self._queue is not None:
+            return
+        self._queue = asyncio.Queue()
+        register_process()
+        self._tasks = [asyncio.create_task(self._worker(i)) for i in range(self._workers)]
+        self._tasks.append(asyncio.create_task(self._resume()))
+
+    def _claim_orphans(self) -> list:
+        """Takes over active jobs whose owner has exited. Jobs held by a live sibling are left to it."""
+        claimed = []
+        with file_lock("jobs"):
+            for job in self._query("status IN (?, ?) ORDER BY created_at", ACTIVE):
+                if is_alive(job["owner"]):
+                    continue
+                job.update(status="queued", owner=PROCESS_ID)
+                self._save(job)
+                claimed.append(job)
+        return claimed
+
+    async def _resume(self) -> None:
+        for job in await run_sync(self._claim_orphans):
+            self._queue.put_nowait(job["id"])
+            print(f"[Jobs] Resuming {job['kind']} job {job['id']}")
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks, self._queue = [], None
+
+    async def _worker(self, n: int) -> None:
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._run(await run_sync(self.get, job_id))
+            except Exception as e:
+                print(f"[Jobs] Worker {n} error on {job_id}: {e}")
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: dict) -> None:
+        handler = self._handlers.get(job["kind"])
+        job.update(status="running", started_at=time.time())
+        await run_sync(self._save, job)
+        try:
+            if handler is None:
+                raise LookupError(f"No handler registered for job kind {job['kind']!r}")
+            job.update(status="succeeded", result=await handler(job["payload"]))
+        except Exception as e:
+            job.update(status="failed", error=str(e))
+        job["finished_at"] = time.time()
+        await run_sync(self._save, job)
+        print(f"[Jobs] {job['kind']} job {job['id']} {job['status']} in {job['finished_at'] - job['started_at']:.1f}s")
+
+        if job["callback_url"]:
+            job["callback_status"] = await _post_callback(job["callback_url"], public_view(job))
+            await run_sync(self._save, job)
+
+    # ── API ──────────────────────────────────────────────────────────────────
+
+    async def submit(
+        self,
+        kind           : str,
+        payload        : dict,
+        idempotency_key: Optional[str] = None,
+        callback_url   : Optional[str] = None,
+    ) -> tuple:
+        """
+        Enqueues a job. Returns (job, created) — created is False when
+        coalesced. Raises ValueError for a callback_url off the allowlist.
+        """
+        if callback_url and not callback_allowed(callback_url):
+            raise ValueError(f"callback_url host is not in JOB_CALLBACK_HOSTS: {callback_url}")
+        self.start()
+        job, created = await run_sync(self._submit_locked, kind, payload, idempotency_key, callback_url)
+        if created:
+            await self._queue.put(job["id"])
+        return job, created
+
+    def _submit_locked(self, kind: str, payload: dict, idempotency_key: Optional[str], callback_url: Optional[str]) -> tuple:
+        # Lookup + insert is one critical section across every worker process;
+        # the lock blocks, so this runs on the worker pool, never the event loop
+        with file_lock("jobs"):
+            if idempotency_key:
+                existing = self._find_by_key(idempotency_key)
+                if existing is not None:
+                    return existing, False
+            job = {c: None for c in _COLUMNS}
+            job.update(
+                id              = uuid.uuid4().hex,
+                kind            = kind,
+                status          = "queued",
+                payload         = payload,
+                idempotency_key = idempotency_key,
+                callback_url    = callback_url,
+                created_at      = time.time(),
+                owner           = PROCESS_ID,
+            )
+            self._save(job)
+        return job, True
+
+    async def wait(self, job_id: str, timeout: Optional[float] = None, poll: float = 0.2) -> dict:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            job = await run_sync(self.get, job_id)
+            if job is None or job["status"] not in ACTIVE:
+                return job
+            if deadline is not None and time.monotonic() >= deadline:
+                return job
+            await asyncio.sleep(poll)
+
+    def stats(self) -> dict:
+        """Statuses across all server workers when persisted; `pending` is this process's queue."""
+        if self._persist:
+            with self._connect() as conn:
+                counts = dict(conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+        else:
+            counts: Dict[str, int] = {}
+            with self._lock:
+                jobs = [*self._jobs.values(), *self._finished.values()]
+            for job in jobs:
+                counts[job["status"]] = counts.get(job["status"], 0) + 1
+        return {
+            "workers" : self._workers,
+            "persist" : self._persist,
+            "process" : PROCESS_ID,
+            "pending" : self._queue.qsize() if self._queue is not None else 0,
+            "statuses": counts,
+        }
+
+
+def public_view(job: dict) -> dict:
+    """Job as returned by the API — timestamps as ISO strings."""
+    view = {k: v for k, v in job.items() if k != "payload"}
+    for col in ("created_at", "started_at", "finished_at"):
+        if view.get(col) is not None:
+            view[col] = time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(view[col]))
+    return view
+
+
+def callback_allowed(url: str) -> bool:
+    """True for an http(s) URL whose host is listed in JOB_CALLBACK_HOSTS."""
+    parsed = urlparse(url)
+    return parsed.scheme in ("http", "https") and (parsed.hostname or "") in _CALLBACK_HOSTS
+
+
+async def _post_callback(url: str, body: dict, attempts: int = 3) -> str:
+    # Checked again here: a resumed job may predate the current allowlist
+    if not callback_allowed(url):
+        print(f"[Jobs] Callback to {url} refused — host not in JOB_CALLBACK_HOSTS")
+        return "refused"
+    for attempt in range(attempts):
+        try:
+            async with httpx.AsyncClient(timeout=10.0) as client:
+                response = await client.post(url, json=body)
+            if response.status_code < 500:
+                return str(response.status_code)
+        except httpx.HTTPError as e:
+            print(f"[Jobs] Callback to {url} failed: {e}")
+        await asyncio.sleep(2 ** attempt)
+    return "failed"
+
+
+job_queue = JobQueue()
@@ -0,0 +1,148 @@
+# backend/app/services/shared_state.py
+# ── Cross-process coordination for multi-worker deployments ──────────────────
+#
+# gunicorn runs several uvicorn workers (see gunicorn.conf.py). Each is its
+# own process with its own module globals, so everything they share goes
+# through data/:
+#
+#   · SQLite in WAL mode for alerts, jobs, the LLM cache and the Airtable
+#     outbox — readers never block, writers queue for up to 5s
+#   · advisory file locks (fcntl.flock) in data/locks/ for the few
+#     read-modify-write sections SQLite cannot cover on its own: dataset
+#     ingest, idempotent job submission, outbox draining, mirror syncs
+#   · atomic replace for whole-file artefacts (latest_report.md)
+#
+# Every process also holds a lock on its own "owner" file for its lifetime.
+# Another process can then tell whether the owner of a job is still alive
+# (lock held) or gone (lock free) without trusting pids, which are reused
+# across container restarts.
+#
+# flock is per host: replicas on different machines need a shared volume
+# with working POSIX locks, or one writer host. Without fcntl (Windows dev
+# boxes) the locks fall back to in-process threading locks.
+#
+# Tunables (.env):
+#   STATE_LOCK_DIR   default: data/locks
+#
+
+import os
+import threading
+import uuid
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:          # pragma: no cover — non-POSIX
+    fcntl = None
+
+_ROOT     = os.path.normpath(os.path.join(os.path.dirname(__file__), "..", "..", "..", "data"))
+_LOCK_DIR = os.getenv("STATE_LOCK_DIR", os.path.join(_ROOT, "locks"))
+
+# Unique per process start; recorded as the owner of the jobs it runs
+PROCESS_ID = uuid.uuid4().hex[:12]
+
+_local_locks : Dict[str, threading.Lock] = {}
+_owner_handle: Optional[int] = None
+
+
+def _lock_path(name: str) -> str:
+    os.makedirs(_LOCK_DIR, exist_ok=True)
+    return os.path.join(_LOCK_DIR, f"{name}.lock")
+
+
+def _local_lock(name: str) -> threading.Lock:
+    return _local_locks.setdefault(name, threading.Lock())
+
+
+@contextmanager
+def file_lock(name: str, shared: bool = False) -> Iterator[None]:
+    """
+    Blocking cross-process lock. Keep the section short and free of awaits —
+    it blocks the event loop while it waits.
+    """
+    if fcntl is None:
+        with _local_lock(name):
+            yield
+        return
+    fd = os.open(_lock_path(name), os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        yield
+    finally:
+        os.close(fd)   # closing the descriptor releases the lock
+
+
+@contextmanager
+def try_lock(name: str) -> Iterator[bool]:
+    """Non-blocking exclusive lock; yields whether it was acquired. Safe to hold across awaits."""
+    if fcntl is None:
+        lock     = _local_lock(name)
+        acquired = lock.acquire(blocking=False)
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                lock.release()
+        return
+    fd = os.open(_lock_path(name), os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            acquired = True
+        except BlockingIOError:
+            acquired = False
+        yield acquired
+    finally:
+        os.close(fd)
+
+
+# ── process liveness ─────────────────────────────────────────────────────────
+
+def register_process() -> str:
+    """
+    Takes this process's owner lock (idempotent) and removes the owner files
+    of processes that have exited. Returns PROCESS_ID.
+    """
+    global _owner_handle
+    if _owner_handle is None and fcntl is not None:
+        # Locked before it becomes visible, so a sibling's sweep never sees it free
+        path = _lock_path(f"owner-{PROCESS_ID}")
+        fd   = os.open(f"{path}.new", os.O_RDWR | os.O_CREAT, 0o644)
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        os.replace(f"{path}.new", path)
+        _owner_handle = fd
+        for name in os.listdir(_LOCK_DIR):
+            if name.startswith("owner-") and name.endswith(".lock"):
+                is_alive(name[len("owner-"):-len(".lock")])
+    return PROCESS_ID
+
+
+def is_alive(process_id: Optional[str]) -> bool:
+    """True while the process that registered `process_id` is running."""
+    if not process_id:
+        return False
+    if process_id == PROCESS_ID:
+        return True
+    if fcntl is None:
+        return False   # single-process fallback: every other owner is gone
+    path = os.path.join(_LOCK_DIR, f"owner-{process_id}.lock")
+    if not os.path.exists(path):
+        return False
+    with try_lock(f"owner-{process_id}") as acquired:
+        if acquired:
+            os.remove(path)   # owner is gone — tidy up its lock file
+        return not acquired
+
+
+# ── files ────────────────────────────────────────────────────────────────────
+
+def atomic_write(path: str, text: str) -> None:
+    """Writes via a temp file + rename, so readers see the old or the new file, never half."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{PROCESS_ID}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
@@ -0,0 +1,41 @@
+# backend/gunicorn.conf.py
+# ── Multi-worker production server ───────────────────────────────────────────
+# Run with: gunicorn -c gunicorn.conf.py app.main:app  (from inside /backend folder)
+#
+# One uvicorn worker process per core by default. Workers share no memory:
+# alerts, jobs, the LLM cache and the Airtable outbox live in SQLite (WAL)
+# under data/, and the few cross-process critical sections take the file
+# locks in app/services/shared_state.py. Any worker can serve any request.
+#
+# Per-process limits stay per worker — for a global provider quota divide
+# LLM_RATE_PER_SEC / LLM_MAX_CONCURRENCY (and JOB_WORKERS) by the worker count.
+#
+# Tunables (env):
+#   PORT                    default: 8000
+#   WEB_CONCURRENCY         worker processes (default: CPU count)
+#   GUNICORN_TIMEOUT        seconds before a silent worker is restarted (default 180)
+#   GUNICORN_MAX_REQUESTS   recycle a worker after N requests (default 1000, 0 = never)
+#
+
+import multiprocessing
+import os
+
+bind         = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+workers      = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+worker_class = "uvicorn.workers.UvicornWorker"
+
+# A synchronous /api/analyze can run for the agent's whole time budget
+timeout          = int(os.getenv("GUNICORN_TIMEOUT", "180"))
+graceful_timeout = 30
+keepalive        = 5
+
+# Recycling bounds slow leaks; jitter keeps workers from restarting together
+max_requests        = int(os.getenv("GUNICORN_MAX_REQUESTS", "1000"))
+max_requests_jitter = max_requests // 10
+
+# Each worker imports the app itself — no SQLite handles, locks or event
+# loops are inherited across fork
+preload_app = False
+
+accesslog = "-"
+errorlog  = "-"
@@ -0,0 +1,26 @@
+# backend/tests/conftest.py
+# ── Test isolation ───────────────────────────────────────────────────────────
+#
+# Every store reads its path from the environment at import time, so they
+# are pointed at a scratch directory here, before any app module loads.
+# Run with: python -m pytest  (from inside /backend folder)
+#
+
+import atexit
+import os
+import shutil
+import tempfile
+
+SCRATCH = tempfile.mkdtemp(prefix="insight-tests-")
+atexit.register(shutil.rmtree, SCRATCH, True)
+
+os.environ.update({
+    "ALERT_DB_PATH"       : os.path.join(SCRATCH, "alerts.sqlite3"),
+    "JOB_QUEUE_PATH"      : os.path.join(SCRATCH, "jobs.sqlite3"),
+    "LLM_CACHE_PATH"      : os.path.join(SCRATCH, "llm_cache.sqlite3"),
+    "AIRTABLE_OUTBOX_PATH": os.path.join(SCRATCH, "airtable_outbox.sqlite3"),
+    "STATE_LOCK_DIR"      : os.path.join(SCRATCH, "locks"),
+    "AIRTABLE_API_KEY"    : "test-key",
+    "AIRTABLE_BASE_ID"    : "appTEST",
+    "LLM_PROVIDER"        : "fake",
+})
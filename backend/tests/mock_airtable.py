@@ -0,0 +1,116 @@
+# backend/tests/mock_airtable.py
+# ── Local stand-in for the Airtable REST API ────────────────────────────────
+#
+# Serves the two calls airtable_service makes against one table:
+#   POST {base}/{table}   create up to 10 records
+#   GET  {base}/{table}   list with pageSize / offset paging and the
+#                         IS_AFTER(LAST_MODIFIED_TIME(), ...) filter
+# Point AIRTABLE_API_URL at `server.url`. `fail_next` queues error replies
+# (e.g. a 429 with Retry-After) for the next POSTs.
+#
+
+import json
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+_SINCE = re.compile(r"DATETIME_PARSE\('([^']+)'\)")
+
+
+class MockAirtable:
+    def __init__(self):
+        self.records  : dict = {}     # id → {"id", "createdTime", "fields", "modified"}
+        self.requests : list = []     # (method, path, query, body)
+        self._failures: list = []     # (status, headers) for upcoming POSTs
+        self._lock    = threading.Lock()
+        self._next_id = 0
+        self._server  = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._thread  = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_address[1]}/v0"
+
+    def start(self) -> "MockAirtable":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    # ── test controls ────────────────────────────────────────────────────────
+
+    def add(self, fields: dict, modified: float = None) -> str:
+        with self._lock:
+            self._next_id += 1
+            record_id = f"rec{self._next_id:06d}"
+            self.records[record_id] = {
+                "id"         : record_id,
+                "createdTime": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.000Z"),
+                "fields"     : fields,
+                "modified"   : time.time() if modified is None else modified,
+            }
+        return record_id
+
+    def fail_next(self, status: int, retry_after: float = None) -> None:
+        headers = {"Retry-After": str(retry_after)} if retry_after is not None else {}
+        self._failures.append((status, headers))
+
+    def posts(self) -> list:
+        return [body for method, _, _, body in self.requests if method == "POST"]
+
+    # ── HTTP ─────────────────────────────────────────────────────────────────
+
+    def _handler(self):
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, status: int, body: dict, headers: dict = None) -> None:
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                mock.requests.append(("POST", self.path, {}, body))
+                if self.headers.get("Authorization") != "Bearer test-key":
+                    return self._reply(401, {"error": "AUTHENTICATION_REQUIRED"})
+                if mock._failures:
+                    status, headers = mock._failures.pop(0)
+                    return self._reply(status, {"error": "MOCK_FAILURE"}, headers)
+                if len(body["records"]) > 10:
+                    return self._reply(422, {"error": "TOO_MANY_RECORDS"})
+                created = [mock.records[mock.add(r["fields"])] for r in body["records"]]
+                self._reply(200, {"records": [{k: r[k] for k in ("id", "createdTime", "fields")} for r in created]})
+
+            def do_GET(self):
+                url   = urlparse(self.path)
+                query = {k: v[0] for k, v in parse_qs(url.query).items()}
+                mock.requests.append(("GET", url.path, query, None))
+                with mock._lock:
+                    rows = sorted(mock.records.values(), key=lambda r: r["id"])
+                since = _SINCE.search(query.get("filterByFormula", ""))
+                if since:
+                    cutoff = datetime.strptime(since.group(1), "%Y-%m-%dT%H:%M:%S.000Z").replace(tzinfo=timezone.utc).timestamp()
+                    rows   = [r for r in rows if r["modified"] > cutoff]
+                start = int(query.get("offset", 0))
+                size  = int(query.get("pageSize", 100))
+                page  = rows[start:start + size]
+                body  = {"records": [{k: r[k] for k in ("id", "createdTime", "fields")} for r in page]}
+                if start + size < len(rows):
+                    body["offset"] = str(start + size)
+                self._reply(200, body)
+
+        return Handler
@@ -0,0 +1,41 @@
+# backend/tests/test_agent_budget.py
+# ── Agent token / time budgets against the fake provider ────────────────────
+
+import asyncio
+import time
+
+import pytest
+
+from app.agents import marketing_agent
+from app.agents.llm_providers import FakeProvider
+from app.data.campaigns import load_campaigns
+
+
+@pytest.fixture
+def slow_provider():
+    previous = marketing_agent.provider
+    fake     = FakeProvider(latency_ms=3000)
+    marketing_agent.set_provider(fake)
+    yield fake
+    marketing_agent.set_provider(previous)
+
+
+def _run(**budget) -> dict:
+    return asyncio.run(marketing_agent.run_agent(load_campaigns(), use_cache=False, prescreen=False, **budget))
+
+
+def test_time_budget_cancels_the_call_in_flight(slow_provider):
+    started = time.monotonic()
+    result  = _run(time_budget_s=0.5, token_budget=0)
+    assert time.monotonic() - started < 2.5            # did not wait out the 3s reply
+    assert result["status"] == "partial"
+    assert result["budget"]["stop_reason"] == "time_budget"
+
+
+def test_tiny_token_budget_still_gets_one_turn(slow_provider):
+    slow_provider._latency_ms = 0
+    result = _run(token_budget=10, time_budget_s=0)
+    assert slow_provider.calls == 1
+    assert result["status"] == "partial"
+    assert result["budget"]["stop_reason"] == "token_budget"
+    assert result["tool_calls_log"]                    # the first turn's tools ran
@@ -0,0 +1,34 @@
+# backend/tests/test_agent_tools.py
+# ── Tool failures inside one agent turn ─────────────────────────────────────
+
+import asyncio
+import json
+
+from app.agents import marketing_agent
+from app.agents.llm_providers import FakeProvider
+from app.data.campaigns import load_campaigns
+
+
+def test_one_bad_tool_call_does_not_fail_the_turn():
+    seen = []
+
+    def mixed_turn(messages):
+        bad = {"id": "bad_0", "type": "function", "function": {"name": "get_campaign_trend", "arguments": "{not json"}}
+        ok  = {"id": "scan_0", "type": "function", "function": {"name": "detect_anomalies", "arguments": json.dumps({"days": 7})}}
+        return {"role": "assistant", "content": None, "tool_calls": [bad, ok]}
+
+    def final_turn(messages):
+        seen.extend(m for m in messages if isinstance(m, dict) and m.get("role") == "tool")
+        return {"role": "assistant", "content": "done"}
+
+    previous = marketing_agent.provider
+    marketing_agent.set_provider(FakeProvider(latency_ms=0, script=[mixed_turn, final_turn]))
+    try:
+        result = asyncio.run(marketing_agent.run_agent(load_campaigns(), use_cache=False, prescreen=False))
+    finally:
+        marketing_agent.set_provider(previous)
+
+    assert result["status"] == "success" and result["budget"]["stop_reason"] == "complete"
+    assert [m["tool_call_id"] for m in seen] == ["bad_0", "scan_0"]
+    assert "JSONDecodeError" in json.loads(seen[0]["content"])["error"]
+    assert "error" not in json.loads(seen[1]["content"])
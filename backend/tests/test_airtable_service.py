@@ -0,0 +1,123 @@
+# backend/tests/test_airtable_service.py
+# ── Outbox flusher and mirror sync against the local mock Airtable ──────────
+
+import asyncio
+import sqlite3
+import time
+
+import pytest
+
+from app.services import airtable_service
+from app.services.airtable_service import AirtableSink, AirtableSync
+from app.services.alert_store import AlertStore
+from app.services.shared_state import try_lock
+from tests.mock_airtable import MockAirtable
+
+
+@pytest.fixture
+def mock_airtable(monkeypatch):
+    server = MockAirtable().start()
+    monkeypatch.setattr(airtable_service, "AIRTABLE_API_URL", server.url)
+    yield server
+    server.stop()
+
+
+def _run(coro):
+    async def main():
+        try:
+            return await coro
+        finally:
+            # The pooled client is bound to this event loop
+            await airtable_service.airtable_sink.stop()
+    return asyncio.run(main())
+
+
+def _alert(n: int) -> dict:
+    return {"Campaign": "Meta Ads", "Issue": f"issue {n}", "Severity": "high", "Status": "new"}
+
+
+def test_outbox_drains_in_batches_of_ten(mock_airtable, tmp_path):
+    sink = AirtableSink(path=str(tmp_path / "outbox.sqlite3"), rate=100)
+
+    async def scenario():
+        for n in range(25):
+            await sink.enqueue(_alert(n))
+        try:
+            return await sink.flush(timeout=10)
+        finally:
+            await sink.stop()
+
+    assert _run(scenario()) == 0
+    assert [len(body["records"]) for body in mock_airtable.posts()] == [10, 10, 5]
+    assert sorted(r["fields"]["Issue"] for r in mock_airtable.records.values()) == sorted(f"issue {n}" for n in range(25))
+    assert sink.sent == 25
+
+
+def test_rate_limit_reschedules_instead_of_sleeping(mock_airtable, tmp_path):
+    path = str(tmp_path / "outbox.sqlite3")
+    sink = AirtableSink(path=path, rate=100)
+    mock_airtable.fail_next(429, retry_after=30)
+
+    async def scenario():
+        for n in range(12):
+            await sink.enqueue(_alert(n))
+        started = time.monotonic()
+        try:
+            pending = await sink.flush(timeout=10)
+        finally:
+            await sink.stop()
+        return pending, time.monotonic() - started
+
+    pending, elapsed = _run(scenario())
+    assert pending == 12
+    assert elapsed < 5                         # returned instead of waiting out Retry-After
+    assert len(mock_airtable.posts()) == 1     # the second batch was deferred too
+    with sqlite3.connect(path) as conn:
+        earliest = conn.execute("SELECT MIN(next_attempt_at) FROM outbox WHERE status = 'pending'").fetchone()[0]
+    assert earliest >= time.time() + 25
+
+
+def test_sync_pages_then_pulls_only_changes(mock_airtable, tmp_path):
+    store = AlertStore(path=str(tmp_path / "alerts.sqlite3"), legacy_path=None)
+    sync  = AirtableSync(store=store)
+    old   = time.time() - 3600
+    ids   = [mock_airtable.add({**_alert(n), "Date": "2026-01-01"}, modified=old) for n in range(150)]
+
+    first = _run(sync.sync())
+    assert first["fetched"] == 150 and first["full"]
+    assert len([q for m, _, q, _ in mock_airtable.requests if m == "GET"]) == 2   # pageSize 100 + offset
+    assert len(store.query_remote(limit=1000)) == 150
+
+    mock_airtable.add({**_alert(150), "Date": "2026-01-02"})
+    second = _run(sync.sync())
+    assert second["fetched"] == 1 and not second["full"]
+    assert "filterByFormula" in mock_airtable.requests[-1][2]
+    assert store.query_remote(limit=1)[0]["Issue"] == "issue 150"
+
+    del mock_airtable.records[ids[0]]
+    full = _run(sync.sync(full=True))
+    assert full["pruned"] == 1
+    assert len(store.query_remote(limit=1000)) == 150
+    assert sync.age() is not None and sync.age() < 5
+
+
+def test_sync_pages_share_the_outbox_rate_limit(mock_airtable, tmp_path, monkeypatch):
+    store = AlertStore(path=str(tmp_path / "alerts.sqlite3"), legacy_path=None)
+    for n in range(250):
+        mock_airtable.add(_alert(n))
+    monkeypatch.setattr(airtable_service.airtable_sink, "_rate", 2)
+
+    started = time.monotonic()
+    assert _run(AirtableSync(store=store).sync())["fetched"] == 250
+    assert time.monotonic() - started >= 0.9      # 3 pages at 2 requests/second
+
+
+def test_sync_gives_up_on_a_stuck_peer(mock_airtable, tmp_path):
+    sync = AirtableSync(store=AlertStore(path=str(tmp_path / "alerts.sqlite3"), legacy_path=None))
+    with try_lock("airtable-sync") as acquired:   # stands in for another worker mid-sync
+        assert acquired
+        started = time.monotonic()
+        result  = _run(sync.sync(timeout=0.5))
+    assert result["busy"] and result["peer"]
+    assert time.monotonic() - started < 5
+    assert not mock_airtable.requests
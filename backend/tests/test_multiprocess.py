@@ -0,0 +1,140 @@
+# backend/tests/test_multiprocess.py
+# ── Shared state under several worker processes ─────────────────────────────
+#
+# gunicorn runs one process per worker, each with its own module globals.
+# These tests start PROCS spawned processes against the same files (released
+# together by a barrier) and check that nothing is lost or duplicated.
+#
+
+import asyncio
+import multiprocessing as mp
+import os
+import shutil
+import sqlite3
+
+import pandas as pd
+
+from app.data.columnar import convert_csv, read_columnar
+
+PROCS    = 4
+_DATASET = os.path.normpath(os.path.join(os.path.dirname(__file__), "..", "..", "data", "global_ads_performance_dataset.csv"))
+
+
+def _run_processes(target, *args) -> None:
+    ctx     = mp.get_context("spawn")
+    barrier = ctx.Barrier(PROCS)
+    procs   = [ctx.Process(target=target, args=(*args, barrier)) for _ in range(PROCS)]
+    for proc in procs:
+        proc.start()
+    for proc in procs:
+        proc.join(120)
+    assert [proc.exitcode for proc in procs] == [0] * PROCS
+
+
+# ── process bodies (module level so spawn can import them) ───────────────────
+
+def _add_alerts(path: str, n: int, barrier) -> None:
+    from app.services.alert_store import AlertStore
+
+    store = AlertStore(path=path, legacy_path=None)
+    barrier.wait()
+    for i in range(n):
+        store.add({
+            "campaign"      : "Meta Ads",
+            "issue"         : f"{os.getpid()}-{i}",
+            "severity"      : "high",
+            "recommendation": "Pause the campaign",
+            "timestamp"     : pd.Timestamp.now().isoformat(),
+            "status"        : "new",
+        })
+
+
+def _cache_responses(path: str, n: int, barrier) -> None:
+    from app.agents.llm_cache import LLMCache
+
+    cache = LLMCache(path=path, max_entries=10_000)
+    barrier.wait()
+    for i in range(n):
+        key = f"{os.getpid()}-{i}"
+        cache.put(key, {"choices": [i]})
+        assert cache.get(key) == {"choices": [i]}
+
+
+def _submit_jobs(path: str, n: int, barrier) -> None:
+    from app.services.job_queue import JobQueue
+
+    async def main():
+        queue = JobQueue(path=path)
+
+        async def slow(payload: dict) -> dict:
+            await asyncio.sleep(5)   # keeps the first job active while every retry lands
+            return {}
+
+        queue.register("analysis", slow)
+        barrier.wait()
+        for _ in range(n):
+            await queue.submit("analysis", {}, idempotency_key="n8n-retry")
+        await queue.stop()
+
+    asyncio.run(main())
+
+
+def _ingest_rows(csv_path: str, columnar_path: str, n: int, barrier) -> None:
+    from app.data import data_loader
+
+    data_loader._CSV_PATH      = csv_path
+    data_loader._COLUMNAR_PATH = columnar_path
+    barrier.wait()
+    for i in range(n):
+        data_loader.ingest_records([{
+            "date"         : "2025-02-01",
+            "platform"     : "Meta Ads",
+            "campaign_type": "Search",
+            "industry"     : "SaaS",
+            "country"      : "UK",
+            "impressions"  : os.getpid() * 1000 + i,   # unique marker per row
+            "clicks"       : 100,
+            "ad_spend"     : 50.0,
+            "conversions"  : 5,
+            "revenue"      : 120.0,
+        }])
+
+
+# ── tests ────────────────────────────────────────────────────────────────────
+
+def test_alert_store_keeps_every_insert(tmp_path):
+    path = str(tmp_path / "alerts.sqlite3")
+    _run_processes(_add_alerts, path, 50)
+    with sqlite3.connect(path) as conn:
+        issues = [row[0] for row in conn.execute("SELECT issue FROM alerts")]
+    assert len(issues) == PROCS * 50
+    assert len(set(issues)) == PROCS * 50
+
+
+def test_llm_cache_keeps_every_entry(tmp_path):
+    path = str(tmp_path / "llm_cache.sqlite3")
+    _run_processes(_cache_responses, path, 50)
+    with sqlite3.connect(path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0] == PROCS * 50
+
+
+def test_idempotent_submits_create_one_job(tmp_path):
+    path = str(tmp_path / "jobs.sqlite3")
+    _run_processes(_submit_jobs, path, 10)
+    with sqlite3.connect(path) as conn:
+        rows = conn.execute("SELECT COUNT(*) FROM jobs WHERE idempotency_key = 'n8n-retry'").fetchone()[0]
+    assert rows == 1
+
+
+def test_concurrent_ingest_loses_no_rows(tmp_path):
+    csv_path      = str(tmp_path / "ads.csv")
+    columnar_path = str(tmp_path / "ads.columnar")
+    shutil.copy(_DATASET, csv_path)
+    base = convert_csv(csv_path, columnar_path)["rows"]
+
+    _run_processes(_ingest_rows, csv_path, columnar_path, 3)
+
+    for frame in (pd.read_csv(csv_path), read_columnar(columnar_path)):
+        added = frame["impressions"].to_numpy()[base:] if len(frame) > base else []
+        assert len(frame) == base + PROCS * 3
+        assert len(set(added)) == PROCS * 3
@@ -0,0 +1,43 @@
+# backend/tests/test_rate_limiter.py
+# ── AsyncRateLimiter slot accounting ────────────────────────────────────────
+
+import asyncio
+
+from app.agents.rate_limiter import AsyncRateLimiter
+
+
+def test_cancelled_waiters_give_their_slot_back():
+    async def scenario():
+        limiter = AsyncRateLimiter(rate=0.5, max_concurrency=2)   # 2s spacing
+
+        async def call():
+            async with limiter:
+                return True
+
+        assert await call()                   # books the next start 2s out
+        waiters = [asyncio.create_task(call()) for _ in range(2)]
+        await asyncio.sleep(0.1)              # both hold a slot, sleeping on the spacing
+        for task in waiters:
+            task.cancel()
+        await asyncio.gather(*waiters, return_exceptions=True)
+        return limiter._slots._value
+
+    assert asyncio.run(scenario()) == 2
+
+
+def test_cancelled_holder_releases_on_exit():
+    async def scenario():
+        limiter = AsyncRateLimiter(rate=0, max_concurrency=1)
+
+        async def slow():
+            async with limiter:
+                await asyncio.sleep(10)
+
+        task = asyncio.create_task(slow())
+        await asyncio.sleep(0.05)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        async with limiter:
+            return True
+
+    assert asyncio.run(asyncio.wait_for(scenario(), 2))
@@ -7,7 +7,8 @@ import { Bell, RefreshCw, Trash2, AlertTriangle, CheckCircle, Info, Clock } from
 import { Button } from "@/components/ui/button";
 import { Badge } from "@/components/ui/badge";
 
-const API = process.env.NEXT_PUBLIC_API_URL || "http://localhost:8000";
+const API       = process.env.NEXT_PUBLIC_API_URL || "http://localhost:8000";
+const PAGE_SIZE = 100;
 
 const severityConfig: Record<string, any> = {
   high:   { color: "text-red-400",   bg: "bg-red-500/10",   border: "border-red-500/30",   icon: AlertTriangle, label: "HIGH"   },
@@ -16,39 +17,68 @@ const severityConfig: Record<string, any> = {
 };
 
 export default function AlertsPage() {
-  const [alerts,   setAlerts]   = useState<any[]>([]);
-  const [loading,  setLoading]  = useState(true);
-  const [clearing, setClearing] = useState(false);
-  const [filter,   setFilter]   = useState<string>("all");
-
-  useEffect(() => { fetchAlerts(); }, []);
+  const [alerts,         setAlerts]         = useState<any[]>([]);
+  const [severityCounts, setSeverityCounts] = useState<Record<string, number>>({});
+  const [nextCursor,     setNextCursor]     = useState<string | null>(null);
+  const [loading,        setLoading]        = useState(true);
+  const [loadingMore,    setLoadingMore]    = useState(false);
+  const [clearing,       setClearing]       = useState(false);
+  const [filter,         setFilter]         = useState<string>("all");
+
+  useEffect(() => { fetchAlerts(); }, [filter]);
+
+  // The API pages newest-first and filters by severity server-side;
+  // totals come from the response, not from the alerts loaded so far.
+  async function fetchPage(cursor: string | null) {
+    const res = await axios.get(`${API}/api/alerts`, {
+      params: {
+        limit   : PAGE_SIZE,
+        severity: filter === "all" ? undefined : filter,
+        cursor  : cursor ?? undefined,
+      },
+    });
+    setSeverityCounts(res.data.severity_counts || {});
+    setNextCursor(res.data.next_cursor ?? null);
+    return res.data.alerts || [];
+  }
 
   async function fetchAlerts() {
     setLoading(true);
     try {
-      const res = await axios.get(`${API}/api/alerts`);
-      setAlerts(res.data.alerts || []);
+      setAlerts(await fetchPage(null));
     } finally {
       setLoading(false);
     }
   }
 
+  async function loadMore() {
+    if (!nextCursor) return;
+    setLoadingMore(true);
+    try {
+      const page = await fetchPage(nextCursor);
+      setAlerts(prev => [...prev, ...page]);
+    } finally {
+      setLoadingMore(false);
+    }
+  }
+
   async function clearAlerts() {
     setClearing(true);
     try {
       await axios.delete(`${API}/api/alerts`);
       setAlerts([]);
+      setSeverityCounts({});
+      setNextCursor(null);
     } finally {
       setClearing(false);
     }
   }
 
-  const filtered = filter === "all" ? alerts : alerts.filter(a => a.severity === filter);
-  const counts   = {
-    all:    alerts.length,
-    high:   alerts.filter(a => a.severity === "high").length,
-    medium: alerts.filter(a => a.severity === "medium").length,
-    low:    alerts.filter(a => a.severity === "low").length,
+  const counts = {
+    all:    Object.values(severityCounts).reduce((sum, n) => sum + n, 0),
+    high:   severityCounts.high   || 0,
+    medium: severityCounts.medium || 0,
+    low:    severityCounts.low    || 0,
   };
 
   return (
@@ -65,7 +95,7 @@ export default function AlertsPage() {
             Alert <span className="text-gradient">Log</span>
           </h1>
           <p className="text-sm text-white/40 mt-1">
-            AI-generated alerts · {alerts.length} total fired
+            AI-generated alerts · {counts.all} total fired
           </p>
         </div>
         <div className="flex gap-2">
@@ -83,7 +113,7 @@ export default function AlertsPage() {
             variant="outline"
             size="sm"
             onClick={clearAlerts}
-            disabled={clearing || alerts.length === 0}
+            disabled={clearing || counts.all === 0}
             className="border-red-500/20 text-red-400/60 hover:text-red-400 hover:bg-red-500/5"
           >
             <Trash2 className="w-3.5 h-3.5 mr-2" />
@@ -113,7 +143,7 @@ export default function AlertsPage() {
       </div>
 
       {/* ── Empty state ── */}
-      {!loading && filtered.length === 0 && (
+      {!loading && alerts.length === 0 && (
         <motion.div
           initial={{ opacity: 0 }}
           animate={{ opacity: 1 }}
@@ -132,7 +162,7 @@ export default function AlertsPage() {
       {/* ── Alert cards ── */}
       <div className="space-y-3">
         <AnimatePresence>
-          {filtered.map((alert, i) => {
+          {alerts.map((alert, i) => {
             const cfg = severityConfig[alert.severity] || severityConfig.low;
             const Icon = cfg.icon;
             const date = new Date(alert.timestamp);
@@ -195,6 +225,22 @@ export default function AlertsPage() {
           })}
         </AnimatePresence>
       </div>
+
+      {/* ── Older pages ── */}
+      {nextCursor && !loading && (
+        <div className="flex justify-center mt-6">
+          <Button
+            variant="outline"
+            size="sm"
+            onClick={loadMore}
+            disabled={loadingMore}
+            className="border-white/10 text-white/60 hover:text-white hover:bg-white/5"
+          >
+            <RefreshCw className={`w-3.5 h-3.5 mr-2 ${loadingMore ? "animate-spin" : ""}`} />
+            Load older alerts
+          </Button>
+        </div>
+      )}
     </div>
   );
 }
\ No newline at end of file